@@ -1,9 +1,10 @@
-import shutil
 import os
+import sqlite3
 from datetime import datetime
 from pathlib import Path
 
 from database.core.db_setup import DatabaseSetup
+from database.core.connection_pool import get_pool
 
 
 def criar_backup(dest_dir=None, nome_prefixo='backup'):
@@ -26,5 +27,17 @@ def criar_backup(dest_dir=None, nome_prefixo='backup'):
     base_name = f"{nome_prefixo}_{ts}.db"
     dest_path = os.path.join(dest_dir, base_name)
 
-    shutil.copy2(db_path, dest_path)
+    copiar_banco(get_pool(db_path).conexao(), dest_path)
     return os.path.abspath(dest_path)
+
+
+def copiar_banco(origem, dest_path):
+    """Copia um banco aberto para dest_path usando a API de backup do SQLite.
+
+    Diferente de copiar o arquivo, inclui as páginas ainda no WAL e gera um arquivo consistente.
+    """
+    destino = sqlite3.connect(dest_path)
+    try:
+        origem.backup(destino)
+    finally:
+        destino.close()
@@ -1,6 +1,6 @@
-import sqlite3
 from datetime import datetime, timedelta
 from database.core.db_setup import DatabaseSetup
+from database.core.connection_pool import get_pool
 
 
 def apagar_tudo(confirm=False):
@@ -13,7 +13,7 @@ def apagar_tudo(confirm=False):
         return False
 
     db_path = DatabaseSetup.get_database_path()
-    conn = sqlite3.connect(db_path)
+    conn = get_pool(db_path).conexao()
     cur = conn.cursor()
 
     try:
@@ -26,9 +26,10 @@ def apagar_tudo(confirm=False):
         return True
     except Exception as e:
         print(f"Erro ao apagar tudo: {e}")
+        conn.rollback()
         return False
     finally:
-        conn.close()
+        cur.close()
 
 
 def apagar_anteriores(anos=1, tabelas=None):
@@ -39,7 +40,7 @@ def apagar_anteriores(anos=1, tabelas=None):
     - Retorna dicionário com contagens por tabela.
     """
     db_path = DatabaseSetup.get_database_path()
-    conn = sqlite3.connect(db_path)
+    conn = get_pool(db_path).conexao()
     cur = conn.cursor()
 
     cutoff = datetime.now() - timedelta(days=anos*365)
@@ -64,15 +65,17 @@ def apagar_anteriores(anos=1, tabelas=None):
 
         for t in tables:
             # contar e deletar
-            cur.execute(f"SELECT COUNT(*) FROM {t} WHERE date(data) < ?", (cutoff_str,))
+            # Compare the raw column (ISO text sorts like the date) so the data index can be used
+            cur.execute(f"SELECT COUNT(*) FROM {t} WHERE data < ?", (cutoff_str,))
             cnt = cur.fetchone()[0]
             if cnt > 0:
-                cur.execute(f"DELETE FROM {t} WHERE date(data) < ?", (cutoff_str,))
+                cur.execute(f"DELETE FROM {t} WHERE data < ?", (cutoff_str,))
             result[t] = cnt
         conn.commit()
         return result
     except Exception as e:
         print(f"Erro ao apagar anteriores: {e}")
+        conn.rollback()
         return {}
     finally:
-        conn.close()
+        cur.close()
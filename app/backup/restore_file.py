@@ -1,14 +1,17 @@
-import shutil
 import os
+import sqlite3
 from pathlib import Path
 from database.core.db_setup import DatabaseSetup
+from database.core.connection_pool import get_pool
+from .backup_file import copiar_banco
 
 
 def restaurar_backup(backup_file_path):
     """Restaura o banco de dados atual a partir de um arquivo de backup.
 
     - backup_file_path: caminho para o arquivo .db de backup.
-    - Faz `copy2` para substituir o arquivo de DB atual.
+    - Copia o conteúdo do backup para o DB atual pela API de backup do SQLite
+      (o arquivo em uso não é sobrescrito, o que corromperia o WAL).
 
     Retorna True em sucesso.
     """
@@ -20,9 +23,14 @@ def restaurar_backup(backup_file_path):
     backup_dir = os.path.join(os.path.dirname(db_path), 'backups')
     os.makedirs(backup_dir, exist_ok=True)
     safe_copy = os.path.join(backup_dir, 'pre_restore_' + Path(db_path).name)
-    shutil.copy2(db_path, safe_copy)
-
-    shutil.copy2(backup_file_path, db_path)
+    conn = get_pool(db_path).conexao()
+    copiar_banco(conn, safe_copy)
+
+    origem = sqlite3.connect(backup_file_path)
+    try:
+        origem.backup(conn)
+    finally:
+        origem.close()
     return True
 
 
@@ -1,10 +1,11 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox,
-    QGroupBox, QFrame, QTableWidget, QTableWidgetItem, QSizePolicy
+    QGroupBox, QFrame, QTableWidget, QTableWidgetItem, QSizePolicy, QMessageBox
 )
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt, QDate
 from database import db_manager
+from app.utils.query_executor import get_query_executor
 from datetime import datetime, timedelta
 
 # Matplotlib imports
@@ -39,6 +40,10 @@ class ContasFinanceiroWidget(QWidget):
         self.combo_period = QComboBox()
         self.combo_period.addItems(["Este Mês", "Últimos 3 Meses", "Este Ano"])
         ctrl_row.addWidget(self.combo_period)
+        ctrl_row.addWidget(QLabel("Comparar com:"))
+        self.combo_comparacao = QComboBox()
+        self.combo_comparacao.addItems(["Período Anterior", "Ano Anterior"])
+        ctrl_row.addWidget(self.combo_comparacao)
         ctrl_row.addStretch()
         btn_refresh = QPushButton("Atualizar Dados")
         btn_refresh.clicked.connect(self.refresh)
@@ -67,6 +72,19 @@ class ContasFinanceiroWidget(QWidget):
         chart_layout.addWidget(self.canvas)
         self.layout().addWidget(chart_box)
 
+        # Comparison chart: daily sales vs compared period, with moving averages
+        comparacao_box = QGroupBox("Comparativo")
+        comparacao_layout = QVBoxLayout(comparacao_box)
+        self.figure_comparacao = Figure(figsize=(8, 3), facecolor='#2d2d2d')
+        self.canvas_comparacao = FigureCanvas(self.figure_comparacao)
+        self.canvas_comparacao.setStyleSheet("background-color: #2d2d2d;")
+        comparacao_layout.addWidget(self.canvas_comparacao)
+        self.lbl_formas_pagamento = QLabel("")
+        self.lbl_formas_pagamento.setStyleSheet("color: #bbbbbb")
+        self.lbl_formas_pagamento.setWordWrap(True)
+        comparacao_layout.addWidget(self.lbl_formas_pagamento)
+        self.layout().addWidget(comparacao_box)
+
         # Expenses table
         gastos_box = QGroupBox("Gastos")
         gastos_layout = QVBoxLayout(gastos_box)
@@ -106,14 +124,20 @@ class ContasFinanceiroWidget(QWidget):
         lbl.setFont(QFont("Segoe UI", 16, QFont.Weight.Bold))
         lbl.setStyleSheet(f"color: {color}")
         lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        detail = QLabel("")
+        detail.setStyleSheet("color: #bbbbbb; font-size: 11px")
+        detail.setAlignment(Qt.AlignmentFlag.AlignCenter)
         l.addStretch()
         l.addWidget(lbl)
+        l.addWidget(detail)
         l.addStretch()
         w.value_label = lbl
+        w.detail_label = detail
         return w
 
     def _connect(self):
         self.combo_period.currentIndexChanged.connect(lambda _: self.refresh())
+        self.combo_comparacao.currentIndexChanged.connect(lambda _: self.refresh())
 
     def refresh(self):
         idx = self.combo_period.currentIndex()
@@ -137,6 +161,27 @@ class ContasFinanceiroWidget(QWidget):
             fim = hoje.strftime('%Y-%m-%d')
             mode = 'ano'
 
+        comparar_com = 'ano' if self.combo_comparacao.currentIndex() == 1 else 'anterior'
+
+        # As consultas rodam em segundo plano; um novo refresh descarta o anterior
+        self.card_vendas.detail_label.setText("Carregando...")
+        self.lbl_formas_pagamento.setText("Carregando...")
+        get_query_executor().executar(
+            'financeiro', self._consultar_periodo, inicio, fim, mode, comparar_com,
+            ao_concluir=self._mostrar_periodo,
+            ao_falhar=self._falha_periodo
+        )
+
+    def _falha_periodo(self, mensagem):
+        """Tira o estado de carregamento e avisa que a consulta do painel falhou"""
+        print(f"❌ Erro ao carregar o painel financeiro: {mensagem}")
+        print(f"Error loading financial dashboard: {mensagem}")
+        self.card_vendas.detail_label.setText("")
+        self.lbl_formas_pagamento.setText("")
+        QMessageBox.critical(self, "Erro", f"Falha ao carregar o painel financeiro: {mensagem}")
+
+    def _consultar_periodo(self, inicio, fim, mode, comparar_com='anterior'):
+        """Busca os dados do painel (roda fora da thread da interface, sem tocar em widgets)"""
         # Total vendas (somar valor_produto + frete) exceto pedidos cancelados
         vendas = self.db.calcular_resumo_vendas(inicio, fim) if hasattr(self.db, 'calcular_resumo_vendas') else self.db.calcular_resumo_vendas(inicio, fim)
         # calcular_resumo_vendas retorna (total_vendas, total_valor, total_entradas, ticket) or similar from ReportQueries
@@ -151,17 +196,54 @@ class ContasFinanceiroWidget(QWidget):
         # Caixas vendidas heurística
         caixas = int(self.db.contar_caixas_vendidas_periodo(inicio, fim))
 
+        buckets, labels, titulo = self._buckets_grafico(inicio, fim, mode)
+
+        return {
+            'total_vendas': total_vendas,
+            'gasto_total': gasto_total,
+            'lucro': lucro,
+            'caixas': caixas,
+            'grafico': (buckets, labels, titulo),
+            'gastos': self.db.listar_gastos_periodo(inicio, fim) or [],
+            # Série diária com período de comparação e médias móveis (uma consulta só)
+            'analise': self.db.analise_periodo(inicio, fim, comparar_com),
+            'comparar_com': comparar_com,
+            'formas_pagamento': self.db.vendas_por_forma_pagamento(inicio, fim) or [],
+        }
+
+    def _mostrar_periodo(self, dados):
+        """Atualiza cartões, gráfico e tabela com o resultado de _consultar_periodo"""
+        total_vendas = dados['total_vendas']
+        gasto_total = dados['gasto_total']
+        lucro = dados['lucro']
+        caixas = dados['caixas']
+
         # Atualizar cartões
         self.card_vendas.value_label.setText(f"R$ {total_vendas:,.2f}".replace(',', 'v').replace('.', ',').replace('v', '.'))
         self.card_gasto.value_label.setText(f"R$ {gasto_total:,.2f}".replace(',', 'v').replace('.', ',').replace('v', '.'))
         self.card_lucro.value_label.setText(f"R$ {lucro:,.2f}".replace(',', 'v').replace('.', ',').replace('v', '.'))
         self.card_caixas.value_label.setText(str(caixas))
 
-        # Atualizar gráfico
-        self._plot_vendas(inicio, fim, mode)
+        # Variação em relação ao período comparado
+        analise = dados['analise']
+        referencia = 'ano anterior' if dados['comparar_com'] == 'ano' else 'período anterior'
+        if analise['variacao_pct'] is None:
+            self.card_vendas.detail_label.setText(f"sem vendas no {referencia}")
+        else:
+            self.card_vendas.detail_label.setText(f"{analise['variacao_pct']:+.1f}% vs {referencia}".replace('.', ','))
+        anterior = analise['anterior']
+        self.card_vendas.setToolTip(
+            f"{referencia.capitalize()}: {anterior['inicio']} a {anterior['fim']}\n"
+            f"{anterior['quantidade']} pedidos, " + f"R$ {anterior['total']:,.2f}".replace(',', 'v').replace('.', ',').replace('v', '.')
+        )
+
+        # Atualizar gráficos
+        self._plot_vendas(*dados['grafico'])
+        self._plot_comparacao(analise, referencia)
+        self._mostrar_formas_pagamento(dados['formas_pagamento'])
 
         # Preencher tabela de gastos
-        gastos = self.db.listar_gastos_periodo(inicio, fim) or []
+        gastos = dados['gastos']
         self.table_gastos.setRowCount(0)
         for row in gastos:
             # row may be (id, tipo, descricao, valor, data)
@@ -186,59 +268,41 @@ class ContasFinanceiroWidget(QWidget):
             self.table_gastos.setItem(0, 1, QTableWidgetItem("Sem gastos no período"))
             self.table_gastos.setItem(0, 2, QTableWidgetItem("0.00"))
 
-    def _plot_vendas(self, inicio, fim, mode):
-        self.figure.clear()
-        # make axes dark-themed
-        ax = self.figure.add_subplot(111, facecolor='#2d2d2d')
-
-        # Query vendas por dia/weeks/months
-        valores = []
-        labels = []
-
+    def _buckets_grafico(self, inicio, fim, mode):
+        """Retorna (buckets, rótulos, título) do gráfico de vendas"""
+        # Todas as barras vêm de uma única consulta agrupada (semana ou mês)
         if mode == 'mes':
             # agrupar por semana dentro do mês -> 4-5 barras
-            data_inicio = datetime.strptime(inicio, '%Y-%m-%d')
-            for w in range(0, 6):
-                s0 = data_inicio + timedelta(weeks=w)
-                s1 = s0 + timedelta(days=6)
-                if s0.strftime('%Y-%m-%d') > fim:
-                    break
-                res = self.db.calcular_resumo_vendas(s0.strftime('%Y-%m-%d'), min(s1.strftime('%Y-%m-%d'), fim))
-                total = float((res[1] or 0) if res else 0)
-                labels.append(s0.strftime('%d %b'))
-                valores.append(total)
-            bars = ax.bar(labels, valores, color='#00c48c', alpha=0.95)
-            ax.set_title('Vendas por Semana (mês)', color='#e6e6e6')
+            buckets = self.db.vendas_agrupadas(inicio, fim, 'semana')
+            labels = [datetime.strptime(b[0], '%Y-%m-%d').strftime('%d %b') for b in buckets]
+            titulo = 'Vendas por Semana (mês)'
 
         elif mode == '3meses':
-            # últimas 12 semanas
+            # últimas 12 semanas (segunda a domingo)
             hoje = datetime.now()
-            for i in range(12):
-                s0 = hoje - timedelta(weeks=11 - i)
-                inicio_s = (s0 - timedelta(days=s0.weekday())).strftime('%Y-%m-%d')
-                fim_s = (s0 + timedelta(days=6 - s0.weekday())).strftime('%Y-%m-%d')
-                res = self.db.calcular_resumo_vendas(inicio_s, fim_s)
-                total = float((res[1] or 0) if res else 0)
-                labels.append(s0.strftime('%d %b'))
-                valores.append(total)
-            bars = ax.bar(labels, valores, color='#00c48c', alpha=0.95)
-            ax.set_title('Vendas nas últimas 12 semanas', color='#e6e6e6')
+            inicio_s = hoje - timedelta(weeks=11, days=hoje.weekday())
+            fim_s = hoje + timedelta(days=6 - hoje.weekday())
+            buckets = self.db.vendas_agrupadas(inicio_s.strftime('%Y-%m-%d'), fim_s.strftime('%Y-%m-%d'), 'semana')
+            labels = [datetime.strptime(b[0], '%Y-%m-%d').strftime('%d %b') for b in buckets]
+            titulo = 'Vendas nas últimas 12 semanas'
 
         else:
             # ano -> 12 meses
             ano = datetime.now().year
-            for m in range(1, 13):
-                inicio_m = datetime(ano, m, 1).strftime('%Y-%m-%d')
-                if m == 12:
-                    fim_m = datetime(ano, m, 28).strftime('%Y-%m-%d')
-                else:
-                    fim_m = (datetime(ano, m+1, 1) - timedelta(days=1)).strftime('%Y-%m-%d')
-                res = self.db.calcular_resumo_vendas(inicio_m, fim_m)
-                total = float((res[1] or 0) if res else 0)
-                labels.append(datetime(ano, m, 1).strftime('%b'))
-                valores.append(total)
-            bars = ax.bar(labels, valores, color='#00c48c', alpha=0.95)
-            ax.set_title('Vendas por Mês (ano)', color='#e6e6e6')
+            buckets = self.db.vendas_agrupadas(f'{ano}-01-01', f'{ano}-12-31', 'mes')
+            labels = [datetime.strptime(b[0], '%Y-%m-%d').strftime('%b') for b in buckets]
+            titulo = 'Vendas por Mês (ano)'
+
+        return buckets, labels, titulo
+
+    def _plot_vendas(self, buckets, labels, titulo):
+        self.figure.clear()
+        # make axes dark-themed
+        ax = self.figure.add_subplot(111, facecolor='#2d2d2d')
+
+        valores = [float(total or 0) for _, _, total in buckets]
+        bars = ax.bar(labels, valores, color='#00c48c', alpha=0.95)
+        ax.set_title(titulo, color='#e6e6e6')
 
         # annotate bars
         for b, v in zip(bars, valores):
@@ -259,3 +323,40 @@ class ContasFinanceiroWidget(QWidget):
 
         self.figure.tight_layout()
         self.canvas.draw()
+
+    def _plot_comparacao(self, analise, referencia):
+        """Linhas diárias do período atual e do comparado, com médias móveis de 7 e 30 dias"""
+        self.figure_comparacao.clear()
+        ax = self.figure_comparacao.add_subplot(111, facecolor='#2d2d2d')
+
+        serie = analise['serie']
+        datas = [datetime.strptime(d['data'], '%Y-%m-%d') for d in serie]
+        ax.plot(datas, [d['total'] for d in serie], color='#00c48c', linewidth=1.2, label='Vendas')
+        ax.plot(datas, [d['total_anterior'] for d in serie], color='#888888', linewidth=1, linestyle='--', label=referencia.capitalize())
+        ax.plot(datas, [d['media_7d'] for d in serie], color='#66d9ef', linewidth=1.5, label='Média 7 dias')
+        ax.plot(datas, [d['media_30d'] for d in serie], color='#ffaa33', linewidth=1.5, label='Média 30 dias')
+
+        ax.set_ylabel('Valor (R$)', color='#e6e6e6')
+        ax.tick_params(colors='#e6e6e6')
+        ax.grid(axis='y', color='#444444', linestyle='--', alpha=0.6)
+        legenda = ax.legend(loc='upper left', fontsize=8, facecolor='#333333', edgecolor='#444444')
+        for texto in legenda.get_texts():
+            texto.set_color('#e6e6e6')
+        self.figure_comparacao.autofmt_xdate()
+
+        if not serie or not any(d['total'] or d['total_anterior'] for d in serie):
+            ax.text(0.5, 0.5, 'Sem vendas no período', transform=ax.transAxes, ha='center', va='center', color='#bbbbbb', fontsize=12)
+
+        self.figure_comparacao.tight_layout()
+        self.canvas_comparacao.draw()
+
+    def _mostrar_formas_pagamento(self, formas):
+        """Resumo das vendas do período por forma de pagamento"""
+        if not formas:
+            self.lbl_formas_pagamento.setText("Sem vendas por forma de pagamento no período")
+            return
+        partes = [
+            f"{forma}: {quantidade} pedidos, " + f"R$ {total:,.2f}".replace(',', 'v').replace('.', ',').replace('v', '.') + f" ({participacao:.0f}%)"
+            for forma, quantidade, total, participacao in formas
+        ]
+        self.lbl_formas_pagamento.setText("Por forma de pagamento — " + "  ·  ".join(partes))
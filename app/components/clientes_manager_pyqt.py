@@ -409,16 +409,10 @@ class ClienteDetailDialog(QDialog):
                 pedido_id = r[0] if r and len(r) > 0 else 0
                 numero_os = r[1] if r and len(r) > 1 else 0
                 
-                # Tenta extrair status do JSON
+                # Status vem da coluna status (índice 14 em SELECT *)
                 status = 'Em Andamento'  # default
-                if r and len(r) > 13:
-                    try:
-                        import json
-                        dados_json = r[13] if r[13] else '{}'
-                        parsed = json.loads(dados_json)
-                        status = parsed.get('status', 'Em Andamento')
-                    except Exception:
-                        pass
+                if r and len(r) > 14 and r[14]:
+                    status = r[14]
                 
                 print(f"  Dados: id={pedido_id}, numero_os={numero_os}, status={status}")
                 
@@ -0,0 +1,148 @@
+"""
+Modelo da tabela de clientes (model/view).
+
+Funcionalidades:
+- Guarda as linhas cruas do banco (tuplas de listar_clientes/buscar_clientes), sem widgets por célula
+- Formata CPF, CNPJ e CEP só quando a célula é desenhada (data())
+- Carrega as linhas em páginas sob demanda (canFetchMore/fetchMore), em segundo plano
+"""
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+
+from app.utils.formatters import formatar_cpf, formatar_cnpj
+from app.utils.cep_api import CepAPI
+from app.utils.query_executor import get_query_executor
+
+
+# (título, campo) na ordem das colunas de listar_clientes
+COLUNAS = [
+    ("ID", 'id'), ("Nome", 'nome'), ("CPF", 'cpf'), ("CNPJ", 'cnpj'), ("Insc. Estadual", 'inscricao_estadual'),
+    ("Telefone", 'telefone'), ("Email", 'email'), ("CEP", 'cep'), ("Rua", 'rua'), ("Nº", 'numero'),
+    ("Bairro", 'bairro'), ("Cidade", 'cidade'), ("UF", 'estado'), ("Referência", 'referencia'),
+    ("Compras", 'numero_compras'),
+]
+COLUNA_COMPRAS = 14
+
+
+def _formatar(coluna, valor):
+    """Texto exibido numa célula"""
+    if coluna == 2:
+        return formatar_cpf(str(valor or ''))
+    if coluna == 3 and str(valor or '').strip():
+        try:
+            return formatar_cnpj(str(valor))
+        except Exception:
+            return str(valor)
+    if coluna == 7 and str(valor or '').strip():
+        try:
+            return CepAPI.format_cep_display(str(valor))
+        except Exception:
+            return str(valor)
+    if coluna == COLUNA_COMPRAS:
+        return str(valor or '0')
+    return str(valor or '')
+
+
+class ClientesTableModel(QAbstractTableModel):
+    """Clientes em páginas: a view pede mais linhas (fetchMore) quando a rolagem chega ao fim."""
+
+    TAMANHO_PAGINA = 200
+
+    # total de linhas carregadas, se ainda há mais páginas
+    pagina_carregada = pyqtSignal(int, bool)
+    falha_ao_carregar = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._linhas = []
+        self._fonte = None  # função(limite, offset) -> lista de tuplas
+        self._tem_mais = False
+        self._carregando = False
+
+    def definir_fonte(self, fonte):
+        """Troca a consulta (lista completa ou pesquisa) e recomeça da primeira página"""
+        # Um pedido de página da consulta anterior ainda pendente é descartado
+        get_query_executor().cancelar('clientes')
+        self.beginResetModel()
+        self._linhas = []
+        self._fonte = fonte
+        self._tem_mais = True
+        self._carregando = False
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def cliente(self, linha):
+        """Dados da linha como dict com os textos exibidos (campos de COLUNAS)"""
+        if not 0 <= linha < len(self._linhas):
+            return None
+        dados = {campo: _formatar(coluna, self._linhas[linha][coluna]) for coluna, (_, campo) in enumerate(COLUNAS)}
+        try:
+            dados['numero_compras'] = int(dados['numero_compras'] or 0)
+        except (ValueError, TypeError):
+            dados['numero_compras'] = 0
+        return dados
+
+    # --- QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._linhas)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUNAS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        valor = self._linhas[index.row()][index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return _formatar(index.column(), valor)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return int(Qt.AlignmentFlag.AlignCenter)
+        if role == Qt.ItemDataRole.UserRole:
+            # Valor cru, usado na ordenação (números como números)
+            if index.column() in (0, COLUNA_COMPRAS):
+                return int(valor or 0)
+            return str(valor or '').lower()
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return COLUNAS[section][0]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._tem_mais and not self._carregando and self._fonte is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self._carregando = True
+        fonte = self._fonte
+        get_query_executor().executar(
+            'clientes', fonte, self.TAMANHO_PAGINA, len(self._linhas),
+            ao_concluir=lambda linhas: self._acrescentar(fonte, linhas),
+            ao_falhar=self._falhou
+        )
+
+    def _acrescentar(self, fonte, linhas):
+        if fonte is not self._fonte:
+            return
+        self._carregando = False
+        linhas = [tuple(linha) for linha in (linhas or []) if len(linha) >= len(COLUNAS)]
+        self._tem_mais = len(linhas) >= self.TAMANHO_PAGINA
+        if linhas:
+            inicio = len(self._linhas)
+            self.beginInsertRows(QModelIndex(), inicio, inicio + len(linhas) - 1)
+            self._linhas.extend(linhas)
+            self.endInsertRows()
+        self.pagina_carregada.emit(len(self._linhas), self._tem_mais)
+
+    def _falhou(self, mensagem):
+        self._carregando = False
+        self._tem_mais = False
+        self.falha_ao_carregar.emit(mensagem)
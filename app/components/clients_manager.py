@@ -3,17 +3,19 @@ Módulo de clientes em PyQt6 - Versão Completa
 """
 
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-                             QLineEdit, QTableWidget, QTableWidgetItem, QHeaderView,
+                             QLineEdit, QTableWidget, QTableWidgetItem, QTableView, QHeaderView,
                              QMessageBox, QDialog, QFormLayout, QGroupBox, QScrollArea,
                              QFrame, QSplitter, QApplication, QMenu, QSizePolicy)
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QSortFilterProxyModel
 from PyQt6.QtGui import QFont, QColor
 
+from datetime import datetime
 from database import db_manager
 from app.ui.theme import apply_app_theme
 from app.utils.formatters import formatar_cpf
 from app.utils.cep_api import CepAPI
 from app.utils.keyboard_shortcuts import setup_standard_shortcuts
+from app.components.clientes_table_model import ClientesTableModel
 
 
 class ClienteDetailDialog(QDialog):
@@ -152,6 +154,27 @@ class ClienteDetailDialog(QDialog):
         compras_label.setStyleSheet("font-size: 13px; color: #50fa7b; font-weight: bold; margin-top: 8px;")
         right.addWidget(compras_label)
         
+        # Valor gasto e datas de compra (tabela cliente_estatisticas, uma linha por cliente)
+        stats = db_manager.estatisticas_cliente(
+            self.cliente.get('cpf') or self.cliente.get('cnpj'), self.cliente.get('nome')
+        )
+        if stats['pedidos']:
+            def _moeda(v):
+                return f"R$ {v:,.2f}".replace(',', 'v').replace('.', ',').replace('v', '.')
+            def _data(v):
+                try:
+                    return datetime.strptime(str(v)[:10], '%Y-%m-%d').strftime('%d/%m/%Y')
+                except Exception:
+                    return str(v or '-')
+            stats_label = QLabel(
+                f"<b>Total gasto:</b> {_moeda(stats['total_gasto'])}<br>"
+                f"<b>Ticket médio:</b> {_moeda(stats['ticket_medio'])}<br>"
+                f"<b>Primeira compra:</b> {_data(stats['primeira_compra'])}<br>"
+                f"<b>Última compra:</b> {_data(stats['ultima_compra'])}"
+            )
+            stats_label.setStyleSheet("font-size: 11px; color: #c0c0c0; margin-top: 4px;")
+            right.addWidget(stats_label)
+        
         right.addStretch()
 
         # Proporções das colunas: 35%, 30%, 35%
@@ -409,16 +432,10 @@ class ClienteDetailDialog(QDialog):
                 pedido_id = r[0] if r and len(r) > 0 else 0
                 numero_os = r[1] if r and len(r) > 1 else 0
                 
-                # Tenta extrair status do JSON
+                # Status vem da coluna status (índice 14 em SELECT *)
                 status = 'Em Andamento'  # default
-                if r and len(r) > 13:
-                    try:
-                        import json
-                        dados_json = r[13] if r[13] else '{}'
-                        parsed = json.loads(dados_json)
-                        status = parsed.get('status', 'Em Andamento')
-                    except Exception:
-                        pass
+                if r and len(r) > 14 and r[14]:
+                    status = r[14]
                 
                 print(f"  Dados: id={pedido_id}, numero_os={numero_os}, status={status}")
                 
@@ -1196,13 +1213,19 @@ class ClientesManager(QWidget):
         layout.addWidget(top_frame)
     
     def _criar_tabela(self, layout):
-        """Cria tabela de clientes com scroll suave e ordenação"""
-        self.table = QTableWidget()
-        
-        # Configurar colunas
-        columns = ["ID", "Nome", "CPF", "CNPJ", "Insc. Estadual", "Telefone", "Email", "CEP", "Rua", "Nº", "Bairro", "Cidade", "UF", "Referência", "Compras"]
-        self.table.setColumnCount(len(columns))
-        self.table.setHorizontalHeaderLabels(columns)
+        """Cria tabela de clientes (model/view, carregada em páginas) com scroll suave e ordenação"""
+        self.table = QTableView()
+        
+        # Modelo com as linhas cruas; o proxy ordena as linhas já carregadas pelo valor cru
+        self.model = ClientesTableModel(self)
+        self.model.pagina_carregada.connect(self._atualizar_contador)
+        self.model.falha_ao_carregar.connect(
+            lambda msg: QMessageBox.critical(self, "Erro", f"Falha ao carregar clientes: {msg}")
+        )
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setSortRole(Qt.ItemDataRole.UserRole)
+        self.table.setModel(self.proxy)
         
         # HABILITAR ORDENAÇÃO POR COLUNA
         self.table.setSortingEnabled(True)
@@ -1231,8 +1254,8 @@ class ClientesManager(QWidget):
         header.customContextMenuRequested.connect(self._show_header_context_menu)
         
         # Configurar seleção
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QTableView.SelectionMode.SingleSelection)
         
         # REMOVER indicadores visuais de seleção desnecessários
         self.table.verticalHeader().setVisible(False)  # Remove números de linha à esquerda
@@ -1329,26 +1352,22 @@ class ClientesManager(QWidget):
                 # Cabeçalhos das colunas visíveis
                 headers = []
                 visible_columns = []
-                for col in range(self.table.columnCount()):
+                for col in range(self.proxy.columnCount()):
                     if not self.table.isColumnHidden(col):
-                        headers.append(self.table.horizontalHeaderItem(col).text())
+                        headers.append(self.proxy.headerData(col, Qt.Orientation.Horizontal))
                         visible_columns.append(col)
                 
                 writer.writerow(headers)
                 
-                # Dados das linhas
-                for row in range(self.table.rowCount()):
-                    row_data = []
-                    for col in visible_columns:
-                        item = self.table.item(row, col)
-                        row_data.append(item.text() if item else "")
-                    writer.writerow(row_data)
+                # Dados das linhas carregadas, na ordem exibida
+                for row in range(self.proxy.rowCount()):
+                    writer.writerow([self.proxy.index(row, col).data() or "" for col in visible_columns])
             
             # Mensagem de sucesso
             self._mostrar_mensagem_auto_close(
                 "✅ Exportação Concluída",
                 f"Arquivo salvo em:\n{filepath}\n\n"
-                f"📊 {self.table.rowCount()} clientes exportados\n"
+                f"📊 {self.proxy.rowCount()} clientes exportados\n"
                 f"📁 Pasta: {os.path.basename(os.path.dirname(filepath))}",
                 "success",
                 4
@@ -1396,9 +1415,9 @@ class ClientesManager(QWidget):
         show_cols_menu = menu.addMenu("👁️ Mostrar Colunas")
         
         # Adicionar opções para mostrar colunas ocultas
-        for i in range(self.table.columnCount()):
+        for i in range(self.proxy.columnCount()):
             if self.table.isColumnHidden(i):
-                col_name = self.table.horizontalHeaderItem(i).text()
+                col_name = self.proxy.headerData(i, Qt.Orientation.Horizontal)
                 show_action = show_cols_menu.addAction(f"  {col_name}")
                 show_action.setData(i)
         
@@ -1411,9 +1430,9 @@ class ClientesManager(QWidget):
         action = menu.exec(header.mapToGlobal(pos))
         
         if action == sort_asc_action:
-            self.table.sortItems(column, Qt.SortOrder.AscendingOrder)
+            self.table.sortByColumn(column, Qt.SortOrder.AscendingOrder)
         elif action == sort_desc_action:
-            self.table.sortItems(column, Qt.SortOrder.DescendingOrder)
+            self.table.sortByColumn(column, Qt.SortOrder.DescendingOrder)
         elif action == hide_col_action:
             self.table.setColumnHidden(column, True)
         elif action == auto_resize_action:
@@ -1458,89 +1477,28 @@ class ClientesManager(QWidget):
             print(f"Erro ao configurar atalhos: {e}")
     
     def carregar_dados(self):
-        """Carrega dados dos clientes"""
-        try:
-            clientes = db_manager.listar_clientes(500)
-            
-            # Configurar número de linhas
-            self.table.setRowCount(len(clientes))
-            
-            # Preencher dados
-            for row, cliente in enumerate(clientes):
-                # cliente é uma tupla: (id, nome, cpf, cnpj, inscricao_estadual, telefone, email, cep, rua, numero, bairro, cidade, estado, referencia, numero_compras)
-                if len(cliente) >= 14:
-                    raw_cpf = str(cliente[2] or '')
-                    # Formatação de CNPJ
-                    raw_cnpj = str(cliente[3] or '')
-                    if raw_cnpj and len(raw_cnpj.strip()) > 0:
-                        try:
-                            from app.utils.formatters import formatar_cnpj
-                            cnpj_fmt = formatar_cnpj(raw_cnpj)
-                        except Exception:
-                            cnpj_fmt = raw_cnpj
-                    else:
-                        cnpj_fmt = ''
-                    
-                    # Formatação do CEP
-                    raw_cep = str(cliente[7] or '')
-                    if raw_cep and len(raw_cep.strip()) > 0:
-                        try:
-                            from app.utils.cep_api import CepAPI
-                            cep_fmt = CepAPI.format_cep_display(raw_cep)
-                        except Exception:
-                            cep_fmt = raw_cep
-                    else:
-                        cep_fmt = ''
-                    
-                    # Extrair numero_compras (índice 14)
-                    numero_compras_val = str(cliente[14] or '0') if len(cliente) > 14 else '0'
-                    
-                    dados = [
-                        str(cliente[0] or ''),   # id
-                        str(cliente[1] or ''),   # nome
-                        formatar_cpf(raw_cpf),   # cpf (formatado para exibição)
-                        cnpj_fmt,                # cnpj (formatado)
-                        str(cliente[4] or ''),   # inscricao_estadual
-                        str(cliente[5] or ''),   # telefone
-                        str(cliente[6] or ''),   # email
-                        cep_fmt,                 # cep (formatado)
-                        str(cliente[8] or ''),   # rua
-                        str(cliente[9] or ''),   # numero
-                        str(cliente[10] or ''),  # bairro
-                        str(cliente[11] or ''),  # cidade
-                        str(cliente[12] or ''),  # estado
-                        str(cliente[13] or ''),  # referencia
-                        numero_compras_val       # numero_compras (coluna oculta para dados)
-                    ]
-                    
-                    for col, valor in enumerate(dados):
-                        item = QTableWidgetItem(valor)
-                        # Centralizar todas as colunas
-                        item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                        # Tornar item não editável
-                        item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                        self.table.setItem(row, col, item)
-            
-            # Ajustar altura das linhas
-            self.table.resizeRowsToContents()
-            
-            print(f"Carregados {len(clientes)} clientes na tabela")
-            
-            # Atualizar contador de resultados
-            if hasattr(self, 'label_resultados'):
-                total = len(clientes)
-                if total == 0:
-                    self.label_resultados.setText("Nenhum cliente encontrado")
-                elif total == 1:
-                    self.label_resultados.setText("1 cliente encontrado")
-                else:
-                    self.label_resultados.setText(f"{total} clientes encontrados")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Erro", f"Falha ao carregar clientes: {e}")
-            print(f"Erro detalhado: {e}")
-            import traceback
-            traceback.print_exc()
+        """Carrega os clientes (a primeira página em segundo plano; as demais ao rolar a tabela)"""
+        self.model.definir_fonte(db_manager.listar_clientes)
+
+    def _atualizar_contador(self, total, tem_mais):
+        """Atualiza o contador de resultados a cada página carregada"""
+        if not hasattr(self, 'label_resultados'):
+            return
+        if total == 0:
+            self.label_resultados.setText("Nenhum cliente encontrado")
+        elif total == 1:
+            self.label_resultados.setText("1 cliente encontrado")
+        elif tem_mais:
+            self.label_resultados.setText(f"{total}+ clientes encontrados")
+        else:
+            self.label_resultados.setText(f"{total} clientes encontrados")
+
+    def _cliente_selecionado(self):
+        """Dados (textos exibidos) do cliente da linha selecionada, ou None"""
+        index = self.table.currentIndex()
+        if not index.isValid():
+            return None
+        return self.model.cliente(self.proxy.mapToSource(index).row())
     
     def novo_cliente(self):
         """Abre modal para novo cliente"""
@@ -1553,45 +1511,11 @@ class ClientesManager(QWidget):
     
     def editar_cliente(self):
         """Edita cliente selecionado"""
-        row = self.table.currentRow()
-        if row < 0:
+        dados = self._cliente_selecionado()
+        if dados is None:
             QMessageBox.information(self, "Info", "Selecione um cliente para editar.")
             return
-        
-        # Obter dados da linha selecionada
-        dados = {}
-        for col in range(self.table.columnCount()):
-            item = self.table.item(row, col)
-            valor = item.text() if item else ''
-            
-            if col == 0:
-                dados['id'] = valor
-            elif col == 1:
-                dados['nome'] = valor
-            elif col == 2:
-                dados['cpf'] = valor
-            elif col == 3:
-                dados['cnpj'] = valor
-            elif col == 4:
-                dados['inscricao_estadual'] = valor
-            elif col == 5:
-                dados['telefone'] = valor
-            elif col == 6:
-                dados['email'] = valor
-            elif col == 7:
-                dados['cep'] = valor
-            elif col == 8:
-                dados['rua'] = valor
-            elif col == 9:
-                dados['numero'] = valor
-            elif col == 10:
-                dados['bairro'] = valor
-            elif col == 11:
-                dados['cidade'] = valor
-            elif col == 12:
-                dados['estado'] = valor
-            elif col == 13:
-                dados['referencia'] = valor
+        dados.pop('numero_compras', None)
         
         modal = ClienteModal(self, dados)
         if modal.exec() == QDialog.DialogCode.Accepted:
@@ -1602,71 +1526,23 @@ class ClientesManager(QWidget):
 
     def abrir_detalhes_cliente(self):
         """Abre o diálogo com detalhes do cliente e seus pedidos"""
-        row = self.table.currentRow()
-        if row < 0:
+        dados = self._cliente_selecionado()
+        if dados is None:
             QMessageBox.information(self, "Info", "Selecione um cliente.")
             return
 
-        # Extrair dados do cliente da linha
-        dados = {}
-        for col in range(self.table.columnCount()):
-            item = self.table.item(row, col)
-            valor = item.text() if item else ''
-            if col == 0:
-                dados['id'] = valor
-            elif col == 1:
-                dados['nome'] = valor
-            elif col == 2:
-                dados['cpf'] = valor
-            elif col == 3:
-                dados['cnpj'] = valor
-            elif col == 4:
-                dados['inscricao_estadual'] = valor
-            elif col == 5:
-                dados['telefone'] = valor
-            elif col == 6:
-                dados['email'] = valor
-            elif col == 7:
-                dados['cep'] = valor
-            elif col == 8:
-                dados['rua'] = valor
-            elif col == 9:
-                dados['numero'] = valor
-            elif col == 10:
-                dados['bairro'] = valor
-            elif col == 11:
-                dados['cidade'] = valor
-            elif col == 12:
-                dados['estado'] = valor
-            elif col == 13:
-                dados['referencia'] = valor
-            elif col == 14:
-                # Converter para int, defaultando para 0
-                try:
-                    dados['numero_compras'] = int(valor) if valor else 0
-                except (ValueError, TypeError):
-                    dados['numero_compras'] = 0
-
         dialog = ClienteDetailDialog(self, dados)
         dialog.exec()
     
     def excluir_cliente(self):
         """Exclui cliente selecionado"""
-        row = self.table.currentRow()
-        if row < 0:
+        dados = self._cliente_selecionado()
+        if dados is None:
             QMessageBox.information(self, "Info", "Selecione um cliente para excluir.")
             return
         
-        # Obter dados do cliente
-        id_item = self.table.item(row, 0)
-        nome_item = self.table.item(row, 1)
-        
-        if not id_item or not nome_item:
-            QMessageBox.warning(self, "Erro", "Dados inválidos do cliente.")
-            return
-        
-        cliente_id = id_item.text()
-        nome_cliente = nome_item.text()
+        cliente_id = dados['id']
+        nome_cliente = dados['nome']
         
         # Confirmar exclusão
         msgbox = QMessageBox(self)
@@ -1710,101 +1586,17 @@ class ClientesManager(QWidget):
         self._search_timer.start(500)  # 500ms de delay
     
     def pesquisar_clientes(self):
-        """Pesquisa clientes por nome, CPF, CNPJ ou telefone"""
+        """Pesquisa clientes por nome, CPF, CNPJ, telefone, e-mail ou endereço (índice de busca, sem acentos)"""
         termo_pesquisa = self.search_entry.text().strip()
         
         if not termo_pesquisa:
             self.carregar_dados()
             return
         
-        try:
-            # Buscar todos os clientes do banco
-            clientes = db_manager.listar_clientes(1000)
-            
-            # Filtrar clientes
-            clientes_filtrados = []
-            termo_lower = termo_pesquisa.lower()
-            
-            for cliente in clientes:
-                if len(cliente) >= 14:
-                    nome = str(cliente[1] or '').lower()
-                    cpf = str(cliente[2] or '')
-                    cnpj = str(cliente[3] or '')
-                    inscricao_estadual = str(cliente[4] or '').lower()
-                    telefone = str(cliente[5] or '').lower()
-                    cep = str(cliente[7] or '').lower()
-
-                    # Normalize search term for CPF/CNPJ/CEP comparison (strip non-digits)
-                    termo_digits = ''.join(ch for ch in termo_pesquisa if ch.isdigit())
-                    cpf_digits = ''.join(ch for ch in cpf if ch.isdigit())
-                    cnpj_digits = ''.join(ch for ch in cnpj if ch.isdigit())
-                    cep_digits = ''.join(ch for ch in cep if ch.isdigit())
-
-                    # Pesquisar nos campos: nome, telefone, CPF, CNPJ, CEP, Inscr. Estadual (permitir digitar sem pontos)
-                    if (termo_lower in nome or 
-                        termo_lower in telefone or 
-                        (termo_digits and (termo_digits == cpf_digits or termo_digits == cnpj_digits or termo_digits == cep_digits)) or
-                        termo_lower in cpf.lower() or
-                        termo_lower in cnpj.lower() or
-                        termo_lower in cep.lower() or
-                        termo_lower in inscricao_estadual):
-                        clientes_filtrados.append(cliente)
-            
-            # Configurar número de linhas
-            self.table.setRowCount(len(clientes_filtrados))
-            
-            # Preencher dados filtrados
-            for row, cliente in enumerate(clientes_filtrados):
-                raw_cpf = str(cliente[2] or '')
-                # Formatação de CNPJ
-                raw_cnpj = str(cliente[3] or '')
-                if raw_cnpj and len(raw_cnpj.strip()) > 0:
-                    try:
-                        from app.utils.formatters import formatar_cnpj
-                        cnpj_fmt = formatar_cnpj(raw_cnpj)
-                    except Exception:
-                        cnpj_fmt = raw_cnpj
-                else:
-                    cnpj_fmt = ''
-                
-                # Formatação do CEP
-                raw_cep = str(cliente[7] or '')
-                if raw_cep and len(raw_cep.strip()) > 0:
-                    try:
-                        from app.utils.cep_api import CepAPI
-                        cep_fmt = CepAPI.format_cep_display(raw_cep)
-                    except Exception:
-                        cep_fmt = raw_cep
-                else:
-                    cep_fmt = ''
-                
-                dados = [
-                    str(cliente[0] or ''),   # id
-                    str(cliente[1] or ''),   # nome
-                    formatar_cpf(raw_cpf),   # cpf (formatado para exibição)
-                    cnpj_fmt,                # cnpj (formatado)
-                    str(cliente[4] or ''),   # inscricao_estadual
-                    str(cliente[5] or ''),   # telefone
-                    str(cliente[6] or ''),   # email
-                    cep_fmt,                 # cep (formatado)
-                    str(cliente[8] or ''),   # rua
-                    str(cliente[9] or ''),   # numero
-                    str(cliente[10] or ''),  # bairro
-                    str(cliente[11] or ''),  # cidade
-                    str(cliente[12] or ''),  # estado
-                    str(cliente[13] or '')   # referencia
-                ]
-                
-                for col, valor in enumerate(dados):
-                    item = QTableWidgetItem(valor)
-                    if col == 0:  # ID - centralizado
-                        item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.table.setItem(row, col, item)
-            
-            print(f"Encontrados {len(clientes_filtrados)} clientes")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Erro", f"Erro ao pesquisar: {e}")
+        # Só a página pedida pela tabela é buscada; a pesquisa anterior ainda pendente é descartada
+        self.model.definir_fonte(
+            lambda limite, offset: db_manager.buscar_clientes(termo_pesquisa, limite, offset)
+        )
     
     def limpar_pesquisa(self):
         """Limpa a pesquisa e recarrega todos os dados"""
@@ -1823,7 +1615,7 @@ class ClientesManager(QWidget):
             #clientesManager QPushButton { color: #eaeaea; border-radius: 6px; padding: 8px 14px; font-weight: 600; border: none; }
             #clientesManager QLineEdit { background-color: #1f1f1f; color: #e6e6e6; border: 1px solid #393939; border-radius: 6px; padding: 8px 12px; font-size: 14px; }
             #clientesManager QLineEdit:focus { border: 1px solid #5a5a5a; }
-            #clientesManager QTableWidget { background-color: #1f1f1f; color: #e6e6e6; border: 1px solid #393939; border-radius: 6px; font-size: 13px; gridline-color: #333333; selection-background-color: #2d2d2d; alternate-background-color: #232323; }
+            #clientesManager QTableView { background-color: #1f1f1f; color: #e6e6e6; border: 1px solid #393939; border-radius: 6px; font-size: 13px; gridline-color: #333333; selection-background-color: #2d2d2d; alternate-background-color: #232323; }
             #clientesManager QHeaderView::section { background-color: #1f1f1f; color: #e6e6e6; font-weight: bold; font-size: 14px; }
             
             #clientesManager QPushButton[btnClass="success"] { background-color: #28a745; }
@@ -163,7 +163,7 @@ class PedidoResumoDialog(QDialog):
                                     """SELECT id, nome, cpf, cnpj, inscricao_estadual, telefone, email, 
                                        cep, rua, numero, bairro, cidade, estado, referencia
                                        FROM clientes 
-                                       WHERE replace(replace(replace(replace(cnpj, '.', ''), '/', ''), '-', ''), ' ', '') = ?
+                                       WHERE documento_norm = ?
                                        LIMIT 1""",
                                     (documento_norm,)
                                 )
@@ -0,0 +1,161 @@
+"""
+Grade virtualizada dos cards de pedidos.
+
+Funcionalidades:
+- Só constrói os cards das linhas visíveis na área de rolagem (mais uma linha de folga acima e abaixo)
+- Reaproveita os cards já construídos ao rolar e ao redesenhar, enquanto os dados do pedido não mudam
+- Mantém um número limitado de cards fora da tela; os mais antigos são descartados
+"""
+
+from collections import OrderedDict
+
+from PyQt6.QtWidgets import QWidget, QSizePolicy
+from PyQt6.QtCore import QPoint
+
+
+class GradeCardsPedidos(QWidget):
+    """Posiciona os cards em 3 colunas de altura fixa dentro de uma QScrollArea, criando-os sob demanda."""
+
+    COLUNAS = 3
+    LARGURA_MIN = 410  # mesmos limites de PedidosCard.criar_card
+    LARGURA_MAX = 440
+    ALTURA_CARD = 380
+    ESPACAMENTO = 12
+    MARGEM_H = 15
+    MARGEM_V = 10
+    LINHAS_FOLGA = 1  # linhas construídas além das visíveis, para a rolagem não mostrar buracos
+    LIMITE_POOL = 30  # cards fora da tela mantidos para reuso
+
+    def __init__(self, scroll_area, card_manager, parent=None):
+        super().__init__(parent)
+        self._scroll_area = scroll_area
+        self._card_manager = card_manager
+        self._pedidos = []
+        self._indices = {}  # id do pedido -> posição em _pedidos
+        # id do pedido -> (assinatura dos dados, card); ordem = uso mais recente por último
+        self._cards = OrderedDict()
+        self._construidos = 0  # cards criados desde o início (reaproveitados não contam)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.setMinimumWidth(
+            self.COLUNAS * self.LARGURA_MIN + (self.COLUNAS - 1) * self.ESPACAMENTO + 2 * self.MARGEM_H
+        )
+        scroll_area.verticalScrollBar().valueChanged.connect(self._atualizar_visiveis)
+
+    @staticmethod
+    def _assinatura(pedido):
+        # Os dicts vêm de _montar_pedidos com as chaves sempre na mesma ordem
+        return repr(pedido)
+
+    def definir_pedidos(self, pedidos):
+        """Troca a lista exibida. Cards de pedidos que continuam iguais são mantidos; os demais são descartados."""
+        self._pedidos = list(pedidos)
+        self._indices = {pedido.get('id'): i for i, pedido in enumerate(self._pedidos)}
+        for pedido_id, (assinatura, card) in list(self._cards.items()):
+            i = self._indices.get(pedido_id)
+            if i is None or self._assinatura(self._pedidos[i]) != assinatura:
+                self._descartar(pedido_id)
+        linhas = -(-len(self._pedidos) // self.COLUNAS)
+        altura = 2 * self.MARGEM_V + linhas * self.ALTURA_CARD + max(linhas - 1, 0) * self.ESPACAMENTO
+        self.setFixedHeight(altura)
+        self._atualizar_visiveis()
+
+    def contem(self, pedido_id):
+        """True se o pedido está na lista exibida"""
+        return pedido_id in self._indices
+
+    def atualizar_pedido(self, pedido):
+        """Troca os dados de um pedido já exibido, mantendo a posição; só o card dele é reconstruído.
+        Retorna False se o pedido não está na lista."""
+        pedido_id = pedido.get('id')
+        i = self._indices.get(pedido_id)
+        if i is None:
+            return False
+        self._pedidos[i] = pedido
+        if pedido_id in self._cards and self._cards[pedido_id][0] != self._assinatura(pedido):
+            self._descartar(pedido_id)
+        self._atualizar_visiveis()
+        return True
+
+    def total_cards_construidos(self):
+        """Quantidade de cards criados desde o início (cada chamada a criar_card)"""
+        return self._construidos
+
+    def total_cards_vivos(self):
+        """Quantidade de cards existentes (visíveis ou no pool)"""
+        return len(self._cards)
+
+    def _descartar(self, pedido_id):
+        _, card = self._cards.pop(pedido_id)
+        card.hide()
+        card.deleteLater()
+
+    def _geometria_colunas(self):
+        """(x da primeira coluna, largura do card) para a largura atual"""
+        disponivel = self.width() - 2 * self.MARGEM_H - (self.COLUNAS - 1) * self.ESPACAMENTO
+        largura = max(self.LARGURA_MIN, min(self.LARGURA_MAX, disponivel // self.COLUNAS))
+        ocupado = self.COLUNAS * largura + (self.COLUNAS - 1) * self.ESPACAMENTO
+        return max(self.MARGEM_H, (self.width() - ocupado) // 2), largura
+
+    def _linhas_visiveis(self):
+        """Intervalo [primeira, última] de linhas que cruzam a área visível (com folga)"""
+        viewport = self._scroll_area.viewport()
+        topo = -self.mapTo(viewport, QPoint(0, 0)).y()
+        passo = self.ALTURA_CARD + self.ESPACAMENTO
+        primeira = max(0, (topo - self.MARGEM_V) // passo - self.LINHAS_FOLGA)
+        ultima = (topo + viewport.height() - self.MARGEM_V) // passo + self.LINHAS_FOLGA
+        return primeira, ultima
+
+    def _atualizar_visiveis(self, *_):
+        if not self._pedidos:
+            for pedido_id in list(self._cards):
+                self._descartar(pedido_id)
+            return
+        primeira, ultima = self._linhas_visiveis()
+        inicio = primeira * self.COLUNAS
+        fim = min(len(self._pedidos), (ultima + 1) * self.COLUNAS)
+        x0, largura = self._geometria_colunas()
+        visiveis = set()
+        for i in range(inicio, fim):
+            pedido = self._pedidos[i]
+            pedido_id = pedido.get('id')
+            card = self._card(pedido_id, pedido)
+            if card is None:
+                continue
+            linha, coluna = divmod(i, self.COLUNAS)
+            card.setGeometry(
+                x0 + coluna * (largura + self.ESPACAMENTO),
+                self.MARGEM_V + linha * (self.ALTURA_CARD + self.ESPACAMENTO),
+                largura, self.ALTURA_CARD
+            )
+            card.show()
+            visiveis.add(pedido_id)
+
+        # Cards que saíram da tela ficam escondidos no pool; o excedente (menos usado) é descartado
+        fora = [pedido_id for pedido_id in self._cards if pedido_id not in visiveis]
+        for pedido_id in fora:
+            self._cards[pedido_id][1].hide()
+        for pedido_id in fora[:max(0, len(fora) - self.LIMITE_POOL)]:
+            self._descartar(pedido_id)
+
+    def _card(self, pedido_id, pedido):
+        """Card do pedido, reaproveitado se já existe com os mesmos dados"""
+        if pedido_id in self._cards:
+            self._cards.move_to_end(pedido_id)
+            return self._cards[pedido_id][1]
+        try:
+            card = self._card_manager.criar_card(pedido)
+        except Exception as e:
+            print(f"Erro ao criar card para pedido {pedido_id}: {e}")
+            return None
+        self._construidos += 1
+        card.setParent(self)
+        self._cards[pedido_id] = (self._assinatura(pedido), card)
+        return card
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._atualizar_visiveis()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._atualizar_visiveis()
@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QFrame, QMenu, QApplication)
 from PyQt6.QtCore import Qt, pyqtSignal, QPoint, QTimer, QEvent
@@ -766,8 +766,15 @@ class PedidosCard(QWidget):
 
     def _obter_data_entrega(self, pedido):
         """Determina a data de entrega acordada.
-        Preferência: pedido['data_entrega'] -> date; senão data_criacao + prazo(dias).
+        Preferência: pedido['data_prazo'] (ISO, calculado no banco) -> pedido['data_entrega'] -> data_criacao + prazo(dias).
         """
+        data_prazo = pedido.get('data_prazo')
+        if data_prazo:
+            try:
+                return date.fromisoformat(str(data_prazo)[:10])
+            except Exception:
+                pass
+
         data_entrega = pedido.get('data_entrega')
         if data_entrega:
             try:
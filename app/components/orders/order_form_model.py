@@ -1,3 +1,6 @@
+from database.crud.order_items import montar_itens
+
+
 class PedidoFormModel:
     """Model para armazenar dados temporários do formulário de OS."""
     def __init__(self):
@@ -33,31 +36,8 @@ class PedidoFormModel:
             'reforco': 'sim' if str(dados.get('reforco', False)).lower() in ('1','true','sim','yes') else 'não',
             'valor_total': f"{float(dados.get('valor_total', dados.get('valor_produto', 0)) or 0):.2f}",
         }
-        # Produtos: prefer structured 'produtos' provided by newer UI
-        self.produtos_list = []
-        if isinstance(dados.get('produtos'), (list, tuple)) and len(dados.get('produtos')) > 0:
-            for p in dados.get('produtos'):
-                try:
-                    desc = str(p.get('descricao') or p.get('nome') or '').strip()
-                    valor = float(p.get('valor') or p.get('preco') or 0)
-                except Exception:
-                    desc = str(p.get('descricao') or '').strip()
-                    try:
-                        valor = float(str(p.get('valor') or '0').replace(',', '.'))
-                    except Exception:
-                        valor = 0.0
-                self.produtos_list.append({'descricao': desc, 'valor': valor})
-        else:
-            detalhes = dados.get('detalhes_produto', '') or ''
-            for linha in [l.strip() for l in detalhes.replace('\r', '\n').split('\n') if l.strip() and not l.strip().startswith('-')]:
-                if ' - R$ ' in linha:
-                    try:
-                        desc, valtxt = linha.rsplit(' - R$ ', 1)
-                        valtxt_original = valtxt.strip()
-                        valconv = valtxt_original.replace('.', '').replace(',', '.') if ',' in valtxt_original else valtxt_original
-                        valor = float(valconv) if valconv else 0.0
-                        self.produtos_list.append({'descricao': desc.strip('\u2022 ').strip(), 'valor': valor})
-                    except Exception as e:
-                        self.produtos_list.append({'descricao': linha.strip('\u2022 ').strip(), 'valor': 0.0})
-                else:
-                    self.produtos_list.append({'descricao': linha.strip('\u2022 ').strip(), 'valor': 0.0})
+        # Produtos: structured 'produtos' (from ordem_item); detalhes_produto text only for legacy payloads
+        self.produtos_list = [
+            {'descricao': item['descricao'], 'valor': item['valor']}
+            for item in montar_itens(dados)
+        ]
@@ -76,6 +76,7 @@ class NovoPedidosModal(QDialog):
         # Variáveis para controle de edição
         self.is_editing = False
         self.numero_os_original = None
+        self.numero_os_reservado = None  # Número reservado para um novo pedido (liberado se não salvar)
         self.pedido_id_editando = None  # ID do pedido sendo editado
         self.titulo_label = None  # Referência para atualizar o título
         
@@ -299,7 +300,9 @@ class NovoPedidosModal(QDialog):
         if self.is_editing and self.numero_os_original:
             numero_os = self.numero_os_original
         else:
-            numero_os = Contador().get_proximo_numero()
+            # Reservar o número: outro modal aberto ao mesmo tempo recebe o seguinte
+            self.numero_os_reservado = Contador().reservar()
+            numero_os = self.numero_os_reservado
             
         self.titulo_label = QLabel(f"Ordem de Serviço Nº {numero_os:05d}")
         self.titulo_label.setObjectName("titulo")
@@ -1092,17 +1095,6 @@ class NovoPedidosModal(QDialog):
                 'endereco': self.input_endereco.text().strip()
             }
             
-            # Salvar cliente se não existir
-            if self.cliente_selecionado:
-                cliente_id = self.cliente_selecionado['id']
-            else:
-                cliente_id = db_manager.salvar_cliente(
-                    cliente_data['nome'],
-                    cliente_data['cnpj'],
-                    cliente_data['telefone'],
-                    cliente_data['endereco']
-                )
-            
             # Calcular total
             valor_total = sum(p['valor'] for p in self.produtos_list)
             
@@ -1136,8 +1128,11 @@ class NovoPedidosModal(QDialog):
                 numero_os = self.numero_os_original
                 print(f"Usando número OS original: {numero_os}")
             else:
-                numero_os = Contador().get_proximo_numero()
-                print(f"Gerando novo número OS: {numero_os}")
+                # Número reservado no cabeçalho; a alocação definitiva ocorre na transação de gravação
+                if self.numero_os_reservado is None:
+                    self.numero_os_reservado = Contador().reservar()
+                numero_os = self.numero_os_reservado
+                print(f"Usando número OS reservado: {numero_os}")
             
             # Dados do pedido
             if self.is_editing and self.pedido_id_editando:
@@ -1201,18 +1196,35 @@ class NovoPedidosModal(QDialog):
                     'produtos': self.produtos_list
                 }
             
-            # Salvar ou atualizar pedido
+            # Cliente novo e pedido gravados numa transação só: se o pedido falhar, o cliente não fica salvo
+            with db_manager.transaction():
+                if not self.cliente_selecionado:
+                    db_manager.inserir_cliente(
+                        cliente_data['nome'],
+                        cpf=cliente_data['cnpj'],
+                        telefone=cliente_data['telefone'],
+                        endereco=cliente_data['endereco']
+                    )
+                
+                if self.is_editing and self.pedido_id_editando:
+                    # Atualizar pedido existente
+                    print(f"Atualizando pedido ID: {self.pedido_id_editando}")
+                    resultado = db_manager.atualizar_pedido(self.pedido_id_editando, pedido_data)
+                    pedido_id = self.pedido_id_editando
+                else:
+                    # Criar novo pedido
+                    print(f"Criando novo pedido")
+                    resultado = pedido_id = db_manager.salvar_ordem(pedido_data)
+                if not resultado:
+                    # A exceção desfaz a transação inteira (inclusive o cliente recém-cadastrado)
+                    raise RuntimeError("o banco de dados não gravou o pedido")
             
             if self.is_editing and self.pedido_id_editando:
-                # Atualizar pedido existente
-                print(f"Atualizando pedido ID: {self.pedido_id_editando}")
-                resultado = db_manager.atualizar_pedido(self.pedido_id_editando, pedido_data)
-                pedido_id = self.pedido_id_editando
                 QMessageBox.information(self, "Sucesso", f"Pedido #{numero_os:05d} atualizado com sucesso!")
             else:
-                # Criar novo pedido
-                print(f"Criando novo pedido")
-                pedido_id = db_manager.salvar_ordem(pedido_data)
+                # Reserva consumida; o número gravado pode diferir se a reserva expirou
+                self.numero_os_reservado = None
+                numero_os = pedido_data.get('numero_os', numero_os)
                 QMessageBox.information(self, "Sucesso", f"Pedido #{numero_os:05d} salvo com sucesso!")
             
             # Emitir sinal e fechar
@@ -1222,6 +1234,17 @@ class NovoPedidosModal(QDialog):
         except Exception as e:
             QMessageBox.critical(self, "Erro", f"Erro ao salvar pedido:\n{e}")
     
+    def _liberar_numero_reservado(self):
+        """Devolve o número de OS reservado quando o pedido não foi salvo"""
+        if self.numero_os_reservado is not None:
+            Contador().liberar(self.numero_os_reservado)
+            self.numero_os_reservado = None
+    
+    def done(self, result):
+        """Libera o número reservado ao fechar o modal sem salvar"""
+        self._liberar_numero_reservado()
+        super().done(result)
+    
     def _aplicar_estilo(self):
         """Aplica o estilo moderno em tema escuro com cinza e branco"""
         self.setStyleSheet("""
@@ -1477,6 +1500,7 @@ class NovoPedidosModal(QDialog):
         try:
             # Marcar como edição e salvar número da OS original
             self.is_editing = True
+            self._liberar_numero_reservado()
             if 'id' in pedido_data:
                 self.pedido_id_editando = pedido_data['id']
             if 'numero_os' in pedido_data:
@@ -10,7 +10,6 @@ from PyQt6.QtWidgets import (
 	QPushButton,
 	QScrollArea,
 	QFrame,
-	QGridLayout,
 	QSizePolicy,
 	QLineEdit,
 	QDateEdit,
@@ -21,6 +20,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, pyqtSignal, QDate, QTimer
 from PyQt6.QtGui import QFont, QPalette, QColor
 from app.signals import get_signals
+from app.utils.query_executor import get_query_executor
 from app.utils.keyboard_shortcuts import setup_standard_shortcuts
 
 # Import robusto do gerenciador de banco de dados
@@ -37,6 +37,7 @@ except ModuleNotFoundError:
 try:
 	from .order_card import PedidosCard
 	from .order_modal import NovoPedidosModal
+	from .card_grid import GradeCardsPedidos
 except Exception:
 	import sys, pathlib
 	ROOT = pathlib.Path(__file__).resolve().parents[3]
@@ -44,7 +45,10 @@ except Exception:
 		sys.path.insert(0, str(ROOT))
 	from app.components.orders.order_card import PedidosCard  # type: ignore
 	from app.components.orders.order_modal import NovoPedidosModal  # type: ignore
+	from app.components.orders.card_grid import GradeCardsPedidos  # type: ignore
 
+# Pedidos buscados por página (o restante vem pelo botão "Carregar mais")
+PAGE_SIZE = 50
 
 class CustomDateEdit(QDateEdit):
 	"""QDateEdit customizado com calendário que força a visibilidade dos números"""
@@ -256,14 +260,20 @@ class PedidosInterface(QWidget):
 		# Estado
 		self.status_filter = "todos"
 		self._cache_pedidos = None
+		self._cache_filtros = None
 		self._cache_timestamp = 0.0
 		self._cache_timeout = 20  # segundos
+		self._proxima_pagina = None  # token de paginação (keyset) da próxima página
 		
 		# Variáveis de filtro
 		self.search_text = ""
 
 		# Helpers
 		self.card_manager = PedidosCard(self)
+		self.card_manager.visualizar_clicked.connect(self.visualizar_pedido)
+		self.card_manager.editar_clicked.connect(self.editar_pedido)
+		self.card_manager.excluir_clicked.connect(self.excluir_pedido)
+		self.card_manager.status_changed.connect(self.atualizar_status)
 		
 		# Conectar sinais para atualizações em tempo real
 		self._conectar_sinais()
@@ -282,24 +292,87 @@ class PedidosInterface(QWidget):
 			signals.statuses_updated.connect(self._on_statuses_updated)
 			# Sinais de pedidos
 			signals.pedido_criado.connect(self._on_pedido_atualizado)
-			signals.pedido_editado.connect(self._on_pedido_atualizado)
-			signals.pedido_excluido.connect(self._on_pedido_atualizado)
+			signals.pedido_editado.connect(self._on_pedido_modificado)
+			signals.pedido_excluido.connect(self._on_pedido_excluido)
 			signals.pedido_status_atualizado.connect(self._on_status_atualizado)
 			signals.pedidos_atualizados.connect(self._on_pedidos_atualizados)
 		except Exception as e:
 			print(f"Erro ao conectar sinais: {e}")
 	
 	def _on_pedido_atualizado(self, pedido_id: int = None):
-		"""Atualiza a lista quando um pedido é modificado"""
+		"""Recarrega a lista quando um pedido é criado (a posição dele depende da ordenação da consulta)"""
 		self.carregar_dados(force_refresh=True)
 	
 	def _on_status_atualizado(self, pedido_id: int, novo_status: str):
-		"""Atualiza a lista quando o status de um pedido muda"""
-		self.carregar_dados(force_refresh=True)
+		"""Atualiza só o card do pedido quando o status dele muda"""
+		filtro_status = (self.status_filter or "todos").lower().strip()
+		if not self.grade_cards.contem(pedido_id):
+			# Pedido fora do quadro: só entra nele se passou a atender o filtro de status
+			if filtro_status != "todos" and filtro_status == (novo_status or "").lower().strip():
+				self.carregar_dados(force_refresh=True)
+			return
+		self._recarregar_pedido(pedido_id)
+
+	def _on_pedido_modificado(self, pedido_id: int):
+		"""Atualiza só o card do pedido editado"""
+		if self.grade_cards.contem(pedido_id):
+			self._recarregar_pedido(pedido_id)
+		elif self.search_text or (self.status_filter or "todos").lower().strip() != "todos":
+			# A edição pode ter feito o pedido passar a atender a busca ou o filtro
+			self.carregar_dados(force_refresh=True)
+
+	def _on_pedido_excluido(self, pedido_id: int):
+		"""Tira o card do pedido excluído, sem consultar o banco"""
+		self._substituir_pedido(pedido_id, None)
+
+	def _recarregar_pedido(self, pedido_id: int):
+		"""Busca só a linha do pedido (em segundo plano) e atualiza o card dele"""
+		get_query_executor().executar(
+			f'pedido_{pedido_id}', db_manager.obter_pedido, pedido_id,
+			ao_concluir=lambda pedido: self._pedido_recarregado(pedido_id, pedido),
+			ao_falhar=lambda msg: print(f"Erro ao atualizar pedido {pedido_id}: {msg}")
+		)
+
+	def _pedido_recarregado(self, pedido_id: int, pedido):
+		"""Aplica a linha relida; None (erro na consulta ou pedido sumiu) mantém o card como está"""
+		if pedido is None:
+			# Só o sinal pedido_excluido tira o card: erros de consulta também retornam None
+			print(f"Pedido {pedido_id} não pôde ser relido; card mantido")
+			return
+		self._substituir_pedido(pedido_id, pedido)
+
+	@staticmethod
+	def _chave_ordem(pedido):
+		"""Grupo (ativo/concluído) e prazo do pedido: a mesma regra de expr_concluido e expr_prazo_ordem na consulta"""
+		status = str(pedido.get('status') or '').lower()
+		return (status == 'entregue' or 'conclu' in status, pedido.get('data_prazo') or '9999-12-31')
+
+	def _substituir_pedido(self, pedido_id: int, pedido):
+		"""Troca os dados de um pedido no cache e no quadro; pedido None (excluído) ou fora do filtro tira o card.
+		Se o pedido mudou de posição na ordenação (status concluído ou prazo), a lista é recarregada."""
+		if not self._cache_pedidos:
+			return
+		posicao = next((i for i, p in enumerate(self._cache_pedidos) if p.get('id') == pedido_id), None)
+		if posicao is None:
+			return
+		filtro_status = (self.status_filter or "todos").lower().strip()
+		if pedido is not None and filtro_status != "todos" and str(pedido.get('status', '')).lower().strip() != filtro_status:
+			pedido = None
+		if pedido is None:
+			# As posições dos seguintes mudam: redesenha, reaproveitando os cards que não mudaram
+			self._cache_pedidos = self._cache_pedidos[:posicao] + self._cache_pedidos[posicao + 1:]
+			self._renderizar(self._cache_pedidos)
+			return
+		if self._chave_ordem(pedido) != self._chave_ordem(self._cache_pedidos[posicao]):
+			# A nova posição vem da consulta (pode cair fora das páginas carregadas);
+			# a recarga reaproveita os cards dos pedidos que não mudaram
+			self.carregar_dados(force_refresh=True)
+			return
+		self._cache_pedidos[posicao] = pedido
+		self.grade_cards.atualizar_pedido(pedido)
 	
 	def _on_pedidos_atualizados(self):
 		"""Atualiza a lista quando há mudança geral nos pedidos"""
-		self.carregar_dados(force_refresh=True)
 		# Mostrar estado de carregamento inicial (será substituído após carregar)
 		self._mostrar_msg("Carregando pedidos...", cor="#bbbbbb")
 		self.carregar_dados(force_refresh=True)
@@ -554,101 +627,63 @@ class PedidosInterface(QWidget):
 		self.scroll_area.setWidget(self.scroll_widget)
 		layout.addWidget(self.scroll_area)
 
+		# Grade virtualizada: só os cards visíveis existem, e são reaproveitados entre redesenhos
+		self.grade_cards = GradeCardsPedidos(self.scroll_area, self.card_manager, self.scroll_widget)
+		self.grade_cards.hide()
+
 	def _on_status_changed(self, status: str):
 		self.status_filter = status
 		self.carregar_dados()
 
 	def carregar_dados(self, force_refresh: bool = False):
 		now = time.time()
-		if not force_refresh and self._cache_pedidos and (now - self._cache_timestamp) < self._cache_timeout:
-			pedidos = self._cache_pedidos
-		else:
-			try:
-				pedidos = db_manager.listar_pedidos_ordenados_por_prazo(limite=50)
-				self._cache_pedidos = pedidos
-				self._cache_timestamp = now
-			except Exception as e:
-				print(f"Erro ao carregar pedidos: {e}")
-				self._mostrar_msg("❌ Erro ao carregar pedidos", cor="#ff6b6b")
-				return
-
-		# Filtrar por status
-		if self.status_filter and self.status_filter.lower() != "todos":
-			filtro = self.status_filter.lower()
-			pedidos_filtrados = []
-			for p in pedidos:
-				status_pedido = (p.get("status", "") or "").lower().strip()
-				# Normalizar para comparação
-				if filtro == status_pedido:
-					pedidos_filtrados.append(p)
-			pedidos = pedidos_filtrados
-		
-		# Filtrar por texto de busca (nome, CPF, telefone)
-		if hasattr(self, 'search_text') and self.search_text:
-			def _match_search(pedido):
-				search_fields = [
-					pedido.get('nome_cliente', '').lower(),
-					pedido.get('cpf_cliente', '').lower(),
-					pedido.get('telefone_cliente', '').lower(),
-				]
-				return any(self.search_text in field for field in search_fields if field)
-			
-			pedidos = [p for p in pedidos if _match_search(p)]
-		# Render
-		# Separar pedidos concluídos e ativos, ordenar por data de entrega
-		def _is_concluido(status: str) -> bool:
-			st = (status or "").lower()
-			return (st == "entregue") or ("conclu" in st)
-		
-		pedidos_ativos = [p for p in pedidos if not _is_concluido(p.get("status", ""))]
-		pedidos_concluidos = [p for p in pedidos if _is_concluido(p.get("status", ""))]
-		
-		# Ordenar por data de entrega mais próxima (asc)
-		try:
-			def _dias_restantes(p):
-				from datetime import datetime, timedelta
-				# Preferir data_entrega; se não existir, usar data_criacao + prazo
-				data_entrega = p.get("data_entrega")
-				if data_entrega:
-					try:
-						if isinstance(data_entrega, str):
-							for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%Y-%m-%dT%H:%M:%S"):
-								try:
-									return (datetime.strptime(data_entrega, fmt).date() - datetime.now().date()).days
-								except Exception:
-									pass
-							try:
-								return (datetime.fromisoformat(str(data_entrega)[:19]).date() - datetime.now().date()).days
-							except Exception:
-								pass
-					except Exception:
-						pass
-				try:
-					prazo = int(p.get("prazo") or 0)
-				except Exception:
-					prazo = 0
-				data_criacao = p.get("data_criacao")
-				if prazo > 0 and data_criacao:
-					try:
-						if isinstance(data_criacao, str):
-							base = datetime.fromisoformat(data_criacao[:19]) if len(data_criacao) >= 10 else datetime.strptime(data_criacao, "%Y-%m-%d")
-						elif hasattr(data_criacao, "date"):
-							base = data_criacao
-						else:
-							base = datetime.now()
-						return ((base + timedelta(days=prazo)).date() - datetime.now().date()).days
-					except Exception:
-						pass
-				# Sem data, colocar no fim
-				return 10**9
-			pedidos_ativos = sorted(pedidos_ativos, key=_dias_restantes)
-			pedidos_concluidos = sorted(pedidos_concluidos, key=_dias_restantes)
-		except Exception:
-			pass
-		
-		# Juntar: ativos primeiro, concluídos depois
-		pedidos = pedidos_ativos + pedidos_concluidos
+		# Filtros de status e texto aplicados no SQL (paginação keyset, sem carregar tudo)
+		filtro_status = (self.status_filter or "todos").lower().strip()
+		filtros = (filtro_status, self.search_text)
+		if (not force_refresh and self._cache_pedidos is not None and self._cache_filtros == filtros
+				and (now - self._cache_timestamp) < self._cache_timeout):
+			get_query_executor().cancelar('pedidos')
+			self._renderizar(self._cache_pedidos)
+			return
+		# Consulta em segundo plano; digitar na busca ou trocar o filtro cancela a anterior
+		get_query_executor().executar(
+			'pedidos', db_manager.listar_pedidos_pagina,
+			page_size=PAGE_SIZE, status=filtro_status, texto=self.search_text, ordem="prazo",
+			ao_concluir=lambda resultado: self._pagina_carregada(resultado, filtros, acrescentar=False),
+			ao_falhar=self._falha_ao_carregar
+		)
+
+	def carregar_mais(self):
+		"""Acrescenta a próxima página de pedidos aos já carregados"""
+		if not self._proxima_pagina or self._cache_filtros is None:
+			return
+		filtros = self._cache_filtros
+		filtro_status, texto = filtros
+		get_query_executor().executar(
+			'pedidos', db_manager.listar_pedidos_pagina,
+			self._proxima_pagina, PAGE_SIZE, status=filtro_status, texto=texto, ordem="prazo",
+			ao_concluir=lambda resultado: self._pagina_carregada(resultado, filtros, acrescentar=True),
+			ao_falhar=lambda msg: print(f"Erro ao carregar mais pedidos: {msg}")
+		)
+
+	def _pagina_carregada(self, resultado, filtros, acrescentar: bool):
+		"""Recebe (pedidos, próximo token) da consulta em segundo plano e redesenha os cards"""
+		pedidos, self._proxima_pagina = resultado
+		if acrescentar:
+			pedidos = (self._cache_pedidos or []) + pedidos
+		self._cache_pedidos = pedidos
+		self._cache_filtros = filtros
+		self._cache_timestamp = time.time()
+		self._renderizar(pedidos)
+
+	def _falha_ao_carregar(self, mensagem: str):
+		print(f"Erro ao carregar pedidos: {mensagem}")
+		self._limpar_layout()
+		self.grade_cards.definir_pedidos([])
+		self._mostrar_msg("❌ Erro ao carregar pedidos", cor="#ff6b6b")
 
+	def _renderizar(self, pedidos):
+		"""Desenha os cards dos pedidos carregados (já ordenados pela consulta: ativos primeiro, prazo mais próximo)"""
 		self._limpar_layout()
 		
 		# Atualizar contador de resultados
@@ -658,10 +693,13 @@ class PedidosInterface(QWidget):
 				self.label_resultados.setText("Nenhum resultado encontrado")
 			elif total == 1:
 				self.label_resultados.setText("1 pedido encontrado")
+			elif self._proxima_pagina:
+				self.label_resultados.setText(f"{total}+ pedidos encontrados")
 			else:
 				self.label_resultados.setText(f"{total} pedidos encontrados")
 		
 		if not pedidos:
+			self.grade_cards.definir_pedidos([])
 			self._mostrar_msg("📋 Nenhum pedido encontrado", cor="#aaaaaa")
 		else:
 			self._criar_grid_cards(pedidos)
@@ -671,7 +709,10 @@ class PedidosInterface(QWidget):
 		while self.scroll_layout.count():
 			item = self.scroll_layout.takeAt(0)
 			w = item.widget()
-			if w is not None:
+			if w is self.grade_cards:
+				# A grade é mantida (com seus cards); só sai do layout
+				w.hide()
+			elif w is not None:
 				w.deleteLater()
 
 	def recarregar_pedidos(self):
@@ -698,62 +739,30 @@ class PedidosInterface(QWidget):
 		self.scroll_layout.addWidget(lbl)
 
 	def _criar_grid_cards(self, pedidos):
-		grid = QWidget()
-		grid_l = QGridLayout(grid)
-		grid_l.setSpacing(12)  # Espaçamento reduzido entre cards
-		# Margens maiores para evitar corte
-		try:
-			grid_l.setContentsMargins(15, 10, 15, 10)
-		except Exception:
-			pass
-
-		# Conectar sinais uma vez
-		try:
-			self.card_manager.visualizar_clicked.disconnect()
-		except Exception:
-			pass
-		try:
-			self.card_manager.editar_clicked.disconnect()
-		except Exception:
-			pass
-		try:
-			self.card_manager.excluir_clicked.disconnect()
-		except Exception:
-			pass
-		try:
-			self.card_manager.status_changed.disconnect()
-		except Exception:
-			pass
-		self.card_manager.visualizar_clicked.connect(self.visualizar_pedido)
-		self.card_manager.editar_clicked.connect(self.editar_pedido)
-		self.card_manager.excluir_clicked.connect(self.excluir_pedido)
-		self.card_manager.status_changed.connect(self.atualizar_status)
-
-		# Forçar 3 colunas fixas (cards estão mais largos agora com 450-500px)
-		cols = 3
-		
-		print(f"Grid configurado para {cols} colunas")
-		
-		# Configurar stretch igual para todas as colunas
-		for col in range(cols):
-			grid_l.setColumnStretch(col, 1)
-		
-		r = c = 0
-		for pedido in pedidos:
-			try:
-				w = self.card_manager.criar_card(pedido)
-				grid_l.addWidget(w, r, c)
-				c += 1
-				if c >= cols:
-					c = 0
-					r += 1
-			except Exception as e:
-				print(f"Erro ao criar card para pedido {pedido.get('id')}: {e}")
-
-		# Configurar política de tamanho do grid para permitir scroll adequado
-		grid.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Minimum)
-		
-		self.scroll_layout.addWidget(grid)
+		# Cards de pedidos que não mudaram são reaproveitados; os novos só são criados quando ficam visíveis
+		self.scroll_layout.addWidget(self.grade_cards)
+		self.grade_cards.show()
+		self.grade_cards.definir_pedidos(pedidos)
+
+		# Botão para buscar a próxima página (só quando há mais resultados)
+		if self._proxima_pagina:
+			btn_mais = QPushButton("⬇ Carregar mais")
+			btn_mais.setCursor(Qt.CursorShape.PointingHandCursor)
+			btn_mais.setStyleSheet("""
+				QPushButton {
+					background-color: #3a3a3a;
+					color: #ffffff;
+					border: 1px solid #555555;
+					border-radius: 6px;
+					padding: 8px 20px;
+					font-size: 13px;
+				}
+				QPushButton:hover {
+					background-color: #4a4a4a;
+				}
+			""")
+			btn_mais.clicked.connect(self.carregar_mais)
+			self.scroll_layout.addWidget(btn_mais, alignment=Qt.AlignmentFlag.AlignCenter)
 		
 		# Espaçamento no final usando stretch
 		self.scroll_layout.addStretch()
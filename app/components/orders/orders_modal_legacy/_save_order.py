@@ -164,14 +164,18 @@ def _salvar_pedido(self, numero_os=None, pedido_data=None):
                     'forma_pagamento': dados['forma_pagamento'],
                     'prazo': dados['prazo']
                 }
-                resp = db_manager.atualizar_pedido(pedido_id, campos)
-                # atualizar JSON com status/desconto/cor/divisórias
-                # Não atualizar 'divisorias' a nível de ordem — divisórias agora são produtos separados
-                _ = db_manager.atualizar_json_campos(pedido_id, {
-                    'status': dados['status'],
-                    'desconto': dados['desconto'],
-                    'cor': dados['cor']
-                })
+                # Colunas e JSON numa transação só: se uma parte falhar, nenhuma fica gravada
+                with db_manager.transaction():
+                    resp = db_manager.atualizar_pedido(pedido_id, campos)
+                    # atualizar JSON com status/desconto/cor/divisórias
+                    # Não atualizar 'divisorias' a nível de ordem — divisórias agora são produtos separados
+                    resp = db_manager.atualizar_json_campos(pedido_id, {
+                        'status': dados['status'],
+                        'desconto': dados['desconto'],
+                        'cor': dados['cor']
+                    }) and resp
+                    if not resp:
+                        db_manager.conn.rollback()  # dentro da transação: desfaz as duas partes
                 if resp:
                     try:
                         QMessageBox.information(self, "Sucesso", "Pedido atualizado com sucesso!")
@@ -1,7 +1,6 @@
 from PyQt6.QtWidgets import QMenu, QMessageBox
 from PyQt6.QtGui import QCursor
 from database import db_manager
-import json
 
 
 def show_status_menu(parent, pedido_id):
@@ -11,17 +10,13 @@ def show_status_menu(parent, pedido_id):
     no menu e atualiza o pedido ao selecionar uma ação.
     """
     try:
-        # Buscar status atual do pedido (dados_json)
+        # Buscar status atual do pedido (coluna status)
         current_status = ''
         try:
-            db_manager.cursor.execute('SELECT dados_json FROM ordem_servico WHERE id = ?', (pedido_id,))
+            db_manager.cursor.execute('SELECT status FROM ordem_servico WHERE id = ?', (pedido_id,))
             row = db_manager.cursor.fetchone()
             if row and row[0]:
-                try:
-                    dados = json.loads(row[0])
-                    current_status = dados.get('status', '')
-                except Exception:
-                    current_status = ''
+                current_status = row[0]
         except Exception:
             current_status = ''
 
@@ -24,6 +24,9 @@ class AppSignals(QObject):
     produto_excluido = pyqtSignal(int)  # produto_id
     produtos_atualizados = pyqtSignal()
     
+    # Sinais para gastos
+    gastos_atualizados = pyqtSignal()
+    
     # Sinais para categorias
     categorias_atualizadas = pyqtSignal()
     
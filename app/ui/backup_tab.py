@@ -132,6 +132,13 @@ class BackupTab(QWidget):
         self.btn_view_auto_backups.setStyleSheet('padding:6px 12px; background-color: #264653;')
         middle_row.addWidget(self.btn_view_auto_backups)
         
+        self.btn_verificar_contadores = QPushButton("🔧 Verificar contadores")
+        self.btn_verificar_contadores.setToolTip("Confere número de compras, resumo de vendas e estatísticas de clientes com os pedidos e corrige divergências")
+        self.btn_verificar_contadores.clicked.connect(self.on_verificar_contadores)
+        self.btn_verificar_contadores.setMinimumHeight(36)
+        self.btn_verificar_contadores.setStyleSheet('padding:6px 12px; background-color: #6c757d;')
+        middle_row.addWidget(self.btn_verificar_contadores)
+        
         self.layout().addLayout(middle_row)
         
         # Export row: Export data to CSV/Excel
@@ -325,6 +332,43 @@ class BackupTab(QWidget):
             QMessageBox.critical(self, "Erro", f"Erro ao abrir visualizador: {e}")
             self.add_log(f'Erro ao abrir visualizador de deletados: {e}')
     
+    def on_verificar_contadores(self):
+        """Confere os contadores mantidos incrementalmente e corrige os que divergirem (em segundo plano)"""
+        from database import db_manager
+        from app.utils.query_executor import get_query_executor
+        self.btn_verificar_contadores.setEnabled(False)
+        self.add_log('Verificando contadores...')
+        get_query_executor().executar(
+            'verificar_contadores', db_manager.verificar_contadores, reparar=True,
+            ao_concluir=self._contadores_verificados,
+            ao_falhar=lambda msg: self._contadores_verificados(None)
+        )
+
+    def _contadores_verificados(self, resultado):
+        self.btn_verificar_contadores.setEnabled(True)
+        if resultado is None:
+            QMessageBox.critical(self, 'Erro', 'Falha ao verificar contadores')
+            self.add_log('ERRO ao verificar contadores')
+            return
+        nomes = {
+            'numero_compras': 'Número de compras dos clientes',
+            'vendas_diarias': 'Resumo diário de vendas',
+            'vendas_pagamento_diarias': 'Resumo de vendas por forma de pagamento',
+            'cliente_estatisticas': 'Estatísticas por cliente',
+        }
+        if not any(resultado.values()):
+            self.add_log('Contadores conferidos: nenhuma divergência')
+            QMessageBox.information(self, 'Contadores', 'Todos os contadores conferem com os pedidos.')
+            return
+        linhas = [f'{nomes.get(nome, nome)}: {qtd} corrigidos' for nome, qtd in resultado.items() if qtd]
+        self.add_log('Contadores corrigidos:\n' + '\n'.join(linhas))
+        QMessageBox.information(self, 'Contadores', 'Divergências corrigidas:\n' + '\n'.join(linhas))
+        try:
+            from app.signals import get_signals
+            get_signals().pedidos_atualizados.emit()
+        except Exception:
+            pass
+
     def on_backup_now(self):
         """Força um backup manual imediato"""
         try:
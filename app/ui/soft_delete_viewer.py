@@ -7,6 +7,8 @@ from PyQt6.QtWidgets import (
     QTableWidgetItem, QPushButton, QLabel, QMessageBox, QHeaderView
 )
 from PyQt6.QtCore import Qt
+from app.signals import get_signals
+from app.utils.query_executor import get_query_executor
 
 
 class SoftDeleteViewer(QDialog):
@@ -125,11 +127,29 @@ class SoftDeleteViewer(QDialog):
         return widget
     
     def _load_data(self):
-        """Carrega dados deletados de todas as tabelas"""
+        """Carrega dados deletados de todas as tabelas (consultas em segundo plano)"""
+        get_query_executor().executar(
+            'lixeira', self._consultar_deletados,
+            ao_concluir=self._mostrar_deletados,
+            ao_falhar=lambda msg: QMessageBox.warning(self, "Erro", f"❌ Falha ao carregar registros: {msg}")
+        )
+
+    @staticmethod
+    def _consultar_deletados():
+        """Busca os registros deletados (roda fora da thread da interface)"""
         from app.utils.soft_delete import SoftDeleteManager
+        return (
+            SoftDeleteManager.list_deleted_pedidos(),
+            SoftDeleteManager.list_deleted_clientes(),
+            SoftDeleteManager.list_deleted_produtos(),
+            SoftDeleteManager.list_deleted_gastos(),
+        )
+
+    def _mostrar_deletados(self, resultado):
+        """Preenche as abas com os registros deletados"""
+        pedidos, clientes, produtos, gastos = resultado
         
         # Carregar Pedidos
-        pedidos = SoftDeleteManager.list_deleted_pedidos()
         self._populate_table(
             self.pedidos_tab.findChild(QTableWidget),
             pedidos,
@@ -139,7 +159,6 @@ class SoftDeleteViewer(QDialog):
         label.setText(f"Pedidos: {len(pedidos)} registros deletados")
         
         # Carregar Clientes
-        clientes = SoftDeleteManager.list_deleted_clientes()
         self._populate_table(
             self.clientes_tab.findChild(QTableWidget),
             clientes,
@@ -149,7 +168,6 @@ class SoftDeleteViewer(QDialog):
         label.setText(f"Clientes: {len(clientes)} registros deletados")
         
         # Carregar Produtos
-        produtos = SoftDeleteManager.list_deleted_produtos()
         self._populate_table(
             self.produtos_tab.findChild(QTableWidget),
             produtos,
@@ -159,7 +177,6 @@ class SoftDeleteViewer(QDialog):
         label.setText(f"Produtos: {len(produtos)} registros deletados")
         
         # Carregar Gastos
-        gastos = SoftDeleteManager.list_deleted_gastos()
         self._populate_table(
             self.gastos_tab.findChild(QTableWidget),
             gastos,
@@ -235,6 +252,15 @@ class SoftDeleteViewer(QDialog):
             sucesso, mensagem = SoftDeleteManager.restore_gasto(record_id)
         
         if sucesso:
+            # Avisar as outras abas (e o cache de relatórios) que os dados mudaram
+            try:
+                signals = get_signals()
+                if current_index == 0:
+                    signals.pedidos_atualizados.emit()
+                elif current_index == 3:
+                    signals.gastos_atualizados.emit()
+            except Exception as e:
+                print(f"Erro ao emitir sinais: {e}")
             QMessageBox.information(self, "Sucesso", f"✅ {mensagem}")
             self._load_data()  # Recarregar
         else:
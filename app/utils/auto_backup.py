@@ -12,11 +12,13 @@ from PyQt6.QtCore import QTimer, QTime, QDateTime, Qt
 from PyQt6.QtWidgets import QMessageBox
 from datetime import datetime, timedelta
 import os
-import shutil
 from pathlib import Path
 from typing import Tuple, List
 import logging
 
+from app.backup.backup_file import copiar_banco
+from database.core.connection_pool import get_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -116,8 +118,11 @@ class AutoBackupScheduler:
             backup_filename = f"backup_auto_{timestamp}.db"
             backup_path = os.path.join(backup_dir, backup_filename)
             
-            # Copiar banco de dados
-            shutil.copy2(db_path, backup_path)
+            # Copiar banco de dados pela API de backup do SQLite (inclui o que ainda está no WAL);
+            # sem o arquivo, abrir a conexão criaria um banco vazio
+            if not os.path.exists(db_path):
+                raise FileNotFoundError(db_path)
+            copiar_banco(get_pool(db_path).conexao(), backup_path)
             
             # Verificar se foi criado
             if os.path.exists(backup_path):
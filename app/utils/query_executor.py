@@ -0,0 +1,177 @@
+"""
+Executor de consultas em segundo plano.
+
+Funcionalidades:
+- Roda consultas/relatórios em um QThreadPool, fora da thread da interface
+- Cada thread do pool usa a sua própria conexão SQLite (pool por thread do DatabaseManager)
+- Entrega o resultado de volta na thread da interface via sinais
+- Pedidos com a mesma chave substituem o anterior: o resultado antigo é descartado
+  e a consulta ainda em andamento é interrompida
+"""
+
+import threading
+import logging
+from typing import Callable, Optional
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+
+class _SinaisTarefa(QObject):
+    """Sinais de uma tarefa (QRunnable não é QObject)"""
+    concluida = pyqtSignal(str, int, object)  # chave, id do pedido, resultado
+    falhou = pyqtSignal(str, int, str)  # chave, id do pedido, mensagem
+    terminada = pyqtSignal(int)  # id do pedido (sempre emitido, mesmo se cancelada)
+
+
+class _Tarefa(QRunnable):
+    """Executa uma função numa thread do pool e guarda a conexão usada, para poder interrompê-la"""
+
+    def __init__(self, chave: str, pedido_id: int, funcao: Callable, args, kwargs):
+        super().__init__()
+        # O executor mantém a referência até o fim da execução (ver QueryExecutor._vivas)
+        self.setAutoDelete(False)
+        self.chave = chave
+        self.pedido_id = pedido_id
+        self.funcao = funcao
+        self.args = args
+        self.kwargs = kwargs
+        self.sinais = _SinaisTarefa()
+        self.cancelada = False
+        self._conexao = None
+        self._lock = threading.Lock()
+
+    def run(self):
+        try:
+            self._executar()
+        finally:
+            self.sinais.terminada.emit(self.pedido_id)
+
+    def _executar(self):
+        if self.cancelada:
+            return
+        try:
+            from database.core.connection_pool import get_pool
+            with self._lock:
+                self._conexao = get_pool().conexao()
+            resultado = self.funcao(*self.args, **self.kwargs)
+        except Exception as e:
+            if not self.cancelada:
+                self.sinais.falhou.emit(self.chave, self.pedido_id, str(e))
+            return
+        finally:
+            with self._lock:
+                self._conexao = None
+            # As threads do QThreadPool não são threads do Python: a conexão é fechada aqui,
+            # pela própria thread dona, em vez de ficar aberta entre tarefas
+            try:
+                from database.core.connection_pool import get_pool
+                get_pool().fechar_conexao_da_thread()
+            except Exception as e:
+                logger.warning(f"Could not close worker connection: {e}")
+        if not self.cancelada:
+            self.sinais.concluida.emit(self.chave, self.pedido_id, resultado)
+
+    def cancelar(self):
+        """Marca a tarefa como obsoleta e interrompe a consulta SQLite em andamento"""
+        self.cancelada = True
+        with self._lock:
+            if self._conexao is not None:
+                try:
+                    self._conexao.interrupt()
+                except Exception as e:
+                    logger.warning(f"Could not interrupt query: {e}")
+
+
+class QueryExecutor(QObject):
+    """Serviço que roda consultas em segundo plano e devolve o resultado por sinais.
+
+    Uso:
+        executor.executar('financeiro', db_manager.calcular_resumo_vendas, inicio, fim,
+                          ao_concluir=self._mostrar_resumo)
+    """
+
+    resultado_pronto = pyqtSignal(str, object)  # chave, resultado
+    erro = pyqtSignal(str, str)  # chave, mensagem
+
+    def __init__(self, parent=None, max_threads: int = 2):
+        super().__init__(parent)
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(max_threads)
+        self._tarefas = {}  # chave -> tarefa mais recente
+        self._vivas = {}  # id do pedido -> tarefa ainda no pool (inclusive canceladas)
+        self._callbacks = {}  # chave -> (ao_concluir, ao_falhar)
+        self._proximo_id = 0
+
+    def executar(self, chave: str, funcao: Callable, *args, ao_concluir: Optional[Callable] = None,
+                 ao_falhar: Optional[Callable] = None, **kwargs) -> int:
+        """Agenda funcao(*args, **kwargs); um pedido anterior com a mesma chave é cancelado.
+        Retorna o id do pedido.
+        """
+        self.cancelar(chave)
+        self._proximo_id += 1
+        tarefa = _Tarefa(chave, self._proximo_id, funcao, args, kwargs)
+        tarefa.sinais.concluida.connect(self._on_concluida)
+        tarefa.sinais.falhou.connect(self._on_falhou)
+        tarefa.sinais.terminada.connect(self._on_terminada)
+        self._vivas[tarefa.pedido_id] = tarefa
+        self._tarefas[chave] = tarefa
+        self._callbacks[chave] = (ao_concluir, ao_falhar)
+        self._pool.start(tarefa)
+        return tarefa.pedido_id
+
+    def cancelar(self, chave: str):
+        """Cancela o pedido pendente da chave (o resultado, se chegar, é ignorado)"""
+        tarefa = self._tarefas.pop(chave, None)
+        self._callbacks.pop(chave, None)
+        if tarefa is not None:
+            tarefa.cancelar()
+
+    def cancelar_todos(self):
+        for chave in list(self._tarefas):
+            self.cancelar(chave)
+
+    def em_andamento(self, chave: str) -> bool:
+        return chave in self._tarefas
+
+    def _pedido_atual(self, chave: str, pedido_id: int) -> bool:
+        tarefa = self._tarefas.get(chave)
+        return tarefa is not None and tarefa.pedido_id == pedido_id
+
+    def _on_concluida(self, chave: str, pedido_id: int, resultado):
+        # Resultados de pedidos substituídos chegam atrasados e são descartados
+        if not self._pedido_atual(chave, pedido_id):
+            return
+        self._tarefas.pop(chave, None)
+        ao_concluir, _ = self._callbacks.pop(chave, (None, None))
+        if ao_concluir is not None:
+            try:
+                ao_concluir(resultado)
+            except Exception as e:
+                logger.error(f"Error handling query result '{chave}': {e}", exc_info=True)
+        self.resultado_pronto.emit(chave, resultado)
+
+    def _on_terminada(self, pedido_id: int):
+        self._vivas.pop(pedido_id, None)
+
+    def _on_falhou(self, chave: str, pedido_id: int, mensagem: str):
+        if not self._pedido_atual(chave, pedido_id):
+            return
+        self._tarefas.pop(chave, None)
+        _, ao_falhar = self._callbacks.pop(chave, (None, None))
+        logger.error(f"Background query '{chave}' failed: {mensagem}")
+        if ao_falhar is not None:
+            ao_falhar(mensagem)
+        self.erro.emit(chave, mensagem)
+
+
+_executor = None
+
+
+def get_query_executor() -> QueryExecutor:
+    """Instância compartilhada (criada na thread da interface no primeiro uso)"""
+    global _executor
+    if _executor is None:
+        _executor = QueryExecutor()
+    return _executor
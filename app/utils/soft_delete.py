@@ -22,56 +22,45 @@ class SoftDeleteManager:
         db_dir = os.path.join(base_path, "OrdemServico")
         return os.path.join(db_dir, "ordem_servico.db")
     
+    @staticmethod
+    def _conexao(db_path: str) -> sqlite3.Connection:
+        """Retorna a conexão do pool da thread atual (não deve ser fechada pelo chamador)"""
+        from database.core.connection_pool import get_pool
+        return get_pool(db_path).conexao()
+    
+    @staticmethod
+    def _rollback(db_path: str) -> None:
+        """Desfaz uma transação pendente após erro, mantendo a conexão do pool utilizável"""
+        try:
+            SoftDeleteManager._conexao(db_path).rollback()
+        except Exception:
+            pass
+    
+    @staticmethod
+    def _invalidar_relatorios(tabela: str) -> None:
+        """Descarta os relatórios em cache que dependem da tabela alterada"""
+        grupo = {'ordem_servico': 'pedidos', 'gastos': 'gastos'}.get(tabela)
+        if grupo:
+            from database import db_manager
+            db_manager.relatorios_cache.invalidar(grupo)
+    
     @staticmethod
     def migrate_add_deleted_at_columns():
         """
         Adiciona coluna deleted_at em todas as tabelas principais.
-        Executa migração segura (ignora se coluna já existe).
+        Executa migração segura (ignora se coluna já existe). Na inicialização do app
+        esta etapa é feita pelo executor de migrações (database/migrations/runner.py).
         
         Returns:
             Tupla (sucesso: bool, mensagem: str)
         """
+        from database.migrations.add_deleted_at import migrate_add_deleted_at
         db_path = SoftDeleteManager.get_database_path()
         
-        try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # Lista de tabelas para adicionar soft delete
-            tabelas = ['ordem_servico', 'clientes', 'produtos', 'gastos']
-            
-            for tabela in tabelas:
-                try:
-                    cursor.execute(f"ALTER TABLE {tabela} ADD COLUMN deleted_at TEXT")
-                    print(f"✅ Coluna deleted_at adicionada em {tabela}")
-                except sqlite3.OperationalError as e:
-                    if "duplicate column" in str(e).lower():
-                        print(f"ℹ️ Coluna deleted_at já existe em {tabela}")
-                    else:
-                        print(f"⚠️ Erro ao adicionar coluna em {tabela}: {e}")
-            
-            # Criar índices para melhorar performance de filtros
-            indices = [
-                ("idx_ordem_servico_deleted", "ordem_servico", "deleted_at"),
-                ("idx_clientes_deleted", "clientes", "deleted_at"),
-                ("idx_produtos_deleted", "produtos", "deleted_at"),
-                ("idx_gastos_deleted", "gastos", "deleted_at"),
-            ]
-            
-            for idx_name, tabela, coluna in indices:
-                try:
-                    cursor.execute(f"CREATE INDEX IF NOT EXISTS {idx_name} ON {tabela}({coluna})")
-                    print(f"✅ Índice {idx_name} criado")
-                except Exception as e:
-                    print(f"⚠️ Erro ao criar índice {idx_name}: {e}")
-            
-            conn.commit()
-            conn.close()
-            
+        # A migração roda na conexão do pool da thread atual (a mesma do DatabaseManager)
+        if migrate_add_deleted_at(SoftDeleteManager._conexao(db_path)):
             return True, "Migração de Soft Delete concluída com sucesso!"
-            
-        except Exception as e:
-            return False, f"Erro na migração: {str(e)}"
+        return False, "Erro na migração de Soft Delete"
     
     # ===== SOFT DELETE FUNCTIONS =====
     
@@ -101,7 +90,7 @@ class SoftDeleteManager:
         db_path = SoftDeleteManager.get_database_path()
         
         try:
-            conn = sqlite3.connect(db_path)
+            conn = SoftDeleteManager._conexao(db_path)
             cursor = conn.cursor()
             
             # Verificar se registro existe e não está deletado
@@ -109,11 +98,9 @@ class SoftDeleteManager:
             result = cursor.fetchone()
             
             if not result:
-                conn.close()
                 return False, f"Registro {record_id} não encontrado em {tabela}"
             
             if result[0]:  # Já está deletado
-                conn.close()
                 return False, f"Registro {record_id} já está deletado"
             
             # Marcar como deletado
@@ -122,11 +109,12 @@ class SoftDeleteManager:
                          (now, record_id))
             
             conn.commit()
-            conn.close()
+            SoftDeleteManager._invalidar_relatorios(tabela)
             
             return True, f"Registro {record_id} marcado como deletado"
             
         except Exception as e:
+            SoftDeleteManager._rollback(db_path)
             return False, f"Erro ao deletar: {str(e)}"
     
     # ===== RESTORE FUNCTIONS =====
@@ -157,7 +145,7 @@ class SoftDeleteManager:
         db_path = SoftDeleteManager.get_database_path()
         
         try:
-            conn = sqlite3.connect(db_path)
+            conn = SoftDeleteManager._conexao(db_path)
             cursor = conn.cursor()
             
             # Verificar se registro existe e está deletado
@@ -165,11 +153,9 @@ class SoftDeleteManager:
             result = cursor.fetchone()
             
             if not result:
-                conn.close()
                 return False, f"Registro {record_id} não encontrado em {tabela}"
             
             if not result[0]:  # Não está deletado
-                conn.close()
                 return False, f"Registro {record_id} não está deletado"
             
             # Restaurar (remover deleted_at)
@@ -177,11 +163,12 @@ class SoftDeleteManager:
                          (record_id,))
             
             conn.commit()
-            conn.close()
+            SoftDeleteManager._invalidar_relatorios(tabela)
             
             return True, f"Registro {record_id} restaurado com sucesso"
             
         except Exception as e:
+            SoftDeleteManager._rollback(db_path)
             return False, f"Erro ao restaurar: {str(e)}"
     
     # ===== LIST DELETED FUNCTIONS =====
@@ -212,13 +199,12 @@ class SoftDeleteManager:
         db_path = SoftDeleteManager.get_database_path()
         
         try:
-            conn = sqlite3.connect(db_path)
+            conn = SoftDeleteManager._conexao(db_path)
             cursor = conn.cursor()
             
             cursor.execute(f"SELECT * FROM {tabela} WHERE deleted_at IS NOT NULL ORDER BY deleted_at DESC")
             results = cursor.fetchall()
             
-            conn.close()
             return results
             
         except Exception as e:
@@ -241,7 +227,7 @@ class SoftDeleteManager:
         db_path = SoftDeleteManager.get_database_path()
         
         try:
-            conn = sqlite3.connect(db_path)
+            conn = SoftDeleteManager._conexao(db_path)
             cursor = conn.cursor()
             
             # Data limite
@@ -256,10 +242,16 @@ class SoftDeleteManager:
                              (limite,))
                 total += cursor.rowcount
             
+            # Remove line items of purged orders (foreign keys are not enforced on this connection)
+            try:
+                cursor.execute("DELETE FROM ordem_item WHERE ordem_id NOT IN (SELECT id FROM ordem_servico)")
+            except sqlite3.OperationalError:
+                pass  # ordem_item not created yet
+            
             conn.commit()
-            conn.close()
             
             return total, f"{total} registros deletados permanentemente (mais de {days} dias)"
             
         except Exception as e:
+            SoftDeleteManager._rollback(db_path)
             return 0, f"Erro ao deletar permanentemente: {str(e)}"
@@ -0,0 +1,118 @@
+"""
+Consistency check for the incrementally maintained counters (see database/services/verificar_contadores.py).
+Builds a temporary database, applies a random mix of order writes (create, edit, date and payment
+changes, status changes, client document changes, soft delete, restore, delete) plus the deletion of a
+day's only order and a client registered after their orders, and
+exits with status 1 if verificar_contadores reports any divergence or a rollup keeps an empty row.
+Run from the project root: python database/benchmarks/contadores_consistencia.py [operacoes]
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+import os
+import sys
+import random
+import shutil
+import tempfile
+
+# Importing the database package opens the application database under ~/Documents,
+# so HOME must point at a temporary directory before the first database import
+_BASE = tempfile.mkdtemp(prefix='os_contadores_')
+os.environ['HOME'] = _BASE
+os.environ['USERPROFILE'] = _BASE
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from database.core.db_manager import DatabaseManager  # noqa: E402
+from database.migrations.add_vendas_diarias import SEM_PEDIDOS  # noqa: E402
+from database.services.verificar_contadores import verificar_contadores  # noqa: E402
+
+
+FORMAS = ['pix', 'dinheiro', 'cartão', '', None]
+STATUS = ['em produção', 'pronto', 'cancelado']
+
+
+def _data_aleatoria():
+    return f"2030-{random.randint(1, 3):02d}-{random.randint(1, 28):02d} 10:00:00"
+
+
+def _escrever(conn, operacoes):
+    """Apply 'operacoes' random order writes through triggers-only SQL, like the CRUD layer does."""
+    # Clients 0-5 exist up front; client 6 is registered only after its orders (see below)
+    conn.executemany("INSERT INTO clientes (nome, cpf, documento_norm) VALUES (?, ?, ?)",
+                     [(f"Cliente {n}", f"{n:011d}", f"{n:011d}") for n in range(6)])
+    conn.commit()
+    ids = []
+    for i in range(operacoes):
+        sorteio = random.random()
+        if sorteio < 0.35 or not ids:
+            cur = conn.execute(
+                "INSERT INTO ordem_servico (numero_os, data_criacao, nome_cliente, cpf_cliente, documento_norm,"
+                " valor_produto, frete, valor_entrada, forma_pagamento, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (i + 1, _data_aleatoria(), f"Cliente {i % 7}", f"{i % 7:011d}", f"{i % 7:011d}",
+                 random.randint(10, 500), 5.0, 20.0, random.choice(FORMAS), random.choice(STATUS))
+            )
+            ids.append(cur.lastrowid)
+        elif sorteio < 0.5:
+            conn.execute("UPDATE ordem_servico SET data_criacao = ? WHERE id = ?", (_data_aleatoria(), random.choice(ids)))
+        elif sorteio < 0.6:
+            conn.execute("UPDATE ordem_servico SET valor_produto = ?, forma_pagamento = ? WHERE id = ?",
+                         (random.randint(10, 500), random.choice(FORMAS), random.choice(ids)))
+        elif sorteio < 0.66:
+            conn.execute("UPDATE ordem_servico SET status = ? WHERE id = ?", (random.choice(STATUS), random.choice(ids)))
+        elif sorteio < 0.7:
+            documento = f"{random.randrange(7):011d}"
+            conn.execute("UPDATE ordem_servico SET cpf_cliente = ?, documento_norm = ? WHERE id = ?",
+                         (documento, documento, random.choice(ids)))
+        elif sorteio < 0.8:
+            conn.execute("UPDATE ordem_servico SET deleted_at = '2030-06-01 00:00:00' WHERE id = ?", (random.choice(ids),))
+        elif sorteio < 0.88:
+            conn.execute("UPDATE ordem_servico SET deleted_at = NULL WHERE id = ?", (random.choice(ids),))
+        else:
+            pedido_id = ids.pop(random.randrange(len(ids)))
+            conn.execute("DELETE FROM ordem_servico WHERE id = ?", (pedido_id,))
+        conn.commit()
+
+    # A day whose only order is deleted must disappear from the rollups
+    cur = conn.execute(
+        "INSERT INTO ordem_servico (numero_os, data_criacao, nome_cliente, valor_produto, forma_pagamento)"
+        " VALUES (?, '2031-01-15 10:00:00', 'Cliente único', 100, 'pix')", (operacoes + 1,)
+    )
+    conn.commit()
+    conn.execute("DELETE FROM ordem_servico WHERE id = ?", (cur.lastrowid,))
+    conn.commit()
+
+    # A client registered after placing orders starts from their real purchase count
+    conn.execute("INSERT INTO clientes (nome, cpf, documento_norm) VALUES ('Cliente 6', ?, ?)",
+                 (f"{6:011d}", f"{6:011d}"))
+    conn.commit()
+
+
+def verificar(operacoes=500):
+    """Return a list of problems found (empty when every counter matches its recount)."""
+    random.seed(7)
+    db = DatabaseManager()
+    conn = db.pool.conexao()
+    _escrever(conn, operacoes)
+    problemas = []
+    for tabela in ('vendas_diarias', 'vendas_pagamento_diarias'):
+        vazias = conn.execute(f"SELECT COUNT(*) FROM {tabela} WHERE {SEM_PEDIDOS}").fetchone()[0]
+        if vazias:
+            problemas.append(f"{tabela}: {vazias} rows with no orders")
+    resultado = verificar_contadores(db.db_path)
+    if resultado is None:
+        problemas.append("verificar_contadores failed")
+    else:
+        problemas.extend(f"{nome}: {n} divergent rows" for nome, n in resultado.items() if n)
+    db.close()
+    return problemas
+
+
+if __name__ == "__main__":
+    try:
+        problemas = verificar(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
+    finally:
+        shutil.rmtree(_BASE, ignore_errors=True)
+    if problemas:
+        print(f"\n{len(problemas)} counter problems:")  # Log in English
+        for problema in problemas:
+            print(f"- {problema}")
+        sys.exit(1)
+    print("\nAll counters match their recount.")  # Log in English
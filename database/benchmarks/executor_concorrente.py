@@ -0,0 +1,93 @@
+"""
+Concurrency check for the background query executor (app.utils.query_executor).
+Runs two tasks at the same time on the executor's QThreadPool, each one holding its pooled
+connection while the other opens and closes its own, and fails if either task sees a closed
+connection or an empty result.
+Run from the project root: python database/benchmarks/executor_concorrente.py
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+import os
+import sys
+import shutil
+import tempfile
+import threading
+
+# Importing the database package opens the application database under ~/Documents,
+# so HOME must point at a temporary directory before the first database import
+_BASE = tempfile.mkdtemp(prefix='os_executor_')
+os.environ['HOME'] = _BASE
+os.environ['USERPROFILE'] = _BASE
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from PyQt6.QtCore import QCoreApplication, QTimer  # noqa: E402
+
+from database.core.db_manager import DatabaseManager  # noqa: E402
+from database.core.connection_pool import get_pool  # noqa: E402
+from app.utils.query_executor import QueryExecutor  # noqa: E402
+
+
+def _consultar_segurando(iniciou, liberar):
+    """Read through the thread's pooled connection, wait for the other task, then read again."""
+    conn = get_pool().conexao()
+    antes = conn.execute("SELECT COUNT(*) FROM ordem_servico").fetchone()[0]
+    iniciou.set()
+    liberar.wait(10)
+    depois = conn.execute("SELECT COUNT(*) FROM ordem_servico").fetchone()[0]
+    return antes, depois
+
+
+def _consultar_rapido(iniciou, liberar):
+    """Start once the first task holds its connection; finish (closing this worker's connection) and release it."""
+    iniciou.wait(10)
+    try:
+        return get_pool().conexao().execute("SELECT COUNT(*) FROM ordem_servico").fetchone()[0]
+    finally:
+        # The first task reads again only after this task's run() has closed its own connection
+        threading.Timer(0.2, liberar.set).start()
+
+
+def verificar(num_pedidos=10):
+    """Return {task: 'ok' | error message} for two overlapping executor tasks."""
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    db = DatabaseManager()
+    db.inserir_muitos('ordem_servico', ['numero_os', 'data_criacao', 'nome_cliente'],
+                      [(i, '2024-01-01 10:00:00', f"Cliente {i}") for i in range(1, num_pedidos + 1)])
+
+    executor = QueryExecutor(max_threads=2)
+    iniciou, liberar = threading.Event(), threading.Event()
+    resultados = {}
+
+    def concluir(nome, esperado):
+        def ao_concluir(resultado):
+            resultados[nome] = 'ok' if resultado == esperado else f"unexpected result {resultado!r}"
+            if len(resultados) == 2:
+                app.quit()
+        return ao_concluir
+
+    def falhar(nome):
+        def ao_falhar(mensagem):
+            resultados[nome] = mensagem
+            if len(resultados) == 2:
+                app.quit()
+        return ao_falhar
+
+    executor.executar('A', _consultar_segurando, iniciou, liberar,
+                      ao_concluir=concluir('A', (num_pedidos, num_pedidos)), ao_falhar=falhar('A'))
+    executor.executar('B', _consultar_rapido, iniciou, liberar,
+                      ao_concluir=concluir('B', num_pedidos), ao_falhar=falhar('B'))
+    QTimer.singleShot(15000, app.quit)
+    app.exec()
+    db.close()
+    return resultados
+
+
+if __name__ == "__main__":
+    try:
+        resultados = verificar()
+    finally:
+        shutil.rmtree(_BASE, ignore_errors=True)
+    print(resultados)
+    if set(resultados) != {'A', 'B'} or any(r != 'ok' for r in resultados.values()):
+        print("Concurrent executor tasks interfered with each other's connections.")  # Log in English
+        sys.exit(1)
+    print("Concurrent executor tasks kept their own connections.")  # Log in English
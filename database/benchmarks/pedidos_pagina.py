@@ -0,0 +1,103 @@
+"""
+Benchmark for DatabaseManager.listar_pedidos_pagina on a synthetic 100k-order database.
+Compares keyset pagination against the equivalent LIMIT/OFFSET query for deep pages.
+Run from the project root: python database/benchmarks/pedidos_pagina.py [num_pedidos]
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+import os
+import sys
+import json
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Importing the database package opens the application database under ~/Documents,
+# so HOME must point at a temporary directory before the first database import
+_BASE = tempfile.mkdtemp(prefix='os_bench_')
+os.environ['HOME'] = _BASE
+os.environ['USERPROFILE'] = _BASE
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from database.core.db_manager import DatabaseManager  # noqa: E402
+
+
+def _medir(func, repeticoes=5):
+    """Return the best wall time (ms) of 'repeticoes' calls and the last result."""
+    melhor = None
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = func()
+        duracao = (time.perf_counter() - inicio) * 1000
+        melhor = duracao if melhor is None else min(melhor, duracao)
+    return melhor, resultado
+
+
+def _popular(db, num_pedidos):
+    """Fill the benchmark database with clients, orders and items."""
+    random.seed(42)
+    status = ['em produção', 'pronto', 'entregue', 'cancelado']
+    num_clientes = max(1, num_pedidos // 5)
+    db.inserir_muitos(
+        'clientes', ['nome', 'cpf', 'telefone', 'documento_norm'],
+        [(f"Cliente {i}", f"{i:011d}", f"119{i:08d}", f"{i:011d}") for i in range(num_clientes)]
+    )
+    inicio = datetime(2020, 1, 1)
+    pedidos = []
+    for i in range(1, num_pedidos + 1):
+        cliente = random.randrange(num_clientes)
+        data = inicio + timedelta(minutes=random.randrange(60 * 24 * 365 * 5))
+        pedidos.append((
+            i, data.strftime('%Y-%m-%d %H:%M:%S'), f"Cliente {cliente}", f"{cliente:011d}",
+            f"119{cliente:08d}", 100.0, 0.0, 0.0, 'pix', 30, '{}', f"{cliente:011d}", random.choice(status)
+        ))
+    db.inserir_muitos(
+        'ordem_servico',
+        ['numero_os', 'data_criacao', 'nome_cliente', 'cpf_cliente', 'telefone_cliente', 'valor_produto',
+         'valor_entrada', 'frete', 'forma_pagamento', 'prazo', 'dados_json', 'documento_norm', 'status'],
+        pedidos
+    )
+    db.inserir_muitos(
+        'ordem_item', ['ordem_id', 'posicao', 'descricao', 'quantidade', 'valor_unitario'],
+        [(i, 0, 'Caixa', 1, 100.0) for i in range(1, num_pedidos + 1)]
+    )
+    db.conn.execute("ANALYZE")
+
+
+def executar(num_pedidos=100_000, page_size=50):
+    """Build a temporary database and print timings for shallow and deep pages."""
+    db = DatabaseManager()
+    print(f"Populating {num_pedidos} orders in {db.db_path}...")  # Log in English
+    _popular(db, num_pedidos)
+
+    sql_offset = db._SELECT_PEDIDOS + '''
+        WHERE p.deleted_at IS NULL
+        ORDER BY p.data_criacao DESC, p.id DESC
+        LIMIT ? OFFSET ?
+    '''
+    for profundidade in (0, 100, 1000, (num_pedidos // page_size) - 1):
+        offset = profundidade * page_size
+        # Token of the row just before the page, as the previous page would have returned it
+        token = None
+        if offset:
+            db.cursor.execute(
+                "SELECT data_criacao, id FROM ordem_servico WHERE deleted_at IS NULL "
+                "ORDER BY data_criacao DESC, id DESC LIMIT 1 OFFSET ?", (offset - 1,)
+            )
+            data_criacao, id_ = db.cursor.fetchone()
+            token = json.dumps([data_criacao, id_])
+        t_keyset, (pagina, _) = _medir(lambda: db.listar_pedidos_pagina(token, page_size))
+        t_offset, linhas = _medir(lambda: db.cursor.execute(sql_offset, (page_size, offset)).fetchall())
+        assert [p['id'] for p in pagina] == [r[0] for r in linhas]
+        print(f"page {profundidade:>5}: keyset {t_keyset:8.2f} ms | offset {t_offset:8.2f} ms")  # Log in English
+
+    t_filtro, (pagina, _) = _medir(lambda: db.listar_pedidos_pagina(None, page_size, status='pronto', texto='Cliente 12'))
+    print(f"status+text filter: {t_filtro:8.2f} ms ({len(pagina)} rows)")  # Log in English
+    db.close()
+    shutil.rmtree(_BASE, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    executar(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
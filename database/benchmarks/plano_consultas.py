@@ -0,0 +1,123 @@
+"""
+Query-plan regression check for the period reports.
+Builds a temporary database, runs every period report and EXPLAINs each statement it executed;
+exits with status 1 if any of them falls back to a full table scan.
+Run from the project root: python database/benchmarks/plano_consultas.py
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+import os
+import sys
+import re
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+
+# Importing the database package opens the application database under ~/Documents,
+# so HOME must point at a temporary directory before the first database import
+_BASE = tempfile.mkdtemp(prefix='os_plano_')
+os.environ['HOME'] = _BASE
+os.environ['USERPROFILE'] = _BASE
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from database.core.db_manager import DatabaseManager  # noqa: E402
+
+
+# Reports whose job is to read a whole table (no period to restrict on)
+SCAN_PERMITIDO = {'obter_resumo_total'}
+
+
+def _popular(db, num_pedidos=5000):
+    """Fill the database with enough rows for ANALYZE to give the planner realistic statistics."""
+    inicio = datetime(2023, 1, 1)
+    pedidos, gastos = [], []
+    for i in range(1, num_pedidos + 1):
+        data = (inicio + timedelta(hours=i * 3)).strftime('%Y-%m-%d %H:%M:%S')
+        pedidos.append((i, data, f"Cliente {i % 300}", 100.0, 10.0, 5.0, 30, 'em produção'))
+        gastos.append(('material', f"Gasto {i}", 20.0, data[:10]))
+    db.inserir_muitos(
+        'ordem_servico',
+        ['numero_os', 'data_criacao', 'nome_cliente', 'valor_produto', 'valor_entrada', 'frete', 'prazo', 'status'],
+        pedidos
+    )
+    db.inserir_muitos('gastos', ['tipo', 'descricao', 'valor', 'data'], gastos)
+    db.inserir_muitos(
+        'ordem_item', ['ordem_id', 'posicao', 'descricao', 'quantidade', 'valor_unitario'],
+        [(i, 0, 'Caixa', 1, 100.0) for i in range(1, num_pedidos + 1)]
+    )
+    db.conn.execute("ANALYZE")
+
+
+def _relatorios(db):
+    """(name, callable) pairs for every period report."""
+    inicio, fim = '2023-03-01', '2023-03-31'
+    return [
+        ('buscar_por_periodo', lambda: db.reports.buscar_por_periodo(inicio, fim)),
+        ('calcular_vendas_periodo', lambda: db.calcular_resumo_vendas(inicio, fim)),
+        ('vendas_por_dia', lambda: db.obter_vendas_diarias(30)),
+        ('vendas_agrupadas dia', lambda: db.vendas_agrupadas(inicio, fim, 'dia')),
+        ('vendas_agrupadas semana', lambda: db.vendas_agrupadas(inicio, fim, 'semana')),
+        ('vendas_agrupadas mes', lambda: db.vendas_agrupadas('2023-01-01', '2023-12-31', 'mes')),
+        ('listar_gastos_periodo', lambda: db.listar_gastos_periodo(inicio, fim)),
+        ('soma_gastos_periodo', lambda: db.soma_gastos_periodo(inicio, fim)),
+        ('contar_caixas_vendidas_periodo', lambda: db.contar_caixas_vendidas_periodo(inicio, fim)),
+        ('unidades_vendidas', lambda: db.unidades_vendidas(inicio, fim)),
+        ('analise_periodo anterior', lambda: db.analise_periodo(inicio, fim, 'anterior')),
+        ('analise_periodo ano', lambda: db.analise_periodo(inicio, fim, 'ano')),
+        ('vendas_por_forma_pagamento', lambda: db.vendas_por_forma_pagamento(inicio, fim)),
+        ('obter_resumo_mes', lambda: db.obter_resumo_mes(2023, 3)),
+        ('obter_resumo_ano', lambda: db.obter_resumo_ano(2023)),
+        ('obter_resumo_total', lambda: db.obter_resumo_total()),
+        ('produtos_mais_vendidos', lambda: db.produtos_mais_vendidos(inicio, fim)),
+        ('receita_por_produto', lambda: db.receita_por_produto(inicio, fim)),
+    ]
+
+
+def _ctes(sql):
+    """Names of the common table expressions declared by a statement."""
+    return set(re.findall(r'(\w+)\s*(?:\([\w\s,]*\))?\s+AS\s*\(', sql, re.IGNORECASE))
+
+
+def verificar():
+    """Return the list of (report, sql, plan) that use a full table scan."""
+    db = DatabaseManager()
+    _popular(db)
+    conn = db.pool.conexao()
+    falhas = []
+    for nome, executar in _relatorios(db):
+        executadas = []
+        conn.set_trace_callback(executadas.append)
+        try:
+            executar()
+        finally:
+            conn.set_trace_callback(None)
+        for sql in executadas:
+            if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+                continue
+            plano = [linha[3] for linha in conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()]
+            # Scans of CTE and subquery results are over rows the statement already produced
+            intermediarias = _ctes(sql)
+            scans = [
+                p for p in plano
+                if p.startswith('SCAN ') and p != 'SCAN CONSTANT ROW'
+                and not p.startswith('SCAN (subquery') and p.split()[1] not in intermediarias
+            ]
+            situacao = 'ok'
+            if scans and nome not in SCAN_PERMITIDO:
+                falhas.append((nome, sql, plano))
+                situacao = 'FULL SCAN'
+            print(f"{nome:<32} {situacao:<10} {' | '.join(plano)}")  # Log in English
+    db.close()
+    return falhas
+
+
+if __name__ == "__main__":
+    try:
+        falhas = verificar()
+    finally:
+        shutil.rmtree(_BASE, ignore_errors=True)
+    if falhas:
+        print(f"\n{len(falhas)} report queries fall back to a full scan:")  # Log in English
+        for nome, sql, plano in falhas:
+            print(f"- {nome}: {' '.join(sql.split())}")
+        sys.exit(1)
+    print("\nAll period reports use an index.")  # Log in English
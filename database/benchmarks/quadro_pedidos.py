@@ -0,0 +1,93 @@
+"""
+Check that a status change on the Pedidos board rebuilds at most one card, and that a card whose
+sort position changed is moved.
+Builds a temporary database with orders, opens PedidosInterface offscreen, waits for the first page
+to be drawn, changes one order's status through the same path as the card menu
+(atualizar_status -> pedido_status_atualizado) and exits with status 1 if more than one card
+was constructed for it, or if the card does not show the new status. Then marks the first order
+as delivered and fails if it stays first (delivered orders go after the active ones).
+Run from the project root: python database/benchmarks/quadro_pedidos.py
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+# Importing the database package opens the application database under ~/Documents,
+# so HOME must point at a temporary directory before the first database import
+_BASE = tempfile.mkdtemp(prefix='os_quadro_')
+os.environ['HOME'] = _BASE
+os.environ['USERPROFILE'] = _BASE
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from database.core.db_manager import DatabaseManager  # noqa: E402
+from app.components.orders.orders_interface import PedidosInterface  # noqa: E402
+
+
+def _esperar(app, condicao, timeout=10):
+    """Process Qt events until condicao() is true; returns whether it became true."""
+    limite = time.perf_counter() + timeout
+    while not condicao():
+        if time.perf_counter() > limite:
+            return False
+        app.processEvents()
+        time.sleep(0.01)
+    return True
+
+
+def verificar(num_pedidos=60):
+    """Return a list of problems found (empty when only the changed card is rebuilt)."""
+    app = QApplication.instance() or QApplication(sys.argv)
+    db = DatabaseManager()
+    db.inserir_muitos(
+        'ordem_servico', ['numero_os', 'data_criacao', 'nome_cliente', 'valor_produto', 'prazo', 'status'],
+        [(i, '2030-01-01 10:00:00', f"Cliente {i}", 100.0, 30, 'em produção') for i in range(1, num_pedidos + 1)]
+    )
+
+    interface = PedidosInterface(None)
+    interface.resize(1400, 900)
+    interface.show()
+    carregado = []
+    interface.dados_carregados.connect(lambda: carregado.append(True))
+    interface.carregar_dados(force_refresh=True)
+    problemas = []
+    grade = interface.grade_cards
+    if not _esperar(app, lambda: carregado and grade.total_cards_construidos() > 0):
+        return ["the board did not load"]
+    app.processEvents()
+
+    pedido = interface._cache_pedidos[0]
+    antes = grade.total_cards_construidos()
+    vivos = grade.total_cards_vivos()
+    interface.atualizar_status(pedido['id'], 'pronto')
+    if not _esperar(app, lambda: interface._cache_pedidos[0].get('status') == 'pronto'):
+        problemas.append("the card was not refreshed with the new status")
+    construidos = grade.total_cards_construidos() - antes
+    print(f"{vivos} cards on the board, {construidos} built for the status change")  # Log in English
+    if construidos > 1:
+        problemas.append(f"{construidos} cards built for one status change (expected at most 1)")
+
+    interface.atualizar_status(pedido['id'], 'entregue')
+    if not _esperar(app, lambda: interface._cache_pedidos[0].get('id') != pedido['id']):
+        problemas.append("the delivered order kept its position among the active ones")
+    interface.close()
+    db.close()
+    return problemas
+
+
+if __name__ == "__main__":
+    try:
+        problemas = verificar()
+    finally:
+        shutil.rmtree(_BASE, ignore_errors=True)
+    if problemas:
+        print(f"\n{len(problemas)} problems:")  # Log in English
+        for problema in problemas:
+            print(f"- {problema}")
+        sys.exit(1)
+    print("\nA status change rebuilds only the changed card.")  # Log in English
@@ -0,0 +1,41 @@
+"""
+Helpers for the FTS5 search indices (clientes_fts, ordens_fts, produtos_fts).
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import re
+
+
+def expressao_fts(termo):
+    """Turn what the user typed into an FTS5 MATCH expression, or None when there is nothing to search.
+    Every word becomes a prefix query and all words must match ("jo sil" finds "João da Silva").
+    A term with digits split by punctuation also matches its digits joined, so "123.456" finds the
+    digits-only document "12345678900".
+    """
+    palavras = re.findall(r'\w+', str(termo or ''))
+    if not palavras:
+        return None
+    # Tokens are quoted, so FTS5 operators typed by the user (AND, OR, NEAR, *) are plain text
+    expressao = ' '.join(f'"{palavra}"*' for palavra in palavras)
+    digitos = ''.join(ch for ch in str(termo) if ch.isdigit())
+    if len(palavras) > 1 and digitos and digitos == ''.join(palavras):
+        expressao = f'({expressao}) OR "{digitos}"*'
+    return expressao
+
+
+def termo_numerico(termo):
+    """Digits of a term made only of digits and document/phone punctuation ("123.456.789-00",
+    "(11) 9999-8888"), or None for any other term."""
+    termo = str(termo or '').strip()
+    if not termo or not re.fullmatch(r'[\d\s.\-/()+]+', termo):
+        return None
+    return ''.join(ch for ch in termo if ch.isdigit()) or None
+
+
+def expressao_trigrama(termo):
+    """FTS5 MATCH expression for a substring search on a trigram index, or None when the term is
+    shorter than a trigram."""
+    termo = str(termo or '').strip()
+    if len(termo) < 3:
+        return None
+    return '"' + termo.replace('"', '""') + '"'
@@ -0,0 +1,217 @@
+"""
+Per-thread SQLite connection pool.
+Every thread gets its own connection (WAL journal, tuned PRAGMAs), so background loaders can
+read while the UI thread writes without sharing a cursor.
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+
+from database.core.db_setup import DatabaseSetup
+
+
+# PRAGMAs applied to every new connection
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",      # readers do not block the writer
+    "PRAGMA synchronous = NORMAL",    # safe with WAL, one fsync per checkpoint instead of per commit
+    "PRAGMA cache_size = -16000",     # ~16 MB page cache per connection
+    "PRAGMA mmap_size = 134217728",   # 128 MB memory-mapped reads
+    "PRAGMA temp_store = MEMORY",     # temp b-trees (ORDER BY / GROUP BY) in memory
+)
+
+# Seconds a writer waits for a lock held by another connection before failing
+BUSY_TIMEOUT = 30
+
+
+class _DonoConexao:
+    """Token kept in the thread-local storage next to the connection; see ConnectionPool.conexao()."""
+
+
+class ConnectionPool:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._conexoes = {}  # thread ident -> connection (for fechar_todas)
+        self._geracao = 0  # bumped by fechar_todas() so threads reopen closed connections
+
+    def _abrir(self):
+        """Open and configure a new connection."""
+        # Only the owning thread uses it; check_same_thread=False lets fechar_todas() close it
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        for pragma in PRAGMAS:
+            try:
+                conn.execute(pragma)
+            except sqlite3.Error as e:
+                print(f"Could not apply '{pragma}': {e}")
+        return conn
+
+    def conexao(self):
+        """Return the calling thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'geracao', None) != self._geracao:
+            conn = self._abrir()
+            ident = threading.get_ident()
+            self._local.conn = conn
+            self._local.cursor = None
+            self._local.geracao = self._geracao
+            # The thread-local entry owns the connection: when the thread ends (or the entry is
+            # replaced) the token is collected and the finalizer closes that connection only.
+            # Threads started outside Python (QThreadPool workers) are not in threading.enumerate(),
+            # so liveness cannot be inferred from it.
+            self._local.dono = dono = _DonoConexao()
+            self._local.liberar = weakref.finalize(dono, self._liberar, ident, conn)
+            with self._lock:
+                self._conexoes[ident] = conn
+        return conn
+
+    def _liberar(self, ident, conn):
+        """Forget and close a connection whose owning thread-local entry was released."""
+        with self._lock:
+            if self._conexoes.get(ident) is conn:
+                del self._conexoes[ident]
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def cursor_da_thread(self):
+        """Return the calling thread's long-lived cursor (used by the (cursor, conn) CRUD helpers)."""
+        conn = self.conexao()
+        cur = getattr(self._local, 'cursor', None)
+        if cur is None:
+            cur = conn.cursor()
+            self._local.cursor = cur
+        return cur
+
+    @contextmanager
+    def cursor(self):
+        """Short-lived cursor on the calling thread's connection, closed on exit."""
+        cur = self.conexao().cursor()
+        try:
+            yield cur
+        finally:
+            cur.close()
+
+    def em_transacao(self):
+        """True while the calling thread is inside a transacao() block."""
+        return getattr(self._local, 'profundidade', 0) > 0
+
+    @contextmanager
+    def transacao(self):
+        """Run the block as one atomic transaction on the calling thread's connection.
+        Nested blocks join the outermost one; commit()/rollback() calls made through
+        ConexaoDaThread inside the block are deferred to its end (see ConexaoDaThread).
+        """
+        conn = self.conexao()
+        local = self._local
+        if not self.em_transacao():
+            local.somente_rollback = False
+            if not conn.in_transaction:
+                # Take the write lock up front instead of failing on a read -> write upgrade
+                conn.execute("BEGIN IMMEDIATE")
+        local.profundidade = getattr(local, 'profundidade', 0) + 1
+        try:
+            yield conn
+        except BaseException:
+            local.profundidade -= 1
+            if local.profundidade == 0:
+                conn.rollback()
+            else:
+                local.somente_rollback = True
+            raise
+        local.profundidade -= 1
+        if local.profundidade == 0:
+            if local.somente_rollback:
+                conn.rollback()
+            else:
+                conn.commit()
+
+    def fechar_conexao_da_thread(self):
+        """Close the calling thread's connection (call at the end of worker threads)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = None
+        self._local.cursor = None
+        self._local.dono = None
+        self._local.liberar()  # forgets and closes the connection (finalizers run once)
+
+    def fechar_todas(self):
+        """Close every pooled connection. Threads reopen theirs on next use."""
+        with self._lock:
+            conexoes = list(self._conexoes.values())
+            self._conexoes.clear()
+            self._geracao += 1
+        for conn in conexoes:
+            try:
+                conn.close()
+            except Exception as e:
+                print(f"Error closing connection: {e}")
+
+
+class ConexaoDaThread:
+    """Proxy that forwards to the calling thread's pooled connection.
+    Inside a transaction, commit() is deferred to the end of the block and rollback()
+    marks the whole transaction to be rolled back, so helpers that commit on their own
+    can be composed into one atomic write. 'with conn:' opens such a transaction.
+    """
+
+    def __init__(self, pool):
+        self._pool = pool
+
+    def __getattr__(self, nome):
+        return getattr(self._pool.conexao(), nome)
+
+    def commit(self):
+        if not self._pool.em_transacao():
+            self._pool.conexao().commit()
+
+    def rollback(self):
+        if self._pool.em_transacao():
+            self._pool._local.somente_rollback = True
+        else:
+            self._pool.conexao().rollback()
+
+    def __enter__(self):
+        # Context managers are kept per thread: the proxy itself is shared
+        local = self._pool._local
+        if getattr(local, 'blocos', None) is None:
+            local.blocos = []
+        bloco = self._pool.transacao()
+        local.blocos.append(bloco)
+        return bloco.__enter__()
+
+    def __exit__(self, *exc):
+        return self._pool._local.blocos.pop().__exit__(*exc)
+
+
+class CursorDaThread:
+    """Proxy that forwards to the calling thread's pooled cursor."""
+
+    def __init__(self, pool):
+        self._pool = pool
+
+    def __getattr__(self, nome):
+        return getattr(self._pool.cursor_da_thread(), nome)
+
+    def __iter__(self):
+        return iter(self._pool.cursor_da_thread())
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path=None):
+    """Return the shared pool for a database file (defaults to the application database)."""
+    db_path = os.path.normpath(os.path.abspath(db_path or DatabaseSetup.get_database_path()))
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = ConnectionPool(db_path)
+            _pools[db_path] = pool
+        return pool
@@ -12,9 +12,17 @@ from datetime import datetime
 
 # Specialized modules
 from database.core.db_setup import DatabaseSetup
+from database.core.connection_pool import get_pool, ConexaoDaThread, CursorDaThread
 from database.crud.order_crud import OrderCRUD
 from database.queries.report_queries import ReportQueries
+from database.queries.report_cache import ReportCache, em_cache, registrar_falha
 from database.crud.products_crud import ProductsCRUD
+from database.core.documento import normalize_documento, documento_cliente
+from database.core.busca import expressao_fts, expressao_trigrama, termo_numerico
+from database.migrations.add_busca_clientes import EXPR_TELEFONE_NORM, EXPR_CEP_NORM
+from database.migrations.add_busca_clientes_digitos import EXPR_CNPJ_NORM
+from database.migrations.promote_json_fields import CAMPOS_PROMOVIDOS, normalizar_status, valores_promovidos
+from database.migrations.add_data_prazo import expr_concluido, expr_prazo_ordem
 
 
 
@@ -32,37 +40,129 @@ class DatabaseManager:
         if self._initialized:
             return
         self.db_path = DatabaseSetup.get_database_path()
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self.cursor = self.conn.cursor()
+        # One pooled connection per thread; conn/cursor resolve to the calling thread's own objects
+        self.pool = get_pool(self.db_path)
+        self.conn = ConexaoDaThread(self.pool)
+        self.cursor = CursorDaThread(self.pool)
         # Specialized modules
         self.order_crud = OrderCRUD(self.cursor, self.conn)
         self.reports = ReportQueries(self.cursor)
+        self.relatorios_cache = ReportCache()
         self.products = ProductsCRUD(self.cursor, self.conn)
-        # Database initialization
-        DatabaseSetup.criar_tabelas(self.cursor)
-        self.conn.commit()
-        self._migrate_soft_delete()
-        self._migrate_numero_compras()
+        # Database initialization: tables and every schema change, applied once (see database/migrations/runner.py)
+        self._executar_migracoes()
+        self._conectar_sinais()
         self._initialized = True
     
-    def _migrate_soft_delete(self):
-        """Run Soft Delete migration if needed."""
+    def _executar_migracoes(self):
+        """Create the tables and apply pending schema migrations (a single version check when up to date)."""
         try:
-            from app.utils.soft_delete import SoftDeleteManager
-            success, message = SoftDeleteManager.migrate_add_deleted_at_columns()
-            # Log migration result in English
-            print(f"Soft Delete migration: {message}" if success else f"Soft Delete migration warning: {message}")
+            from database.migrations.runner import executar_migracoes
+            executar_migracoes(self.conn)
         except Exception as e:
-            print(f"Soft Delete migration error: {e}")
-    
-    def _migrate_numero_compras(self):
-        """Run numero_compras migration and sync if needed."""
+            print(f"Migration runner error: {e}")
+
+    def reconstruir_vendas_diarias(self):
+        """Repair the vendas_diarias rollup by recomputing it from ordem_servico. Returns the number of days."""
+        from database.services.vendas_diarias import reconstruir_vendas_diarias
+        dias = reconstruir_vendas_diarias(self.db_path)
+        self.relatorios_cache.invalidar('pedidos')
+        return dias
+
+    def reconstruir_cliente_estatisticas(self):
+        """Repair cliente_estatisticas by recomputing it from ordem_servico. Returns the number of clients."""
+        from database.services.cliente_estatisticas import reconstruir_cliente_estatisticas
+        return reconstruir_cliente_estatisticas(self.db_path)
+
+    def verificar_contadores(self, reparar=False):
+        """Compare numero_compras, vendas_diarias and cliente_estatisticas with a recount from
+        ordem_servico, rebuilding the ones that drifted when reparar is True.
+        Returns {counter: divergent rows} or None on error."""
+        from database.services.verificar_contadores import verificar_contadores
+        resultado = verificar_contadores(self.db_path, reparar)
+        if reparar and resultado and any(resultado.values()):
+            self.relatorios_cache.invalidar('pedidos')
+        return resultado
+
+    def relatorio_top_clientes(self, limite=10):
+        """Top clients by number of orders using reports module."""
+        return self.reports.relatorio_top_clientes(limite)
+
+    def estatisticas_cliente(self, documento=None, nome=None):
+        """Lifetime stats of one client using reports module."""
+        return self.reports.estatisticas_cliente(documento, nome)
+
+    def _conectar_sinais(self):
+        """Invalidate cached catalog and report data when products, orders or expenses change
+        (no-op without the Qt signals)."""
         try:
-            print("Starting numero_compras migration/sync...")
-            from database.migrations import migrate_add_numero_compras
-            migrate_add_numero_compras(self.conn)
+            from app.signals import get_signals
+            signals = get_signals()
+            signals.produtos_atualizados.connect(self.products.invalidar_indice_codigos)
+            for sinal in (signals.produto_criado, signals.produto_editado, signals.produto_excluido):
+                sinal.connect(lambda _produto_id: self.products.invalidar_indice_codigos())
+            for sinal in (signals.pedido_criado, signals.pedido_editado, signals.pedido_excluido,
+                          signals.pedido_status_atualizado, signals.pedidos_atualizados):
+                sinal.connect(lambda *_: self.relatorios_cache.invalidar('pedidos'))
+            signals.gastos_atualizados.connect(lambda: self.relatorios_cache.invalidar('gastos'))
         except Exception as e:
-            print(f"numero_compras migration error: {e}")
+            print(f"Could not connect product signals: {e}")
+
+    def transaction(self):
+        """Context manager that runs the block as one atomic transaction (a single commit).
+        CRUD calls made inside it join the transaction instead of committing on their own:
+            with db_manager.transaction():
+                db_manager.upsert_cliente_completo(...)
+                db_manager.salvar_ordem(...)
+        """
+        return self.pool.transacao()
+
+    def inserir_muitos(self, tabela, colunas, linhas):
+        """Bulk insert rows (sequence of tuples matching 'colunas') with executemany in one transaction.
+        Meant for imports of clients, products and expenses. Returns the number of rows inserted (0 on error).
+        """
+        try:
+            for nome in [tabela, *colunas]:
+                if not str(nome).isidentifier():
+                    raise ValueError(f"Invalid identifier: {nome}")
+            linhas = list(linhas)
+            query = f"INSERT INTO {tabela} ({', '.join(colunas)}) VALUES ({', '.join('?' for _ in colunas)})"
+            with self.transaction():
+                self.cursor.executemany(query, linhas)
+            if tabela == 'produtos':
+                self.products.invalidar_indice_codigos()
+            elif tabela in ('ordem_servico', 'ordem_item'):
+                self.relatorios_cache.invalidar('pedidos')
+            elif tabela == 'gastos':
+                self.relatorios_cache.invalidar('gastos')
+            return len(linhas)
+        except Exception as e:
+            print(f"Error bulk inserting into {tabela}: {e}")
+            return 0
+
+    def proximo_numero_os(self):
+        """Preview of the next OS number (not reserved)."""
+        try:
+            return self.order_crud.numeros.proximo_numero()
+        except Exception as e:
+            print(f"Error reading next OS number: {e}")
+            return 1
+
+    def reservar_numero_os(self):
+        """Reserve the next OS number for an open order form. Returns None on error."""
+        try:
+            return self.order_crud.numeros.reservar()
+        except Exception as e:
+            print(f"Error reserving OS number: {e}")
+            return None
+
+    def liberar_numero_os(self, numero):
+        """Release an OS number reserved by a form that was closed without saving."""
+        try:
+            return self.order_crud.numeros.liberar(numero)
+        except Exception as e:
+            print(f"Error releasing OS number: {e}")
+            return False
 
     def salvar_ordem(self, dados, nome_pdf=""):
         """Save service order using CRUD module."""
@@ -77,177 +177,253 @@ class DatabaseManager:
                     total_produtos = None
         except Exception:
             pass
-        return self.order_crud.criar_ordem(dados, nome_pdf)
+        return self._invalidar_pedidos(self.order_crud.criar_ordem(dados, nome_pdf))
+
+    def _invalidar_pedidos(self, resultado):
+        """Drop the cached order reports after a successful order write (not every writer emits a signal)."""
+        if resultado:
+            self.relatorios_cache.invalidar('pedidos')
+        return resultado
 
     def deletar_pedido(self, pedido_id):
         """Delete a specific order by ID."""
-        return self.order_crud.deletar_ordem(pedido_id)
+        return self._invalidar_pedidos(self.order_crud.deletar_ordem(pedido_id))
 
     def deletar_ordem(self, pedido_id):
         """Delete order - kept for compatibility."""
-        return self.order_crud.deletar_ordem(pedido_id)
+        return self._invalidar_pedidos(self.order_crud.deletar_ordem(pedido_id))
 
     def atualizar_status_pedido(self, pedido_id, novo_status):
-        """Update order status using JSON data."""
+        """Update order status (single-column UPDATE on the indexed status column)."""
         try:
-            self.cursor.execute('SELECT dados_json FROM ordem_servico WHERE id = ?', (pedido_id,))
-            row = self.cursor.fetchone()
-            if not row:
+            self.cursor.execute('UPDATE ordem_servico SET status = ? WHERE id = ?',
+                                (normalizar_status(novo_status), pedido_id))
+            if self.cursor.rowcount == 0:
                 return False
-                
-            dados_json = row[0] or '{}'
-            try:
-                dados = json.loads(dados_json)
-            except:
-                dados = {}
-                
-            dados['status'] = novo_status
-            novo_json = json.dumps(dados)
-            
-            self.cursor.execute('UPDATE ordem_servico SET dados_json = ? WHERE id = ?', (novo_json, pedido_id))
             self.conn.commit()
+            self.relatorios_cache.invalidar('pedidos')
             return True
             
         except Exception as e:
             print(f"Error updating status: {e}")
             return False
 
-    def listar_pedidos_ordenados_por_prazo(self, limite=50):
-        """List orders sorted by deadline - INCLUDING ALL FIELDS FOR EDITING."""
+    # Order columns + client address (LEFT JOIN on the indexed documento_norm) + promoted columns
+    _SELECT_PEDIDOS = '''
+            SELECT p.id, p.numero_os, p.data_criacao, p.nome_cliente, p.cpf_cliente, p.telefone_cliente,
+                   p.detalhes_produto, p.valor_produto, p.valor_entrada, p.frete, p.forma_pagamento,
+                   p.prazo, p.nome_pdf, p.dados_json, p.status,
+                   c.id, c.cep, c.rua, c.numero, c.bairro, c.cidade, c.estado,
+                   p.desconto, p.cor, p.reforco, p.data_prazo
+            FROM ordem_servico p
+            LEFT JOIN clientes c ON c.id = (
+                SELECT MIN(id) FROM clientes WHERE documento_norm = p.documento_norm
+            )
+    '''
+
+    # "Active first, nearest deadline first" (matches the idx_ordem_prazo expression index)
+    _CHAVE_PRAZO = (expr_concluido('p.'), expr_prazo_ordem('p.'), 'p.id')
+
+    def listar_pedidos_ordenados_por_prazo(self, limite=50, status=None):
+        """List orders sorted by deadline - INCLUDING ALL FIELDS FOR EDITING.
+        Active orders come first, each group by nearest data_prazo; orders without a deadline go last.
+        Client address fields come from the same query (LEFT JOIN on the indexed documento_norm).
+        When 'status' is given, only orders with that status (after normalizar_status) are returned.
+        """
         try:
+            filtro_status = ''
+            params = []
+            if status and str(status).lower() != 'todos':
+                filtro_status = 'AND p.status = ? COLLATE NOCASE'
+                params.append(normalizar_status(status))
+            params.append(limite)
             # Query com todos os campos necessários para edição (APENAS PEDIDOS NÃO DELETADOS)
-            query = '''
-            SELECT id, numero_os, data_criacao, nome_cliente, cpf_cliente, telefone_cliente, 
-                   detalhes_produto, valor_produto, valor_entrada, frete, forma_pagamento,
-                   prazo, nome_pdf, dados_json, status
-            FROM ordem_servico
-            WHERE deleted_at IS NULL
-            ORDER BY data_criacao DESC
+            query = self._SELECT_PEDIDOS + '''
+            WHERE p.deleted_at IS NULL {filtro_status}
+            ORDER BY {ordem}
+            LIMIT ?
+            '''.format(filtro_status=filtro_status, ordem=', '.join(self._CHAVE_PRAZO))
+            self.cursor.execute(query, params)
+            return self._montar_pedidos(self.cursor.fetchall())
+        except Exception as e:
+            print(f"Error listing orders: {e}")
+            return []
+
+    def listar_pedidos_pagina(self, cursor=None, page_size=50, status=None, texto=None, data_de=None, data_ate=None,
+                              ordem='recentes'):
+        """List one page of orders, filtered in SQL.
+        ordem='recentes' sorts newest first (keyset on data_criacao, id); ordem='prazo' sorts active
+        orders first, then by nearest data_prazo (keyset on the idx_ordem_prazo key).
+        'cursor' is the token returned by the previous page (None for the first page). 'texto' is matched
+        through the ordens_fts index (OS number, client name, CPF/CNPJ or phone, accent-insensitive, by
+        word prefix); 'data_de'/'data_ate' are inclusive 'YYYY-MM-DD' creation dates.
+        Returns (pedidos, next_cursor); next_cursor is None on the last page.
+        """
+        try:
+            condicoes = ['p.deleted_at IS NULL']
+            params = []
+            if status and str(status).lower() != 'todos':
+                condicoes.append('p.status = ? COLLATE NOCASE')
+                params.append(normalizar_status(status))
+            expressao = expressao_fts(texto)
+            if expressao:
+                condicoes.append('p.id IN (SELECT rowid FROM ordens_fts WHERE ordens_fts MATCH ?)')
+                params.append(expressao)
+            if data_de:
+                condicoes.append('p.data_criacao >= ?')
+                params.append(str(data_de)[:10])
+            if data_ate:
+                condicoes.append("p.data_criacao < date(?, '+1 day')")
+                params.append(str(data_ate)[:10])
+            if ordem == 'prazo':
+                chave = self._CHAVE_PRAZO
+                ordenacao = ', '.join(chave)
+                comparacao = '>'
+            else:
+                chave = ('p.data_criacao', 'p.id')
+                ordenacao = 'p.data_criacao DESC, p.id DESC'
+                comparacao = '<'
+            if cursor:
+                # JSON keeps the types of the key values (status group and id are bound as integers)
+                valores = json.loads(cursor)
+                condicoes.append(f"({', '.join(chave)}) {comparacao} ({', '.join('?' for _ in chave)})")
+                params.extend(valores)
+            params.append(int(page_size) + 1)  # one extra row tells whether there is a next page
+
+            # The sort key columns come first in each row so the next-page token can be read back
+            query = self._SELECT_PEDIDOS.replace('SELECT', f"SELECT {', '.join(chave)},", 1) + f'''
+            WHERE {' AND '.join(condicoes)}
+            ORDER BY {ordenacao}
             LIMIT ?
             '''
-            self.cursor.execute(query, (limite,))
-            resultados = self.cursor.fetchall()
+            self.cursor.execute(query, params)
+            rows = self.cursor.fetchall()
+            proximo = None
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                proximo = json.dumps(rows[-1][:len(chave)])
+            return self._montar_pedidos([row[len(chave):] for row in rows]), proximo
+        except Exception as e:
+            print(f"Error listing orders page: {e}")
+            return [], None
 
-            pedidos = []
-            for row in resultados:
-                # Expecting 15 columns
-                if len(row) < 15:
-                    continue
-                (id_, numero_os, data_criacao, nome_cliente, cpf_cliente, telefone_cliente,
-                 detalhes_produto, valor_produto, valor_entrada, frete, forma_pagamento,
-                 prazo, nome_pdf, dados_json, status) = row[:15]
+    def obter_pedido(self, pedido_id):
+        """Fetch one order (not deleted) in the same dict format as listar_pedidos_pagina, or None.
+        Used to refresh a single card of the Pedidos board after an edit or status change."""
+        try:
+            self.cursor.execute(self._SELECT_PEDIDOS + '''
+            WHERE p.id = ? AND p.deleted_at IS NULL
+            ''', (pedido_id,))
+            pedidos = self._montar_pedidos(self.cursor.fetchall())
+            return pedidos[0] if pedidos else None
+        except Exception as e:
+            print(f"Error fetching order {pedido_id}: {e}")
+            return None
+
+    def _montar_pedidos(self, resultados):
+        """Convert _SELECT_PEDIDOS rows into the order dicts used by the Pedidos tab and the edit modal."""
+        # Products of every listed order in one query
+        itens_por_ordem = self.order_crud.order_items.listar_itens([row[0] for row in resultados])
+
+        # Determine a sensible default status from persisted list (once per call)
+        try:
+            from app.utils.statuses import load_statuses
+            _sts = load_statuses()
+            default_status = _sts[0] if _sts else 'em produção'
+        except Exception:
+            default_status = 'em produção'
+
+        pedidos = []
+        for row in resultados:
+            # Expecting 15 order columns + 7 client columns + 3 promoted columns + data_prazo
+            if len(row) < 26:
+                continue
+            (id_, numero_os, data_criacao, nome_cliente, cpf_cliente, telefone_cliente,
+             detalhes_produto, valor_produto, valor_entrada, frete, forma_pagamento,
+             prazo, nome_pdf, dados_json, status) = row[:15]
+            (cliente_id, cep_cliente, rua_cliente, numero_cliente,
+             bairro_cliente, cidade_cliente, estado_cliente) = row[15:22]
+            desconto, cor, reforco, data_prazo = row[22:26]
+            status = status or default_status
 
-                # Parse JSON fields and determine a sensible default status from persisted list
+            produtos = itens_por_ordem.get(id_, [])
+
+            # If produtos structured present, compute valor_produto from it
+            if produtos:
                 try:
-                    from app.utils.statuses import load_statuses
-                    _sts = load_statuses()
-                    default_status = _sts[0] if _sts else 'em produção'
+                    valor_produto = sum([float(p.get('valor', 0) or 0) for p in produtos])
                 except Exception:
-                    default_status = 'em produção'
-
-                desconto = 0.0
-                produtos = []
-                status = default_status
-                if dados_json:
                     try:
-                        dados = json.loads(dados_json)
-                        status = dados.get('status', default_status)
-                        desconto = float(dados.get('desconto', 0) or 0)
-                        produtos = dados.get('produtos', []) or []
+                        valor_produto = float(valor_produto or 0)
                     except Exception:
-                        produtos = []
+                        valor_produto = 0.0
 
-                # If produtos structured present, compute valor_produto from it
-                if produtos:
-                    try:
-                        valor_produto = sum([float(p.get('valor', 0) or 0) for p in produtos])
-                    except Exception:
-                        try:
-                            valor_produto = float(valor_produto or 0)
-                        except Exception:
-                            valor_produto = 0.0
+            # Calcular valor total (produtos + frete - desconto)
+            try:
+                valor_total = (valor_produto or 0) + (frete or 0) - (desconto or 0)
+            except Exception:
+                valor_total = 0.0
 
-                # Calcular valor total (produtos + frete - desconto)
-                try:
-                    valor_total = (valor_produto or 0) + (frete or 0) - (desconto or 0)
-                except Exception:
-                    valor_total = 0.0
-
-                # Buscar dados completos do endereço da tabela clientes
-                endereco_cliente = ''
-                cep_cliente = ''
-                rua_cliente = ''
-                numero_cliente = ''
-                bairro_cliente = ''
-                cidade_cliente = ''
-                estado_cliente = ''
-                
-                try:
-                    # Normalizar CPF/CNPJ (remover pontuação)
-                    documento_norm = ''.join(ch for ch in str(cpf_cliente or '') if ch.isdigit())
-                    if documento_norm:
-                        # Buscar por CPF ou CNPJ (ambos armazenados sem pontuação)
-                        self.cursor.execute(
-                            """SELECT cep, rua, numero, bairro, cidade, estado 
-                               FROM clientes 
-                               WHERE replace(replace(replace(cpf, '.', ''), '-', ''), ' ', '') = ? 
-                                  OR replace(replace(replace(replace(cnpj, '.', ''), '/', ''), '-', ''), ' ', '') = ?
-                               LIMIT 1""",
-                            (documento_norm, documento_norm)
-                        )
-                        cli_row = self.cursor.fetchone()
-                        if cli_row:
-                            cep_cliente, rua_cliente, numero_cliente, bairro_cliente, cidade_cliente, estado_cliente = cli_row
-                            cep_cliente = cep_cliente or ''
-                            rua_cliente = rua_cliente or ''
-                            numero_cliente = numero_cliente or ''
-                            bairro_cliente = bairro_cliente or ''
-                            cidade_cliente = cidade_cliente or ''
-                            estado_cliente = estado_cliente or ''
-                            # Montar endereço completo para compatibilidade
-                            endereco_cliente = f"{rua_cliente} {numero_cliente} - {bairro_cliente} - {cidade_cliente} / {estado_cliente}".strip()
-                except Exception as e:
-                    print(f"Error fetching client address: {e}")
-                    endereco_cliente = ''
-
-                pedido = {
-                    'id': id_,
-                    'numero_os': numero_os or 0,
-                    'nome_cliente': nome_cliente or 'Cliente não informado',
-                    'cpf_cliente': cpf_cliente or '',
-                    'telefone_cliente': telefone_cliente or '',
-                    'endereco_cliente': endereco_cliente,
-                    # Dados detalhados do endereço para o PDF
-                    'cep_cliente': cep_cliente,
-                    'rua_cliente': rua_cliente,
-                    'numero_cliente': numero_cliente,
-                    'bairro_cliente': bairro_cliente,
-                    'cidade_cliente': cidade_cliente,
-                    'estado_cliente': estado_cliente,
-                    'detalhes_produto': detalhes_produto or '',
-                    'valor_produto': float(valor_produto or 0),
-                    'valor_entrada': float(valor_entrada or 0),
-                    'frete': float(frete or 0),
-                    'forma_pagamento': forma_pagamento or '',
-                    'valor_total': float(valor_total),
-                    'prazo': int(prazo or 30),
-                    'data_criacao': data_criacao or '',
-                    'status': status,
-                    'desconto': float(desconto or 0),
-                    'cor': (dados.get('cor') if 'dados' in locals() else ''),
-                    'reforco': bool(dados.get('reforco')) if 'dados' in locals() else False,
-                    'produtos': produtos
-                }
-                pedidos.append(pedido)
+            # Dados completos do endereço (vindos do LEFT JOIN com clientes)
+            cep_cliente = cep_cliente or ''
+            rua_cliente = rua_cliente or ''
+            numero_cliente = numero_cliente or ''
+            bairro_cliente = bairro_cliente or ''
+            cidade_cliente = cidade_cliente or ''
+            estado_cliente = estado_cliente or ''
+            endereco_cliente = ''
+            if cliente_id is not None:
+                # Montar endereço completo para compatibilidade
+                endereco_cliente = f"{rua_cliente} {numero_cliente} - {bairro_cliente} - {cidade_cliente} / {estado_cliente}".strip()
 
-            return pedidos
-        except Exception as e:
-            print(f"Error listing orders: {e}")
-            return []
+            pedido = {
+                'id': id_,
+                'numero_os': numero_os or 0,
+                'nome_cliente': nome_cliente or 'Cliente não informado',
+                'cpf_cliente': cpf_cliente or '',
+                'telefone_cliente': telefone_cliente or '',
+                'endereco_cliente': endereco_cliente,
+                # Dados detalhados do endereço para o PDF
+                'cep_cliente': cep_cliente,
+                'rua_cliente': rua_cliente,
+                'numero_cliente': numero_cliente,
+                'bairro_cliente': bairro_cliente,
+                'cidade_cliente': cidade_cliente,
+                'estado_cliente': estado_cliente,
+                'detalhes_produto': detalhes_produto or '',
+                'valor_produto': float(valor_produto or 0),
+                'valor_entrada': float(valor_entrada or 0),
+                'frete': float(frete or 0),
+                'forma_pagamento': forma_pagamento or '',
+                'valor_total': float(valor_total),
+                'prazo': int(prazo or 30),
+                'data_criacao': data_criacao or '',
+                'data_prazo': data_prazo or '',
+                'status': status,
+                'desconto': float(desconto or 0),
+                'cor': cor or '',
+                'reforco': bool(reforco),
+                'produtos': produtos
+            }
+            pedidos.append(pedido)
+
+        return pedidos
 
     def atualizar_json_campos(self, pedido_id, updates: dict) -> bool:
-        """Update specific fields inside order's dados_json."""
+        """Update specific fields inside order's dados_json.
+        Promoted fields (status, desconto, cor, reforco) are written to their real columns instead.
+        """
         try:
+            updates = dict(updates or {})
+            colunas = valores_promovidos({k: updates.pop(k) for k in CAMPOS_PROMOVIDOS if k in updates})
+            if colunas:
+                set_clause = ', '.join(f'{campo} = ?' for campo in colunas)
+                self.cursor.execute(f'UPDATE ordem_servico SET {set_clause} WHERE id = ?',
+                                    list(colunas.values()) + [pedido_id])
+            if not updates:
+                self.conn.commit()
+                self.relatorios_cache.invalidar('pedidos')
+                return True
             self.cursor.execute('SELECT dados_json FROM ordem_servico WHERE id = ?', (pedido_id,))
             row = self.cursor.fetchone()
             dados = {}
@@ -256,9 +432,10 @@ class DatabaseManager:
                     dados = json.loads(row[0])
                 except Exception:
                     dados = {}
-            dados.update(updates or {})
+            dados.update(updates)
             self.cursor.execute('UPDATE ordem_servico SET dados_json = ? WHERE id = ?', (json.dumps(dados), pedido_id))
             self.conn.commit()
+            self.relatorios_cache.invalidar('pedidos')
             return True
         except Exception as e:
             print(f"Error updating order JSON: {e}")
@@ -272,10 +449,26 @@ class DatabaseManager:
         """Get sales by period using reports module."""
         return self.reports.buscar_por_periodo(data_inicio, data_fim)
 
+    @em_cache('pedidos')
     def calcular_resumo_vendas(self, data_inicio, data_fim):
         """Calculate sales summary using reports module."""
         return self.reports.calcular_vendas_periodo(data_inicio, data_fim)
 
+    @em_cache('pedidos')
+    def vendas_agrupadas(self, inicio, fim, granularidade='dia'):
+        """Sales per day/week/month bucket using reports module."""
+        return self.reports.vendas_agrupadas(inicio, fim, granularidade)
+
+    @em_cache('pedidos')
+    def analise_periodo(self, inicio, fim, comparar_com='anterior'):
+        """Daily series with comparison period and moving averages using reports module."""
+        return self.reports.analise_periodo(inicio, fim, comparar_com)
+
+    @em_cache('pedidos')
+    def vendas_por_forma_pagamento(self, inicio, fim):
+        """Sales per payment method using reports module."""
+        return self.reports.vendas_por_forma_pagamento(inicio, fim)
+
     def obter_vendas_diarias(self, dias=30):
         """Get daily sales using reports module."""
         return self.reports.vendas_por_dia(dias)
@@ -288,21 +481,36 @@ class DatabaseManager:
         """Search orders by client CPF."""
         return self.reports.buscar_por_cpf(cpf_cliente)
 
+    @em_cache('pedidos')
+    def produtos_mais_vendidos(self, data_inicio=None, data_fim=None, limite=10):
+        """Best-selling products using reports module."""
+        return self.reports.produtos_mais_vendidos(data_inicio, data_fim, limite)
+
+    @em_cache('pedidos')
+    def receita_por_produto(self, data_inicio=None, data_fim=None):
+        """Revenue per product using reports module."""
+        return self.reports.receita_por_produto(data_inicio, data_fim)
+
+    @em_cache('pedidos')
+    def unidades_vendidas(self, data_inicio=None, data_fim=None, agrupar_por='categoria'):
+        """Units sold per category or product using reports module."""
+        return self.reports.unidades_vendidas(data_inicio, data_fim, agrupar_por)
+
     def atualizar_pedido(self, pedido_id, campos_atualizacao):
         """Update order fields using CRUD module."""
-        return self.order_crud.atualizar_ordem(pedido_id, campos_atualizacao)
+        return self._invalidar_pedidos(self.order_crud.atualizar_ordem(pedido_id, campos_atualizacao))
 
-    def listar_clientes(self, limite=None):
-        """List clients from the separate clients table."""
+    def listar_clientes(self, limite=None, offset=0):
+        """List clients from the separate clients table (one page of 'limite' rows from 'offset' when given)."""
         try:
             if limite:
                 query = '''
                 SELECT id, nome, cpf, cnpj, inscricao_estadual, telefone, email, cep, rua, numero, bairro, cidade, estado, referencia, numero_compras
                 FROM clientes 
                 ORDER BY nome 
-                LIMIT ?
+                LIMIT ? OFFSET ?
                 '''
-                self.cursor.execute(query, (limite,))
+                self.cursor.execute(query, (limite, offset))
             else:
                 query = '''
                 SELECT id, nome, cpf, cnpj, inscricao_estadual, telefone, email, cep, rua, numero, bairro, cidade, estado, referencia, numero_compras
@@ -315,13 +523,80 @@ class DatabaseManager:
             print(f"Error listing clients: {e}")
             return []
     
+    _COLUNAS_CLIENTE = (
+        'c.id, c.nome, c.cpf, c.cnpj, c.inscricao_estadual, c.telefone, c.email, c.cep, c.rua, c.numero, '
+        'c.bairro, c.cidade, c.estado, c.referencia, c.numero_compras'
+    )
+
+    def buscar_clientes(self, termo, limite=200, offset=0):
+        """Search non-deleted clients and return one page (same columns as listar_clientes).
+        Terms made of digits and punctuation (CPF/CNPJ, phone, CEP) are prefix-matched against the
+        indexed digits-only values, and found anywhere in the phone digits (trigram index, so a number
+        without its area code matches); other terms go through clientes_fts (accent-insensitive word
+        prefixes over name, documents, contact and address, ranked by bm25) plus the trigram name
+        index for substrings, prefix matches first.
+        """
+        digitos = termo_numerico(termo)
+        try:
+            if digitos:
+                # Range on the normalized values: 'digits' <= value < 'digits:' is a prefix match
+                # (unary + keeps the planner on the digit indices instead of idx_clientes_deleted)
+                faixa = (digitos, digitos + ':')
+                params = list(faixa * 4)
+                meio_telefone = ''
+                trigrama = expressao_trigrama(digitos)
+                if trigrama:
+                    meio_telefone = ('OR c.id IN (SELECT rowid FROM clientes_telefone_trigrama '
+                                     'WHERE clientes_telefone_trigrama MATCH ?)')
+                    params.append(trigrama)
+                query = f'''
+                SELECT {self._COLUNAS_CLIENTE}
+                FROM clientes c
+                WHERE +c.deleted_at IS NULL
+                  AND ((c.documento_norm >= ? AND c.documento_norm < ?)
+                       OR ({EXPR_CNPJ_NORM} >= ? AND {EXPR_CNPJ_NORM} < ?)
+                       OR ({EXPR_TELEFONE_NORM} >= ? AND {EXPR_TELEFONE_NORM} < ?)
+                       OR ({EXPR_CEP_NORM} >= ? AND {EXPR_CEP_NORM} < ?)
+                       {meio_telefone})
+                ORDER BY c.nome
+                LIMIT ? OFFSET ?
+                '''
+                self.cursor.execute(query, params + [limite, offset])
+                return self.cursor.fetchall()
+
+            expressao = expressao_fts(termo)
+            if not expressao:
+                return []
+            consultas = ['SELECT rowid as id, bm25(clientes_fts, 10.0, 5.0, 3.0, 1.0) as peso '
+                         'FROM clientes_fts WHERE clientes_fts MATCH ?']
+            params = [expressao]
+            trigrama = expressao_trigrama(termo)
+            if trigrama:
+                # bm25 scores are negative, so substring-only matches (0) come after every prefix match
+                consultas.append('SELECT rowid, 0 FROM clientes_nome_trigrama WHERE clientes_nome_trigrama MATCH ?')
+                params.append(trigrama)
+            query = f'''
+            WITH encontrados AS MATERIALIZED ({' UNION ALL '.join(consultas)})
+            SELECT {self._COLUNAS_CLIENTE}
+            FROM (SELECT id, MIN(peso) as peso FROM encontrados GROUP BY id) e
+            JOIN clientes c ON c.id = e.id
+            WHERE c.deleted_at IS NULL
+            ORDER BY e.peso, c.nome
+            LIMIT ? OFFSET ?
+            '''
+            self.cursor.execute(query, params + [limite, offset])
+            return self.cursor.fetchall()
+        except Exception as e:
+            print(f"Error searching clients: {e}")
+            return []
+
     def buscar_cliente_por_cpf(self, cpf):
         """Search full client data by CPF."""
         try:
             if not cpf:
                 return None
             
-            cpf_normalizado = ''.join(ch for ch in str(cpf) if ch.isdigit())
+            cpf_normalizado = normalize_documento(cpf)
             if not cpf_normalizado:
                 return None
                 
@@ -329,7 +604,7 @@ class DatabaseManager:
             SELECT id, nome, cpf, cnpj, inscricao_estadual, telefone, email, 
                    cep, rua, numero, bairro, cidade, estado, referencia
             FROM clientes 
-            WHERE replace(replace(replace(cpf, '.', ''), '-', ''), ' ', '') = ?
+            WHERE documento_norm = ?
             LIMIT 1
             '''
             self.cursor.execute(query, (cpf_normalizado,))
@@ -369,10 +644,12 @@ class DatabaseManager:
                 """
                 UPDATE clientes
                 SET nome = ?, cpf = ?, telefone = ?, email = ?,
-                    rua = ?, numero = ?, bairro = ?, cidade = ?, estado = ?, referencia = ?
+                    rua = ?, numero = ?, bairro = ?, cidade = ?, estado = ?, referencia = ?,
+                    documento_norm = COALESCE(?, NULLIF(replace(replace(replace(replace(cnpj, '.', ''), '/', ''), '-', ''), ' ', ''), ''))
                 WHERE id = ?
                 """,
-                (nome, cpf, telefone, email, rua, numero, bairro, cidade, estado, referencia, int(cliente_id))
+                (nome, cpf, telefone, email, rua, numero, bairro, cidade, estado, referencia,
+                 normalize_documento(cpf), int(cliente_id))
             )
             self.conn.commit()
             return True
@@ -389,11 +666,13 @@ class DatabaseManager:
                 """
                 UPDATE clientes
                 SET nome = ?, cpf = ?, cnpj = ?, inscricao_estadual = ?, telefone = ?, email = ?,
-                    cep = ?, rua = ?, numero = ?, bairro = ?, cidade = ?, estado = ?, referencia = ?
+                    cep = ?, rua = ?, numero = ?, bairro = ?, cidade = ?, estado = ?, referencia = ?,
+                    documento_norm = ?
                 WHERE id = ?
                 """,
                 (nome, cpf, cnpj, inscricao_estadual, telefone, email, cep,
-                 rua, numero, bairro, cidade, estado, referencia, int(cliente_id))
+                 rua, numero, bairro, cidade, estado, referencia,
+                 documento_cliente(cpf, cnpj), int(cliente_id))
             )
             self.conn.commit()
             return True
@@ -411,12 +690,14 @@ class DatabaseManager:
             
             self.cursor.execute(
                 """
-                INSERT INTO clientes (nome, cpf, cnpj, inscricao_estadual, telefone, email,
-                                    cep, rua, numero, bairro, cidade, estado, referencia, data_criacao)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT OR IGNORE INTO clientes (nome, cpf, cnpj, inscricao_estadual, telefone, email,
+                                    cep, rua, numero, bairro, cidade, estado, referencia, data_criacao,
+                                    documento_norm)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (nome, cpf, cnpj, inscricao_estadual, telefone, email, cep,
-                 rua, numero, bairro, cidade, estado, referencia, data_atual)
+                 rua, numero, bairro, cidade, estado, referencia, data_atual,
+                 documento_cliente(cpf, cnpj))
             )
             self.conn.commit()
             return True
@@ -448,113 +729,53 @@ class DatabaseManager:
         return self.products.deletar_produto(produto_id)
 
     def listar_produtos_vendidos(self, busca: str = '', limite: int = 1000):
-        """Extracts real products from orders (dados_json.produtos or detalhes_produto).
-        Returns a list of dicts: {ordem_id, numero_os, data_criacao, descricao, valor, cor, reforco}
+        """Extracts real products from the latest orders (ordem_item rows).
+        Returns a list of dicts: {ordem_id, numero_os, data_criacao, descricao, valor, cor, reforco, codigo}
         """
         try:
-            query = 'SELECT id, numero_os, data_criacao, detalhes_produto, dados_json FROM ordem_servico ORDER BY data_criacao DESC LIMIT ?'
+            query = '''
+            SELECT o.id, o.numero_os, o.data_criacao, i.descricao, i.valor_unitario, i.cor, i.codigo
+            FROM (SELECT id, numero_os, data_criacao FROM ordem_servico ORDER BY data_criacao DESC LIMIT ?) o
+            JOIN ordem_item i ON i.ordem_id = o.id
+            ORDER BY o.data_criacao DESC, i.posicao
+            '''
             self.cursor.execute(query, (limite,))
             rows = self.cursor.fetchall()
             produtos = []
-            for row in rows:
-                ordem_id, numero_os, data_criacao, detalhes, dados_json = row
-                # try JSON first
-                parsed = []
-                if dados_json:
+            for ordem_id, numero_os, data_criacao, desc, valor, cor, codigo in rows:
+                desc = (desc or '').strip()
+                if busca and busca.lower() not in desc.lower():
+                    continue
+                if not codigo:
+                    # Item without a stored code: look it up in the in-memory catalog index
                     try:
-                        dj = json.loads(dados_json)
-                        parsed = dj.get('produtos', []) or []
+                        codigo = self.products.codigo_por_nome(desc)
                     except Exception:
-                        parsed = []
-                if parsed:
-                    for p in parsed:
-                        try:
-                            desc = str(p.get('descricao') or p.get('nome') or '').strip()
-                            valor = float(p.get('valor') or p.get('preco') or 0)
-                            cor = p.get('cor') if 'cor' in p else ''
-                            reforco = bool(p.get('reforco')) if 'reforco' in p else False
-                        except Exception:
-                            desc = str(p.get('descricao') or '').strip()
-                            try:
-                                valor = float(str(p.get('valor') or '0').replace(',', '.'))
-                            except Exception:
-                                valor = 0.0
-                            cor = p.get('cor') if 'cor' in p else ''
-                            reforco = bool(p.get('reforco')) if 'reforco' in p else False
-                        if busca and busca.lower() not in desc.lower():
-                            continue
-                        # try to find product code from catalog by exact or partial name match
                         codigo = ''
-                        try:
-                            self.cursor.execute("SELECT codigo FROM produtos WHERE nome = ? COLLATE NOCASE LIMIT 1", (desc,))
-                            rowc = self.cursor.fetchone()
-                            if rowc and rowc[0]:
-                                codigo = rowc[0]
-                            else:
-                                self.cursor.execute("SELECT codigo FROM produtos WHERE nome LIKE ? COLLATE NOCASE LIMIT 1", (f"%{desc}%",))
-                                rowc2 = self.cursor.fetchone()
-                                if rowc2 and rowc2[0]:
-                                    codigo = rowc2[0]
-                        except Exception:
-                            codigo = ''
-                        produtos.append({'ordem_id': ordem_id, 'numero_os': numero_os, 'data_criacao': data_criacao, 'descricao': desc, 'valor': float(valor or 0), 'cor': cor, 'reforco': reforco, 'codigo': codigo or ''})
-                else:
-                    # fallback: parse detalhes_produto lines like '• desc - R$ 1.234,56'
-                    if detalhes:
-                        try:
-                            linhas = [l.strip() for l in detalhes.replace('\r','\n').split('\n') if l.strip() and not l.strip().startswith('-')]
-                            for linha in linhas:
-                                if ' - R$ ' in linha:
-                                    try:
-                                        desc, valtxt = linha.rsplit(' - R$ ', 1)
-                                        valconv = valtxt.replace('.', '').replace(',', '.') if ',' in valtxt else valtxt
-                                        valor = float(valconv) if valconv else 0.0
-                                    except Exception:
-                                        valor = 0.0
-                                        desc = linha
-                                else:
-                                    valor = 0.0
-                                    desc = linha
-                                desc = desc.strip('• ').strip()
-                                if busca and busca.lower() not in desc.lower():
-                                    continue
-                                # try to find product code by matching description to catalog
-                                codigo = ''
-                                try:
-                                    self.cursor.execute("SELECT codigo FROM produtos WHERE nome = ? COLLATE NOCASE LIMIT 1", (desc,))
-                                    rowc = self.cursor.fetchone()
-                                    if rowc and rowc[0]:
-                                        codigo = rowc[0]
-                                    else:
-                                        self.cursor.execute("SELECT codigo FROM produtos WHERE nome LIKE ? COLLATE NOCASE LIMIT 1", (f"%{desc}%",))
-                                        rowc2 = self.cursor.fetchone()
-                                        if rowc2 and rowc2[0]:
-                                            codigo = rowc2[0]
-                                except Exception:
-                                    codigo = ''
-                                produtos.append({'ordem_id': ordem_id, 'numero_os': numero_os, 'data_criacao': data_criacao, 'descricao': desc, 'valor': float(valor or 0), 'cor': '', 'reforco': False, 'codigo': codigo or ''})
-                        except Exception:
-                            pass
+                produtos.append({'ordem_id': ordem_id, 'numero_os': numero_os, 'data_criacao': data_criacao, 'descricao': desc, 'valor': float(valor or 0), 'cor': cor or '', 'reforco': False, 'codigo': codigo or ''})
             return produtos
         except Exception as e:
             print(f"Error listing sold products: {e}")
             return []
 
+    @em_cache('pedidos')
     def obter_resumo_mes(self, ano, mes):
-        """Get sales summary for the month."""
+        """Get sales summary for the month (from the vendas_diarias rollup)."""
         try:
             query = '''
             SELECT 
-                COUNT(*) as total_pedidos,
+                IFNULL(SUM(quantidade), 0) as total_pedidos,
                 SUM(valor_produto) as total_valor,
-                SUM(valor_entrada) as total_entradas
-            FROM ordem_servico 
-            WHERE strftime('%Y', data_criacao) = ? AND strftime('%m', data_criacao) = ?
+                SUM(entradas) as total_entradas
+            FROM vendas_diarias 
+            WHERE data >= ? AND data < date(?, '+1 month')
             '''
-            self.cursor.execute(query, (str(ano), f"{mes:02d}"))
+            inicio_mes = f"{int(ano):04d}-{int(mes):02d}-01"
+            self.cursor.execute(query, (inicio_mes, inicio_mes))
             resultado = self.cursor.fetchone()
             return resultado if resultado else (0, 0, 0)
         except Exception as e:
+            registrar_falha()
             print(f"Error getting month summary: {e}")
             return (0, 0, 0)
 
@@ -562,33 +783,35 @@ class DatabaseManager:
         """List orders sorted by deadline - compatibility."""
         return self.listar_pedidos_ordenados_por_prazo(limite)
 
+    @em_cache('pedidos')
     def obter_resumo_ano(self, ano):
-        """Get sales summary for the year."""
+        """Get sales summary for the year (from the vendas_diarias rollup)."""
         try:
             query = '''
             SELECT 
-                COUNT(*) as total_pedidos,
+                IFNULL(SUM(quantidade), 0) as total_pedidos,
                 SUM(valor_produto) as total_valor,
-                SUM(valor_entrada) as total_entradas
-            FROM ordem_servico 
-            WHERE strftime('%Y', data_criacao) = ?
+                SUM(entradas) as total_entradas
+            FROM vendas_diarias 
+            WHERE data >= ? AND data < ?
             '''
-            self.cursor.execute(query, (str(ano),))
+            self.cursor.execute(query, (f"{int(ano):04d}-01-01", f"{int(ano) + 1:04d}-01-01"))
             resultado = self.cursor.fetchone()
             return resultado if resultado else (0, 0, 0)
         except Exception as e:
+            registrar_falha()
             print(f"Error getting year summary: {e}")
             return (0, 0, 0)
 
     def obter_resumo_total(self):
-        """Get total sales summary."""
+        """Get total sales summary (from the vendas_diarias rollup)."""
         try:
             query = '''
             SELECT 
-                COUNT(*) as total_pedidos,
+                IFNULL(SUM(quantidade), 0) as total_pedidos,
                 SUM(valor_produto) as total_valor,
-                SUM(valor_entrada) as total_entradas
-            FROM ordem_servico
+                SUM(entradas) as total_entradas
+            FROM vendas_diarias
             '''
             self.cursor.execute(query)
             resultado = self.cursor.fetchone()
@@ -651,22 +874,23 @@ class DatabaseManager:
             from datetime import datetime
             
             # Normalize CPF
-            cpf_norm = ''.join(ch for ch in str(cpf or '') if ch.isdigit())
+            cpf_norm = normalize_documento(cpf)
             if cliente_id:
                 # Atualizar cliente existente
                 self.cursor.execute("""
                     UPDATE clientes 
                     SET nome = ?, cpf = ?, telefone = ?, email = ?, rua = ?, numero = ?,
-                        bairro = ?, cidade = ?, estado = ?, referencia = ?
+                        bairro = ?, cidade = ?, estado = ?, referencia = ?,
+                        documento_norm = COALESCE(?, NULLIF(replace(replace(replace(replace(cnpj, '.', ''), '/', ''), '-', ''), ' ', ''), ''))
                     WHERE id = ?
-                """, (nome, cpf, telefone, email, rua, numero, bairro, cidade, estado, referencia, cliente_id))
+                """, (nome, cpf, telefone, email, rua, numero, bairro, cidade, estado, referencia, cpf_norm, cliente_id))
             else:
                 # Criar novo cliente
                 data_atual = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 self.cursor.execute("""
-                    INSERT INTO clientes (nome, cpf, telefone, email, rua, numero, bairro, cidade, estado, referencia, data_criacao)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (nome, cpf, telefone, email, rua, numero, bairro, cidade, estado, referencia, data_atual))
+                    INSERT OR IGNORE INTO clientes (nome, cpf, telefone, email, rua, numero, bairro, cidade, estado, referencia, data_criacao, documento_norm)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (nome, cpf, telefone, email, rua, numero, bairro, cidade, estado, referencia, data_atual, cpf_norm))
                 
             self.conn.commit()
             return True
@@ -681,11 +905,11 @@ class DatabaseManager:
             from datetime import datetime
             data_atual = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
-            cpf_norm = ''.join(ch for ch in str(cpf or '') if ch.isdigit())
+            cpf_norm = normalize_documento(cpf)
             self.cursor.execute("""
-                INSERT INTO clientes (nome, cpf, telefone, email, rua, numero, referencia, data_criacao)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (nome, cpf_norm, telefone, email, endereco, numero, referencia, data_atual))
+                INSERT OR IGNORE INTO clientes (nome, cpf, telefone, email, rua, numero, referencia, data_criacao, documento_norm)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (nome, cpf_norm or '', telefone, email, endereco, numero, referencia, data_atual, cpf_norm))
             
             self.conn.commit()
             return self.cursor.lastrowid
@@ -695,9 +919,11 @@ class DatabaseManager:
             return None
 
     def close(self):
-        """Close database connection."""
-        if hasattr(self, 'conn'):
-            self.conn.close()
+        """Close all pooled database connections."""
+        if hasattr(self, 'pool'):
+            self.pool.fechar_todas()
+        if hasattr(self, 'relatorios_cache'):
+            self.relatorios_cache.invalidar()
 
     # ---------- Gastos (Despesas) ----------
     def inserir_gasto(self, tipo, descricao, valor, data=None):
@@ -708,6 +934,7 @@ class DatabaseManager:
             else:
                 self.cursor.execute("INSERT INTO gastos (tipo, descricao, valor) VALUES (?, ?, ?)", (tipo, descricao, float(valor)))
             self.conn.commit()
+            self.relatorios_cache.invalidar('gastos')
             return self.cursor.lastrowid
         except Exception as e:
             print(f"Error inserting expense: {e}")
@@ -734,6 +961,7 @@ class DatabaseManager:
                 (novo_tipo, novo_desc, novo_val, novo_data, gasto_id)
             )
             self.conn.commit()
+            self.relatorios_cache.invalidar('gastos')
             return True
         except Exception as e:
             print(f"Error updating expense: {e}")
@@ -744,6 +972,7 @@ class DatabaseManager:
         try:
             self.cursor.execute('DELETE FROM gastos WHERE id = ?', (gasto_id,))
             self.conn.commit()
+            self.relatorios_cache.invalidar('gastos')
             return True
         except Exception as e:
             print(f"Error deleting expense: {e}")
@@ -759,44 +988,36 @@ class DatabaseManager:
             print(f"Error fetching expense by id: {e}")
             return None
 
+    @em_cache('gastos')
     def listar_gastos_periodo(self, data_inicio, data_fim):
         """List expenses for a given period."""
         try:
-            query = 'SELECT id, tipo, descricao, valor, data FROM gastos WHERE date(data) BETWEEN ? AND ? ORDER BY data DESC'
-            self.cursor.execute(query, (data_inicio, data_fim))
+            # Half-open range on the raw column so idx_gastos_data is used
+            query = "SELECT id, tipo, descricao, valor, data FROM gastos WHERE data >= ? AND data < date(?, '+1 day') ORDER BY data DESC"
+            self.cursor.execute(query, (str(data_inicio)[:10], str(data_fim)[:10]))
             return self.cursor.fetchall()
         except Exception as e:
+            registrar_falha()
             print(f"Error listing expenses by period: {e}")
             return []
 
+    @em_cache('gastos')
     def soma_gastos_periodo(self, data_inicio, data_fim):
         """Sum expenses for a given period."""
         try:
-            query = 'SELECT SUM(valor) FROM gastos WHERE date(data) BETWEEN ? AND ?'
-            self.cursor.execute(query, (data_inicio, data_fim))
+            query = "SELECT SUM(valor) FROM gastos WHERE data >= ? AND data < date(?, '+1 day')"
+            self.cursor.execute(query, (str(data_inicio)[:10], str(data_fim)[:10]))
             row = self.cursor.fetchone()
             return float(row[0] or 0.0)
         except Exception as e:
+            registrar_falha()
             print(f"Error summing expenses by period: {e}")
             return 0.0
 
+    @em_cache('pedidos')
     def contar_caixas_vendidas_periodo(self, data_inicio, data_fim):
-        """Count occurrences of 'caixa' in detalhes_produto in the period (simple heuristic)."""
-        try:
-            query = "SELECT detalhes_produto FROM ordem_servico WHERE date(data_criacao) BETWEEN ? AND ? AND (dados_json IS NULL OR instr(dados_json, 'cancelado') = 0)"
-            self.cursor.execute(query, (data_inicio, data_fim))
-            rows = self.cursor.fetchall()
-            total = 0
-            for (det,) in rows:
-                if not det:
-                    continue
-                # contar a palavra 'caixa' e variações
-                txt = det.lower()
-                total += txt.count('caixa')
-            return total
-        except Exception as e:
-            print(f"Error counting 'caixa': {e}")
-            return 0
+        """Units of 'caixa' products sold in the period (ordem_item quantities, one aggregate query)."""
+        return self.reports.contar_unidades_periodo(data_inicio, data_fim, 'caixa')
 
     def get_pedido_por_id(self, pedido_id):
         """Fetch a specific order by ID."""
@@ -805,7 +1026,7 @@ class DatabaseManager:
             query = '''
             SELECT id, numero_os, data_criacao, nome_cliente, cpf_cliente, 
                    telefone_cliente, detalhes_produto, valor_produto, valor_entrada, 
-                   frete, forma_pagamento, prazo, nome_pdf, dados_json, status
+                   frete, forma_pagamento, prazo, nome_pdf, dados_json, status, desconto
             FROM ordem_servico 
             WHERE id = ?
             '''
@@ -831,20 +1052,15 @@ class DatabaseManager:
                 'prazo': row[11],
                 'nome_pdf': row[12],
                 'dados_json': row[13],
-                'status': row[14] or 'Pendente'
+                'status': row[14] or 'Pendente',
+                'desconto': row[15] or 0.0
             }
             
             # Tentar extrair dados do JSON para campos adicionais
             if pedido['dados_json']:
                 try:
                     json_data = json.loads(pedido['dados_json'])
-                    pedido.update({
-                        'desconto': json_data.get('desconto', 0.0),
-                        'observacoes': json_data.get('observacoes', '')
-                    })
-                    # Sobrescrever status se houver no JSON
-                    if 'status' in json_data:
-                        pedido['status'] = json_data['status']
+                    pedido['observacoes'] = json_data.get('observacoes', '')
                 except:
                     pass
             
@@ -855,88 +1071,26 @@ class DatabaseManager:
             return None
 
     def get_produtos_do_pedido(self, pedido_id):
-        """Extract product list from an order."""
+        """Return the product list of an order (from ordem_item)."""
         try:
-            pedido = self.get_pedido_por_id(pedido_id)
-            if not pedido:
-                return []
-            
+            itens = self.order_crud.order_items.listar_itens([pedido_id]).get(pedido_id, [])
             produtos = []
-            
-            # Tentar extrair do JSON primeiro
-            if pedido.get('dados_json'):
-                try:
-                    import json
-                    json_data = json.loads(pedido['dados_json'])
-                    produtos_json = json_data.get('produtos', [])
-                    if produtos_json:
-                        for i, p in enumerate(produtos_json):
-                            # Log processing of each product in JSON (debug)
-                            print(f"Processing JSON product {i}: {p}, type: {type(p)}")
-                            if isinstance(p, dict):
-                                produto = {
-                                    'nome': p.get('descricao', p.get('nome', 'Produto')),
-                                    'codigo': p.get('codigo', 'S/Código'),
-                                    'quantidade': p.get('quantidade', 1),
-                                    'valor_unitario': p.get('valor', p.get('preco', 0.0))
-                                }
-                                
-                                # Adicionar informações de cor (estrutura completa)
-                                if 'cor_data' in p:
-                                    produto['cor_data'] = p['cor_data']
-                                elif 'cor' in p:
-                                    produto['cor'] = p['cor']
-                                
-                                # Debug: verificar se as cores estão sendo preservadas
-                                print(f"Product {produto['nome']}: cor_data={produto.get('cor_data')}, cor={produto.get('cor')}")
-                                
-                                produtos.append(produto)
-                            else:
-                                print(f"ERROR: Product is not dict: {p}")
-                                produtos.append({
-                                    'nome': str(p),
-                                    'quantidade': 1,
-                                    'valor_unitario': 0.0
-                                })
-                        return produtos
-                except Exception as e:
-                    print(f"Error processing product JSON: {e}")
-                    pass
-            
-            # Fallback: extrair do campo detalhes_produto (texto)
-            detalhes = pedido.get('detalhes_produto', '')
-            if detalhes:
-                linhas = detalhes.replace('\r', '\n').split('\n')
-                for linha in linhas:
-                    linha = linha.strip()
-                    if linha and not linha.startswith('-'):
-                        if ' - R$ ' in linha:
-                            try:
-                                nome = linha.split(' - R$ ')[0].strip()
-                                valor_str = linha.split(' - R$ ')[1].strip()
-                                valor = float(valor_str.replace(',', '.'))
-                                produtos.append({
-                                    'nome': nome,
-                                    'quantidade': 1,
-                                    'valor_unitario': valor
-                                })
-                            except Exception as e:
-                                print(f"Error processing product line: {linha}, error: {e}")
-                                pass
-                        else:
-                            # Produto sem valor especificado
-                            produtos.append({
-                                'nome': linha,
-                                'quantidade': 1,
-                                'valor_unitario': 0.0
-                            })
-            
+            for item in itens:
+                produto = {
+                    'nome': item.get('descricao') or 'Produto',
+                    'codigo': item.get('codigo', 'S/Código'),
+                    'quantidade': item.get('quantidade', 1),
+                    'valor_unitario': item.get('valor', 0.0)
+                }
+                # Adicionar informações de cor (estrutura completa)
+                if 'cor_data' in item:
+                    produto['cor_data'] = item['cor_data']
+                elif 'cor' in item:
+                    produto['cor'] = item['cor']
+                produtos.append(produto)
             return produtos
-            
         except Exception as e:
             print(f"Error fetching order products: {e}")
-            import traceback
-            traceback.print_exc()
             return []
 
     def excluir_pedido(self, pedido_id):
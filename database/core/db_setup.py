@@ -20,7 +20,9 @@ class DatabaseSetup:
     
     @staticmethod
     def criar_tabelas(cursor):
-        """Create all required tables and indices. User-facing errors are in Portuguese; logs in English."""
+        """Create all required tables and indices (first step of database/migrations/runner.py).
+        Columns added after the first release are handled by the add_colunas_legadas migration.
+        User-facing errors are in Portuguese; logs in English."""
         try:
             # Service orders table
             cursor.execute('''
@@ -69,40 +71,11 @@ class DatabaseSetup:
             # Indices for performance
             cursor.execute('''CREATE INDEX IF NOT EXISTS idx_numero_os ON ordem_servico(numero_os)''')
             cursor.execute('''CREATE INDEX IF NOT EXISTS idx_data_criacao ON ordem_servico(data_criacao)''')
-            cursor.execute('''CREATE INDEX IF NOT EXISTS idx_status ON ordem_servico(status)''')
             cursor.execute('''CREATE INDEX IF NOT EXISTS idx_nome_cliente ON ordem_servico(nome_cliente)''')
             cursor.execute('''CREATE INDEX IF NOT EXISTS idx_cliente_nome ON clientes(nome)''')
             cursor.execute('''CREATE INDEX IF NOT EXISTS idx_cliente_cpf ON clientes(cpf)''')
             cursor.execute('''CREATE INDEX IF NOT EXISTS idx_cliente_telefone ON clientes(telefone)''')
 
-            # Ensure CNPJ and Inscrição Estadual columns exist (migration)
-            try:
-                cursor.execute("ALTER TABLE clientes ADD COLUMN cnpj TEXT")
-            except Exception:
-                pass  # Ignore if already exists
-            try:
-                cursor.execute("ALTER TABLE clientes ADD COLUMN inscricao_estadual TEXT")
-            except Exception:
-                pass  # Ignore if already exists
-
-            # Ensure status column for service orders (migration)
-            try:
-                cursor.execute("ALTER TABLE ordem_servico ADD COLUMN status TEXT DEFAULT 'Em Andamento'")
-            except Exception:
-                pass  # Ignore if already exists
-
-            # Ensure CEP column for clients (migration)
-            try:
-                cursor.execute("ALTER TABLE clientes ADD COLUMN cep TEXT")
-            except Exception:
-                pass  # Ignore if already exists
-
-            # Create CNPJ index after ensuring column exists
-            try:
-                cursor.execute('''CREATE INDEX IF NOT EXISTS idx_cliente_cnpj ON clientes(cnpj)''')
-            except Exception:
-                pass  # Ignore if already exists
-
             # Products table (catalog)
             cursor.execute('''
             CREATE TABLE IF NOT EXISTS produtos (
@@ -120,11 +93,6 @@ class DatabaseSetup:
             cursor.execute('''CREATE INDEX IF NOT EXISTS idx_produtos_nome ON produtos(nome)''')
             cursor.execute('''CREATE INDEX IF NOT EXISTS idx_produtos_categoria ON produtos(categoria)''')
             cursor.execute('''CREATE INDEX IF NOT EXISTS idx_produtos_preco ON produtos(preco)''')
-            # Ensure 'codigo' column exists for compatibility (simple migration)
-            try:
-                cursor.execute("ALTER TABLE produtos ADD COLUMN codigo TEXT")
-            except Exception:
-                pass  # Ignore if already exists
 
             # Expenses table
             cursor.execute('''
@@ -139,6 +107,7 @@ class DatabaseSetup:
 
             cursor.execute('''CREATE INDEX IF NOT EXISTS idx_gastos_data ON gastos(data)''')
             cursor.execute('''CREATE INDEX IF NOT EXISTS idx_gastos_tipo ON gastos(tipo)''')
+            return True
         except Exception as e:
             print(f"Erro ao criar tabelas: {e}")  # User-facing error in Portuguese
             print(f"Error creating tables: {e}")  # Log in English
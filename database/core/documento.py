@@ -0,0 +1,18 @@
+"""
+Helpers for the normalized CPF/CNPJ document key (documento_norm).
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+
+def normalize_documento(valor):
+    """Return only the digits of a CPF/CNPJ, or None when there are none."""
+    try:
+        digits = ''.join(ch for ch in str(valor or '') if ch.isdigit())
+    except Exception:
+        return None
+    return digits or None
+
+
+def documento_cliente(cpf=None, cnpj=None):
+    """Return the documento_norm value for a client row (CPF digits first, then CNPJ digits)."""
+    return normalize_documento(cpf) or normalize_documento(cnpj)
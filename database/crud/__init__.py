@@ -1,5 +1,7 @@
 """CRUD operations for database entities."""
 from .order_crud import OrderCRUD
 from .products_crud import ProductsCRUD
+from .order_items import OrderItemsCRUD
+from .numero_os_crud import NumeroOSCRUD
 
-__all__ = ['OrderCRUD', 'ProductsCRUD']
+__all__ = ['OrderCRUD', 'ProductsCRUD', 'OrderItemsCRUD', 'NumeroOSCRUD']
@@ -0,0 +1,73 @@
+"""
+Atomic allocation of service order numbers (numero_os) from the sequencia table.
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+from datetime import datetime, timedelta
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Reservations older than this are considered abandoned (e.g. the app was closed with a modal open)
+RESERVA_VALIDADE = timedelta(days=1)
+
+
+class NumeroOSCRUD:
+    def __init__(self, cursor, conn):
+        self.cursor = cursor
+        self.conn = conn
+
+    def _avancar(self):
+        """Advance the sequence and return the new value. Caller owns the transaction."""
+        self.cursor.execute("UPDATE sequencia SET valor = valor + 1 WHERE nome = 'numero_os'")
+        self.cursor.execute("SELECT valor FROM sequencia WHERE nome = 'numero_os'")
+        return int(self.cursor.fetchone()[0])
+
+    def proximo_numero(self):
+        """Preview of the next number (read-only; may be taken by someone else before saving)."""
+        self.cursor.execute("SELECT valor FROM sequencia WHERE nome = 'numero_os'")
+        row = self.cursor.fetchone()
+        return int(row[0] if row else 0) + 1
+
+    def reservar(self):
+        """Reserve the next number for an open order form. Returns the reserved number."""
+        with self.conn:
+            limite = (datetime.now() - RESERVA_VALIDADE).strftime('%Y-%m-%d %H:%M:%S')
+            self.cursor.execute("DELETE FROM numero_os_reserva WHERE reservado_em < ?", (limite,))
+            numero = self._avancar()
+            self.cursor.execute(
+                "INSERT INTO numero_os_reserva (numero, reservado_em) VALUES (?, ?)",
+                (numero, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            )
+        return numero
+
+    def liberar(self, numero):
+        """Release an unused reservation. The sequence steps back if it was the last number handed out."""
+        with self.conn:
+            self.cursor.execute("DELETE FROM numero_os_reserva WHERE numero = ?", (numero,))
+            if self.cursor.rowcount:
+                self.cursor.execute(
+                    "UPDATE sequencia SET valor = valor - 1 WHERE nome = 'numero_os' AND valor = ?",
+                    (numero,)
+                )
+                return True
+        return False
+
+    def alocar(self, numero=None):
+        """Return the number to store in a new order. Must run inside the order's save transaction.
+        A reserved 'numero' is consumed; a free, unreserved 'numero' is accepted as-is (the sequence
+        is moved past it); otherwise, or when it is already taken, the next sequence value is used.
+        """
+        if numero:
+            numero = int(numero)
+            self.cursor.execute("DELETE FROM numero_os_reserva WHERE numero = ?", (numero,))
+            if self.cursor.rowcount:
+                return numero
+            self.cursor.execute("SELECT 1 FROM ordem_servico WHERE numero_os = ? LIMIT 1", (numero,))
+            if not self.cursor.fetchone():
+                self.cursor.execute(
+                    "UPDATE sequencia SET valor = MAX(valor, ?) WHERE nome = 'numero_os'",
+                    (numero,)
+                )
+                return numero
+            logger.info(f"numero_os {numero} already in use, allocating the next one")
+        return self._avancar()
@@ -7,91 +7,47 @@ import json
 from datetime import datetime
 import logging
 
+from database.core.documento import normalize_documento
+from database.migrations.promote_json_fields import CAMPOS_PROMOVIDOS, normalizar_status, valores_promovidos
+from database.crud.order_items import OrderItemsCRUD, montar_itens
+from database.crud.numero_os_crud import NumeroOSCRUD
+
 logger = logging.getLogger(__name__)
 
 def _normalize_cpf(cpf):
     """Return only digits from cpf (normalize format)."""
-    try:
-        return ''.join(ch for ch in str(cpf or '') if ch.isdigit())
-    except Exception:
-        return ''
+    return normalize_documento(cpf) or ''
 
 class OrderCRUD:
     def __init__(self, cursor, conn):
         self.cursor = cursor
         self.conn = conn
+        self.order_items = OrderItemsCRUD(cursor, conn)
+        self.numeros = NumeroOSCRUD(cursor, conn)
     
     def criar_ordem(self, dados, nome_pdf=""):
-        """Create a new service order."""
+        """Create a new service order.
+        numero_os is allocated inside the save transaction; dados['numero_os'] is set to the number actually used.
+        """
         try:
             query = '''
             INSERT INTO ordem_servico (numero_os, data_criacao, nome_cliente, cpf_cliente, 
                                      telefone_cliente, detalhes_produto, valor_produto, 
                                      valor_entrada, frete, forma_pagamento, prazo, 
-                                     nome_pdf, dados_json)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                     nome_pdf, dados_json, documento_norm,
+                                     status, desconto, cor, reforco)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             '''
             
-            # Build structured produtos list: prefer dados['produtos'] (list), else parse detalhes_produto text
-            produtos_struct = []
-            if isinstance(dados.get('produtos'), (list, tuple)) and len(dados.get('produtos')) > 0:
-                for p in dados.get('produtos'):
-                    try:
-                        descricao = str(p.get('descricao') or p.get('nome') or '').strip()
-                        valor = float(p.get('valor') or p.get('preco') or 0)
-                        quantidade = int(p.get('quantidade', 1))
-                    except Exception:
-                        descricao = str(p.get('descricao') or '').strip()
-                        try:
-                            valor = float(str(p.get('valor') or '0').replace(',', '.'))
-                        except Exception:
-                            valor = 0.0
-                        quantidade = int(p.get('quantidade', 1))
-                    
-                    # Preservar estrutura completa do produto, incluindo cor_data
-                    produto_completo = {
-                        'descricao': descricao,
-                        'valor': valor,
-                        'quantidade': quantidade
-                    }
-                    
-                    # Preservar cor_data se existir
-                    if 'cor_data' in p:
-                        produto_completo['cor_data'] = p['cor_data']
-                    elif 'cor' in p:  # Compatibilidade com formato antigo
-                        produto_completo['cor'] = p['cor']
-                    
-                    # Preservar outros campos importantes
-                    for campo in ['nome', 'codigo']:
-                        if campo in p:
-                            produto_completo[campo] = p[campo]
-                    
-                    produtos_struct.append(produto_completo)
-            else:
-                detalhes = dados.get('detalhes_produto', '') or ''
-                for linha in [l.strip() for l in detalhes.replace('\r', '\n').split('\n') if l.strip() and not l.strip().startswith('-')]:
-                    if ' - R$ ' in linha:
-                        try:
-                            desc, valtxt = linha.rsplit(' - R$ ', 1)
-                            valtxt_original = valtxt.strip()
-                            valconv = valtxt_original.replace('.', '').replace(',', '.') if ',' in valtxt_original else valtxt_original
-                            valor = float(valconv) if valconv else 0.0
-                            produtos_struct.append({'descricao': desc.strip('\u2022 ').strip(), 'valor': valor})
-                        except Exception:
-                            produtos_struct.append({'descricao': linha.strip('\u2022 ').strip(), 'valor': 0.0})
-                    else:
-                        produtos_struct.append({'descricao': linha.strip('\u2022 ').strip(), 'valor': 0.0})
+            # Build structured items: prefer dados['produtos'] (list), else parse detalhes_produto text
+            itens = montar_itens(dados)
 
             desconto = float(dados.get('desconto', 0) or 0)
-            valor_produto = sum([float(p.get('valor', 0) or 0) for p in produtos_struct])
+            valor_produto = sum([float(p.get('valor', 0) or 0) for p in itens])
 
+            # Products live in ordem_item; status, desconto, cor and reforco in real columns
             dados_json = json.dumps({
-                'status': dados.get('status', 'em produção'),
                 'data_entrega': None,
-                'desconto': desconto,
-                'cor': dados.get('cor', ''),
-                'reforco': bool(dados.get('reforco', False)),
-                'produtos': produtos_struct,
             })
 
             # Normalize CPF to digits-only for consistent storage
@@ -103,7 +59,6 @@ class OrderCRUD:
                 raise ValueError("Campo 'nome_cliente' é obrigatório")  # User-facing message in Portuguese
             
             valores = (
-                dados.get('numero_os', 1),
                 datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                 nome_cliente,
                 cpf_norm,
@@ -115,23 +70,22 @@ class OrderCRUD:
                 dados.get('forma_pagamento', ''),
                 int(dados.get('prazo') or 0),
                 nome_pdf,
-                dados_json
+                dados_json,
+                cpf_norm or None,
+                normalizar_status(dados.get('status') or 'em produção'),
+                desconto,
+                dados.get('cor', '') or '',
+                1 if dados.get('reforco', False) else 0
             )
             
-            self.cursor.execute(query, valores)
-            self.conn.commit()
-            logger.info(f"Order created: numero_os={dados.get('numero_os')}, client={nome_cliente}, valor_produto={valor_produto}")
-            # Incrementar contador de compras do cliente
-            try:
-                if cpf_norm:
-                    self.cursor.execute("""
-                        UPDATE clientes 
-                        SET numero_compras = numero_compras + 1
-                        WHERE cpf = ? OR cnpj = ?
-                    """, (cpf_norm, cpf_norm))
-                    self.conn.commit()
-            except Exception as e:
-                logger.warning(f"Warning: could not update purchase counter: {e}")
+            # Number allocation, order row and its items commit together (one transaction);
+            # the client's numero_compras is bumped by trg_numero_compras_insert
+            with self.conn:
+                numero_os = self.numeros.alocar(dados.get('numero_os'))
+                self.cursor.execute(query, (numero_os,) + valores)
+                self.order_items.substituir_itens(self.cursor.lastrowid, itens)
+            dados['numero_os'] = numero_os
+            logger.info(f"Order created: numero_os={numero_os}, client={nome_cliente}, valor_produto={valor_produto}")
             return True
         except Exception as e:
             logger.error(f"Error creating order: {e}", exc_info=True)
@@ -147,11 +101,7 @@ class OrderCRUD:
                 return None
             cols = [d[0] for d in self.cursor.description]
             mapped = dict(zip(cols, row))
-            try:
-                dadosj = json.loads(mapped.get('dados_json') or '{}')
-                mapped['produtos'] = dadosj.get('produtos', [])
-            except Exception:
-                mapped['produtos'] = []
+            mapped['produtos'] = self.order_items.listar_itens([mapped['id']]).get(mapped['id'], [])
             return mapped
         except Exception as e:
             logger.error(f"Error searching order: {e}", exc_info=True)
@@ -160,11 +110,40 @@ class OrderCRUD:
     def atualizar_ordem(self, pedido_id, campos):
         """Update specific fields of the order."""
         try:
+            itens = None
+            if campos.get('status'):
+                campos = dict(campos)
+                campos['status'] = normalizar_status(campos['status'])
+            if 'cpf_cliente' in campos:
+                # Keep the indexed document key in sync with cpf_cliente
+                campos = dict(campos)
+                campos['documento_norm'] = normalize_documento(campos.get('cpf_cliente'))
+            if campos.get('dados_json'):
+                # Promoted fields sent inside dados_json go to their real columns
+                try:
+                    dados = json.loads(campos['dados_json']) or {}
+                except Exception:
+                    dados = None
+                if isinstance(dados, dict):
+                    campos = dict(campos)
+                    for campo, valor in valores_promovidos(dados).items():
+                        campos.setdefault(campo, valor)
+                    for campo in CAMPOS_PROMOVIDOS:
+                        dados.pop(campo, None)
+                    # Products sent inside dados_json go to ordem_item
+                    produtos = dados.pop('produtos', None)
+                    if isinstance(produtos, (list, tuple)):
+                        itens = montar_itens({'produtos': produtos, 'detalhes_produto': campos.get('detalhes_produto')})
+                    campos['dados_json'] = json.dumps(dados, ensure_ascii=False)
+            if itens is None and campos.get('detalhes_produto'):
+                itens = montar_itens({'detalhes_produto': campos['detalhes_produto']})
             set_clause = ', '.join([f'{campo} = ?' for campo in campos.keys()])
             query = f'UPDATE ordem_servico SET {set_clause} WHERE id = ?'
             valores = list(campos.values()) + [pedido_id]
-            self.cursor.execute(query, valores)
-            self.conn.commit()
+            with self.conn:
+                self.cursor.execute(query, valores)
+                if itens is not None:
+                    self.order_items.substituir_itens(pedido_id, itens)
             logger.info(f"Order updated: pedido_id={pedido_id}, fields={campos}")
             return True
         except Exception as e:
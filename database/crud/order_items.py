@@ -0,0 +1,165 @@
+"""
+CRUD for service order line items (ordem_item table).
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def montar_itens(dados):
+    """Build the normalized item list of an order.
+    Prefers the structured dados['produtos'] list; falls back to parsing detalhes_produto lines
+    like '• desc - R$ 1.234,56'. Each item is a dict with descricao, valor, quantidade and,
+    when present, nome, codigo, cor and cor_data.
+    """
+    itens = []
+    produtos = dados.get('produtos')
+    if isinstance(produtos, (list, tuple)) and len(produtos) > 0:
+        for p in produtos:
+            if not isinstance(p, dict):
+                itens.append({'descricao': str(p).strip(), 'valor': 0.0, 'quantidade': 1})
+                continue
+            descricao = str(p.get('descricao') or p.get('nome') or '').strip()
+            try:
+                valor = float(p.get('valor') or p.get('preco') or 0)
+            except Exception:
+                try:
+                    valor = float(str(p.get('valor') or '0').replace(',', '.'))
+                except Exception:
+                    valor = 0.0
+            try:
+                quantidade = int(p.get('quantidade', 1) or 1)
+            except Exception:
+                quantidade = 1
+
+            item = {'descricao': descricao, 'valor': valor, 'quantidade': quantidade}
+            # Preservar cor_data (estrutura completa) ou cor (formato antigo)
+            if 'cor_data' in p:
+                item['cor_data'] = p['cor_data']
+            elif 'cor' in p:
+                item['cor'] = p['cor']
+            for campo in ['nome', 'codigo']:
+                if campo in p:
+                    item[campo] = p[campo]
+            itens.append(item)
+        return itens
+
+    detalhes = dados.get('detalhes_produto', '') or ''
+    for linha in [l.strip() for l in detalhes.replace('\r', '\n').split('\n') if l.strip() and not l.strip().startswith('-')]:
+        if ' - R$ ' in linha:
+            try:
+                desc, valtxt = linha.rsplit(' - R$ ', 1)
+                valtxt_original = valtxt.strip()
+                valconv = valtxt_original.replace('.', '').replace(',', '.') if ',' in valtxt_original else valtxt_original
+                valor = float(valconv) if valconv else 0.0
+                itens.append({'descricao': desc.strip('\u2022 ').strip(), 'valor': valor, 'quantidade': 1})
+            except Exception:
+                itens.append({'descricao': linha.strip('\u2022 ').strip(), 'valor': 0.0, 'quantidade': 1})
+        else:
+            itens.append({'descricao': linha.strip('\u2022 ').strip(), 'valor': 0.0, 'quantidade': 1})
+    return itens
+
+
+def item_para_produto(descricao, codigo, quantidade, valor_unitario, cor, cor_data):
+    """Convert an ordem_item row back to the product dict shape used by the UI and the PDF."""
+    produto = {
+        'descricao': descricao or '',
+        'nome': descricao or '',
+        'valor': float(valor_unitario or 0),
+        'quantidade': int(quantidade or 1),
+    }
+    if codigo:
+        produto['codigo'] = codigo
+    if cor_data is not None:
+        try:
+            produto['cor_data'] = json.loads(cor_data)
+        except Exception:
+            produto['cor_data'] = cor_data
+    elif cor is not None:
+        produto['cor'] = cor
+    return produto
+
+
+class OrderItemsCRUD:
+    def __init__(self, cursor, conn):
+        self.cursor = cursor
+        self.conn = conn
+
+    def carregar_catalogo(self):
+        """Return ({codigo: (id, codigo)}, {nome_lower: (id, codigo)}) for bulk item writes."""
+        por_codigo, por_nome = {}, {}
+        self.cursor.execute("SELECT id, nome, codigo FROM produtos ORDER BY id")
+        for produto_id, nome, codigo in self.cursor.fetchall():
+            if codigo:
+                por_codigo.setdefault(str(codigo), (produto_id, codigo))
+            if nome:
+                por_nome.setdefault(str(nome).lower(), (produto_id, codigo))
+        return por_codigo, por_nome
+
+    def _resolver_produto(self, item, catalogo=None):
+        """Return (produto_id, codigo) from the catalog for an item, matching codigo first, then name."""
+        codigo = str(item.get('codigo') or '').strip()
+        descricao = item.get('descricao') or ''
+        try:
+            if catalogo is not None:
+                por_codigo, por_nome = catalogo
+                row = (por_codigo.get(codigo) if codigo else None) or por_nome.get(descricao.lower())
+            else:
+                row = None
+                if codigo:
+                    self.cursor.execute("SELECT id, codigo FROM produtos WHERE codigo = ? LIMIT 1", (codigo,))
+                    row = self.cursor.fetchone()
+                if not row:
+                    self.cursor.execute("SELECT id, codigo FROM produtos WHERE nome = ? COLLATE NOCASE LIMIT 1", (descricao,))
+                    row = self.cursor.fetchone()
+            if row:
+                return row[0], codigo or row[1] or ''
+        except Exception as e:
+            logger.warning(f"Could not resolve catalog product for item: {e}")
+        return None, codigo
+
+    def substituir_itens(self, ordem_id, itens, catalogo=None):
+        """Replace all items of an order. Does not commit; callers commit with the order write.
+        'catalogo' (from carregar_catalogo) avoids per-item catalog queries in bulk writes.
+        """
+        self.cursor.execute("DELETE FROM ordem_item WHERE ordem_id = ?", (ordem_id,))
+        linhas = []
+        for posicao, item in enumerate(itens):
+            produto_id, codigo = self._resolver_produto(item, catalogo)
+            cor_data = json.dumps(item['cor_data'], ensure_ascii=False) if 'cor_data' in item else None
+            linhas.append((
+                ordem_id, posicao, produto_id, codigo or '', item.get('descricao') or '',
+                int(item.get('quantidade') or 1), float(item.get('valor') or 0),
+                item.get('cor'), cor_data
+            ))
+        self.cursor.executemany(
+            """
+            INSERT INTO ordem_item (ordem_id, posicao, produto_id, codigo, descricao,
+                                    quantidade, valor_unitario, cor, cor_data)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            linhas
+        )
+
+    def listar_itens(self, ordem_ids):
+        """Return {ordem_id: [produto dict, ...]} for the given orders, in insertion order."""
+        ordem_ids = list(ordem_ids)
+        resultado = {ordem_id: [] for ordem_id in ordem_ids}
+        # Chunk to stay below SQLite's bound-parameter limit
+        for inicio in range(0, len(ordem_ids), 500):
+            lote = ordem_ids[inicio:inicio + 500]
+            marcadores = ', '.join('?' for _ in lote)
+            self.cursor.execute(
+                f"""
+                SELECT ordem_id, descricao, codigo, quantidade, valor_unitario, cor, cor_data
+                FROM ordem_item
+                WHERE ordem_id IN ({marcadores})
+                ORDER BY ordem_id, posicao
+                """,
+                lote
+            )
+            for ordem_id, *campos in self.cursor.fetchall():
+                resultado.setdefault(ordem_id, []).append(item_para_produto(*campos))
+        return resultado
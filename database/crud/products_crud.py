@@ -4,11 +4,46 @@ All user-facing messages are in Portuguese. All comments, docstrings, and logs a
 """
 from typing import List, Tuple, Optional
 
+from database.core.busca import expressao_fts
+
 
 class ProductsCRUD:
     def __init__(self, cursor, conn):
         self.cursor = cursor
         self.conn = conn
+        # name -> codigo index for sold-product reports; None means "rebuild on next use"
+        self._indice_codigos = None
+
+    def invalidar_indice_codigos(self) -> None:
+        """Drop the cached name -> codigo index (called on product writes and produtos_atualizados)."""
+        self._indice_codigos = None
+
+    def _carregar_indice_codigos(self) -> dict:
+        """Build the name -> codigo index with one catalog query."""
+        self.cursor.execute("SELECT nome, codigo FROM produtos ORDER BY id")
+        exatos = {}
+        nomes = []
+        for nome, codigo in self.cursor.fetchall():
+            nome_lower = str(nome or '').lower()
+            exatos.setdefault(nome_lower, codigo or '')
+            nomes.append((nome_lower, codigo or ''))
+        return {'exatos': exatos, 'nomes': nomes, 'resolvidos': {}}
+
+    def codigo_por_nome(self, nome: str) -> str:
+        """Return the catalog codigo for a product name: exact (case-insensitive) match first,
+        then the first catalog name containing it. Results are memoized until the index is invalidated.
+        """
+        if self._indice_codigos is None:
+            self._indice_codigos = self._carregar_indice_codigos()
+        indice = self._indice_codigos
+        chave = str(nome or '').lower()
+        if chave in indice['resolvidos']:
+            return indice['resolvidos'][chave]
+        codigo = indice['exatos'].get(chave, '')
+        if not codigo:
+            codigo = next((c for n, c in indice['nomes'] if chave in n), '')
+        indice['resolvidos'][chave] = codigo
+        return codigo
 
     def inserir_produto(self, nome: str, preco: float, descricao: str = "", categoria: str = "", codigo: str = None) -> Optional[int]:
         """Insert a new product."""
@@ -21,6 +56,7 @@ class ProductsCRUD:
                 (nome, codigo, float(preco or 0), descricao, categoria),
             )
             self.conn.commit()
+            self.invalidar_indice_codigos()
             return self.cursor.lastrowid
         except Exception as e:
             print(f"Erro ao inserir produto: {e}")  # User-facing message in Portuguese
@@ -28,19 +64,22 @@ class ProductsCRUD:
             return None
 
     def listar_produtos(self, busca: str = "", limite: int = 200) -> List[Tuple]:
-        """List non-deleted products (deleted_at IS NULL)."""
+        """List non-deleted products (deleted_at IS NULL).
+        With 'busca', matches name, code, category or description through the produtos_fts index
+        (accent-insensitive, by word prefix), best matches first."""
         try:
-            if busca:
+            expressao = expressao_fts(busca)
+            if expressao:
                 self.cursor.execute(
                     """
-                    SELECT id, nome, codigo, preco, descricao, categoria, criado_em
-                    FROM produtos
-                    WHERE (nome LIKE ? OR categoria LIKE ? OR codigo LIKE ?)
-                      AND deleted_at IS NULL
-                    ORDER BY nome ASC
+                    SELECT p.id, p.nome, p.codigo, p.preco, p.descricao, p.categoria, p.criado_em
+                    FROM produtos_fts
+                    JOIN produtos p ON p.id = produtos_fts.rowid
+                    WHERE produtos_fts MATCH ? AND p.deleted_at IS NULL
+                    ORDER BY bm25(produtos_fts, 10.0, 8.0, 3.0, 1.0), p.nome ASC
                     LIMIT ?
                     """,
-                    (f"%{busca}%", f"%{busca}%", f"%{busca}%", limite),
+                    (expressao, limite),
                 )
             else:
                 self.cursor.execute(
@@ -71,6 +110,7 @@ class ProductsCRUD:
                 (nome, codigo, float(preco or 0), descricao, categoria, produto_id),
             )
             self.conn.commit()
+            self.invalidar_indice_codigos()
             return True
         except Exception as e:
             print(f"Erro ao atualizar produto: {e}")  # User-facing message in Portuguese
@@ -82,6 +122,7 @@ class ProductsCRUD:
         try:
             from app.utils.soft_delete import SoftDeleteManager
             success, msg = SoftDeleteManager.soft_delete_produto(produto_id)
+            self.invalidar_indice_codigos()
             if success:
                 print(f"✅ Produto {produto_id} marcado como deletado")  # User-facing message in Portuguese
                 print(f"Product {produto_id} marked as deleted")  # Log in English
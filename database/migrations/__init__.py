@@ -3,5 +3,29 @@ Módulo de migrações de banco de dados
 """
 
 from .add_numero_compras import migrate_add_numero_compras
+from .add_documento_norm import migrate_add_documento_norm
+from .promote_json_fields import migrate_promote_json_fields
+from .add_ordem_item import migrate_add_ordem_item
+from .add_sequencia_os import migrate_add_sequencia_os
+from .add_data_prazo import migrate_add_data_prazo
+from .add_vendas_diarias import migrate_add_vendas_diarias
+from .add_cliente_estatisticas import migrate_add_cliente_estatisticas
+from .add_colunas_legadas import migrate_add_colunas_legadas
+from .add_deleted_at import migrate_add_deleted_at
+from .add_vendas_pagamento import migrate_add_vendas_pagamento
+from .add_busca_fts import migrate_add_busca_fts
+from .add_busca_clientes import migrate_add_busca_clientes
+from .remover_vendas_zeradas import migrate_remover_vendas_zeradas
+from .normalizar_status import migrate_normalizar_status
+from .add_gatilhos_numero_compras import migrate_add_gatilhos_numero_compras
+from .add_busca_clientes_digitos import migrate_add_busca_clientes_digitos
+from .recriar_indice_prazo import migrate_recriar_indice_prazo
+from .runner import executar_migracoes
 
-__all__ = ['migrate_add_numero_compras']
+__all__ = ['migrate_add_numero_compras', 'migrate_add_documento_norm', 'migrate_promote_json_fields', 'migrate_add_ordem_item',
+           'migrate_add_sequencia_os', 'migrate_add_data_prazo',
+           'migrate_add_vendas_diarias', 'migrate_add_cliente_estatisticas',
+           'migrate_add_colunas_legadas', 'migrate_add_deleted_at', 'migrate_add_vendas_pagamento',
+           'migrate_add_busca_fts', 'migrate_add_busca_clientes', 'migrate_remover_vendas_zeradas',
+           'migrate_normalizar_status', 'migrate_add_gatilhos_numero_compras',
+           'migrate_add_busca_clientes_digitos', 'migrate_recriar_indice_prazo', 'executar_migracoes']
@@ -0,0 +1,87 @@
+"""
+Migration that adds the indices behind DatabaseManager.buscar_clientes: expression indices on the
+digits of telefone and cep (CPF/CNPJ digits are already indexed as documento_norm) and a trigram
+FTS5 index on the client name for substring matches ("ilva" finds "João da Silva").
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import sqlite3
+import os
+
+from database.migrations.add_busca_fts import expr_so_digitos, criar_indices_e_gatilhos, recalcular_indices_busca
+
+
+# Normalized (digits-only) expressions; queries must use the same text for the indices to apply
+EXPR_TELEFONE_NORM = expr_so_digitos('telefone')
+EXPR_CEP_NORM = expr_so_digitos('cep')
+
+INDICE_TRIGRAMA = {
+    'clientes_nome_trigrama': ('clientes', [('nome', "{t}.nome")]),
+}
+OPCOES_TRIGRAMA = "content='', tokenize='trigram'"
+
+
+def migrate_add_busca_clientes(db_connection):
+    """
+    Creates the phone/CEP digit indices and the trigram name index (with its triggers), filled once.
+    Args:
+        db_connection: Open SQLite connection (sqlite3.Connection)
+    Returns:
+        bool: True if successful, False if error
+    """
+    if db_connection is None:
+        print("❌ Conexão com banco de dados inválida")  # User-facing message in Portuguese
+        print("Invalid database connection")  # Log in English
+        return False
+
+    try:
+        cursor = db_connection.cursor()
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='clientes_nome_trigrama'")
+        if cursor.fetchone():
+            # Already migrated: the expression indices and triggers follow every write
+            return True
+
+        print("📝 Criando índices de busca de clientes...")  # User-facing message in Portuguese
+        print("Creating client search indices...")  # Log in English
+
+        if not db_connection.in_transaction:
+            cursor.execute("BEGIN")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_cliente_telefone_norm ON clientes({EXPR_TELEFONE_NORM})")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_cliente_cep_norm ON clientes({EXPR_CEP_NORM})")
+        criar_indices_e_gatilhos(cursor, INDICE_TRIGRAMA, OPCOES_TRIGRAMA)
+        linhas = recalcular_indices_busca(cursor, INDICE_TRIGRAMA)
+        db_connection.commit()
+
+        print(f"✅ Índices de busca de clientes criados! ({linhas} clientes)")  # User-facing message in Portuguese
+        print(f"Client search indices migration completed! ({linhas} clients)")  # Log in English
+        return True
+
+    except Exception as e:
+        db_connection.rollback()
+        print(f"❌ Erro na migração: {e}")  # User-facing message in Portuguese
+        print(f"Error in migration: {e}")  # Log in English
+        return False
+
+
+if __name__ == "__main__":
+    # Standalone script for testing (uses default database)
+    import sys
+    base_path = os.path.expanduser("~/Documents")
+    db_dir = os.path.join(base_path, "OrdemServico")
+    db_path = os.path.join(db_dir, "ordem_servico.db")
+
+    if not os.path.exists(db_path):
+        print(f"❌ Banco de dados não encontrado: {db_path}")  # User-facing message in Portuguese
+        print(f"Database not found: {db_path}")  # Log in English
+        sys.exit(1)
+
+    print("🔄 Iniciando migração: índices de busca de clientes")  # User-facing message in Portuguese
+    print("=" * 60)
+    print("Starting migration: client search indices")  # Log in English
+
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate_add_busca_clientes(conn)
+    finally:
+        conn.close()
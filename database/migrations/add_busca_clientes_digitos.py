@@ -0,0 +1,85 @@
+"""
+Migration that completes the digit search of DatabaseManager.buscar_clientes: an expression index on
+the CNPJ digits (documento_norm holds only the CPF when a client has both) and a trigram FTS5 index on
+the phone digits, so a number typed without its area code ("99988-7766") still finds the client.
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import sqlite3
+import os
+
+from database.migrations.add_busca_fts import expr_so_digitos, criar_indices_e_gatilhos, recalcular_indices_busca
+from database.migrations.add_busca_clientes import OPCOES_TRIGRAMA
+
+
+# Normalized (digits-only) expression; queries must use the same text for the index to apply
+EXPR_CNPJ_NORM = expr_so_digitos('cnpj')
+
+INDICE_TELEFONE_TRIGRAMA = {
+    'clientes_telefone_trigrama': ('clientes', [('telefone', expr_so_digitos('{t}.telefone'))]),
+}
+
+
+def migrate_add_busca_clientes_digitos(db_connection):
+    """
+    Creates the CNPJ digit index and the trigram phone-digit index (with its triggers), filled once.
+    Args:
+        db_connection: Open SQLite connection (sqlite3.Connection)
+    Returns:
+        bool: True if successful, False if error
+    """
+    if db_connection is None:
+        print("❌ Conexão com banco de dados inválida")  # User-facing message in Portuguese
+        print("Invalid database connection")  # Log in English
+        return False
+
+    try:
+        cursor = db_connection.cursor()
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='clientes_telefone_trigrama'")
+        if cursor.fetchone():
+            # Already migrated: the expression index and triggers follow every write
+            return True
+
+        print("📝 Criando índices de busca por CNPJ e telefone...")  # User-facing message in Portuguese
+        print("Creating CNPJ and phone digit search indices...")  # Log in English
+
+        if not db_connection.in_transaction:
+            cursor.execute("BEGIN")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_cliente_cnpj_norm ON clientes({EXPR_CNPJ_NORM})")
+        criar_indices_e_gatilhos(cursor, INDICE_TELEFONE_TRIGRAMA, OPCOES_TRIGRAMA)
+        linhas = recalcular_indices_busca(cursor, INDICE_TELEFONE_TRIGRAMA)
+        db_connection.commit()
+
+        print(f"✅ Índices de busca por CNPJ e telefone criados! ({linhas} clientes)")  # User-facing message in Portuguese
+        print(f"CNPJ and phone digit search indices migration completed! ({linhas} clients)")  # Log in English
+        return True
+
+    except Exception as e:
+        db_connection.rollback()
+        print(f"❌ Erro na migração: {e}")  # User-facing message in Portuguese
+        print(f"Error in migration: {e}")  # Log in English
+        return False
+
+
+if __name__ == "__main__":
+    # Standalone script for testing (uses default database)
+    import sys
+    base_path = os.path.expanduser("~/Documents")
+    db_dir = os.path.join(base_path, "OrdemServico")
+    db_path = os.path.join(db_dir, "ordem_servico.db")
+
+    if not os.path.exists(db_path):
+        print(f"❌ Banco de dados não encontrado: {db_path}")  # User-facing message in Portuguese
+        print(f"Database not found: {db_path}")  # Log in English
+        sys.exit(1)
+
+    print("🔄 Iniciando migração: índices de busca por CNPJ e telefone")  # User-facing message in Portuguese
+    print("=" * 60)
+    print("Starting migration: CNPJ and phone digit search indices")  # Log in English
+
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate_add_busca_clientes_digitos(conn)
+    finally:
+        conn.close()
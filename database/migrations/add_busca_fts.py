@@ -0,0 +1,185 @@
+"""
+Migration that creates the FTS5 full-text indices used by the search boxes (clientes_fts, ordens_fts,
+produtos_fts) and the triggers that keep them in step with their tables.
+The indices are contentless (they store only the tokens, not a copy of the rows) and tokenize with
+unicode61 + remove_diacritics, so "Joao" finds "João"; search terms become prefix queries.
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import re
+import sqlite3
+import os
+
+
+TOKENIZADOR = 'unicode61 remove_diacritics 2'
+
+
+def expr_so_digitos(expr):
+    """SQL expression stripping the usual punctuation of phones, CEPs and documents from expr."""
+    for ch in (' ', '.', '-', '/', '(', ')', '+'):
+        expr = f"replace({expr}, '{ch}', '')"
+    return expr
+
+
+def _juntar(*exprs):
+    return " || ' ' || ".join(f"ifnull({e}, '')" for e in exprs)
+
+
+# fts table -> (source table, [(fts column, SQL expression over the row prefix {t})])
+# Digit-only copies of phones/CEPs/documents let "1199988" prefix-match "(11) 99988-7766".
+INDICES = {
+    'clientes_fts': ('clientes', [
+        ('nome', "{t}.nome"),
+        ('documentos', _juntar('{t}.cpf', '{t}.cnpj', '{t}.inscricao_estadual', '{t}.documento_norm')),
+        ('contato', _juntar('{t}.telefone', expr_so_digitos('{t}.telefone'), '{t}.email')),
+        ('endereco', _juntar('{t}.cep', expr_so_digitos('{t}.cep'), '{t}.rua', '{t}.bairro', '{t}.cidade')),
+    ]),
+    'ordens_fts': ('ordem_servico', [
+        ('numero_os', "{t}.numero_os"),
+        ('nome_cliente', "{t}.nome_cliente"),
+        ('documentos', _juntar('{t}.cpf_cliente', '{t}.documento_norm')),
+        ('telefone', _juntar('{t}.telefone_cliente', expr_so_digitos('{t}.telefone_cliente'))),
+    ]),
+    'produtos_fts': ('produtos', [
+        ('nome', "{t}.nome"),
+        ('codigo', "{t}.codigo"),
+        ('categoria', "{t}.categoria"),
+        ('descricao', "{t}.descricao"),
+    ]),
+}
+
+
+def _colunas_origem(colunas):
+    """Source columns read by the index expressions (the triggers fire only when one of them changes)."""
+    origem = []
+    for _, expr in colunas:
+        for coluna in re.findall(r'\{t\}\.(\w+)', expr):
+            if coluna not in origem:
+                origem.append(coluna)
+    return origem
+
+
+def _valores(colunas, linha):
+    return ', '.join(expr.format(t=linha) for _, expr in colunas)
+
+
+def _inserir(fts, colunas, linha):
+    nomes = ', '.join(nome for nome, _ in colunas)
+    return f"INSERT INTO {fts} (rowid, {nomes}) VALUES ({linha}.id, {_valores(colunas, linha)});"
+
+
+def _remover(fts, colunas, linha):
+    # Contentless tables delete through the 'delete' command, with the values that were indexed
+    nomes = ', '.join(nome for nome, _ in colunas)
+    return f"INSERT INTO {fts} ({fts}, rowid, {nomes}) VALUES ('delete', {linha}.id, {_valores(colunas, linha)});"
+
+
+def criar_indices_e_gatilhos(cursor, indices=None, opcoes=None):
+    """Create the FTS5 tables (INDICES by default) and the insert/update/delete triggers on their source tables.
+    opcoes: FTS5 options of the tables (default: contentless, TOKENIZADOR, 2- and 3-character prefix indexes)."""
+    opcoes = opcoes or f"content='', tokenize='{TOKENIZADOR}', prefix='2 3'"
+    for fts, (tabela, colunas) in (indices or INDICES).items():
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {', '.join(nome for nome, _ in colunas)},
+                {opcoes}
+            )
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_insert
+            AFTER INSERT ON {tabela}
+            BEGIN
+                {_inserir(fts, colunas, 'NEW')}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_update
+            AFTER UPDATE OF {', '.join(_colunas_origem(colunas))} ON {tabela}
+            BEGIN
+                {_remover(fts, colunas, 'OLD')}
+                {_inserir(fts, colunas, 'NEW')}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_delete
+            AFTER DELETE ON {tabela}
+            BEGIN
+                {_remover(fts, colunas, 'OLD')}
+            END
+        """)
+
+
+def recalcular_indices_busca(cursor, indices=None):
+    """Rebuild the search indices (INDICES by default) from their tables. Does not commit; returns the rows indexed."""
+    total = 0
+    for fts, (tabela, colunas) in (indices or INDICES).items():
+        cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('delete-all')")
+        nomes = ', '.join(nome for nome, _ in colunas)
+        cursor.execute(f"INSERT INTO {fts} (rowid, {nomes}) SELECT t.id, {_valores(colunas, 't')} FROM {tabela} t")
+        total += cursor.rowcount
+    return total
+
+
+def migrate_add_busca_fts(db_connection):
+    """
+    Creates the full-text search indices, their maintenance triggers, and fills them once.
+    Args:
+        db_connection: Open SQLite connection (sqlite3.Connection)
+    Returns:
+        bool: True if successful, False if error
+    """
+    if db_connection is None:
+        print("❌ Conexão com banco de dados inválida")  # User-facing message in Portuguese
+        print("Invalid database connection")  # Log in English
+        return False
+
+    try:
+        cursor = db_connection.cursor()
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='clientes_fts'")
+        if cursor.fetchone():
+            # Already migrated: triggers maintain the indices on every write
+            return True
+
+        print("📝 Criando índices de busca...")  # User-facing message in Portuguese
+        print("Creating FTS5 search indices...")  # Log in English
+
+        # Tables, triggers and backfill commit together, so a failed backfill is retried on next start
+        if not db_connection.in_transaction:
+            cursor.execute("BEGIN")
+        criar_indices_e_gatilhos(cursor)
+        linhas = recalcular_indices_busca(cursor)
+        db_connection.commit()
+
+        print(f"✅ Índices de busca criados! ({linhas} registros)")  # User-facing message in Portuguese
+        print(f"FTS5 search migration completed! ({linhas} rows)")  # Log in English
+        return True
+
+    except Exception as e:
+        db_connection.rollback()
+        print(f"❌ Erro na migração: {e}")  # User-facing message in Portuguese
+        print(f"Error in migration: {e}")  # Log in English
+        return False
+
+
+if __name__ == "__main__":
+    # Standalone script for testing (uses default database)
+    import sys
+    base_path = os.path.expanduser("~/Documents")
+    db_dir = os.path.join(base_path, "OrdemServico")
+    db_path = os.path.join(db_dir, "ordem_servico.db")
+
+    if not os.path.exists(db_path):
+        print(f"❌ Banco de dados não encontrado: {db_path}")  # User-facing message in Portuguese
+        print(f"Database not found: {db_path}")  # Log in English
+        sys.exit(1)
+
+    print("🔄 Iniciando migração: criar índices de busca")  # User-facing message in Portuguese
+    print("=" * 60)
+    print("Starting migration: create FTS5 search indices")  # Log in English
+
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate_add_busca_fts(conn)
+    finally:
+        conn.close()
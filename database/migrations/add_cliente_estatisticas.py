@@ -0,0 +1,212 @@
+"""
+Migration that creates cliente_estatisticas (one row per client: order count, total spent,
+first/last purchase) and the triggers that keep it in step with ordem_servico.
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import sqlite3
+import os
+
+from database.migrations.add_vendas_diarias import STATUS_CANCELADOS
+
+
+def expr_chave_cliente(prefixo=''):
+    """SQL expression identifying the client of an order: the digits-only document,
+    else the normalized name (orders without CPF/CNPJ)."""
+    return f"COALESCE({prefixo}documento_norm, 'nome:' || lower(trim(ifnull({prefixo}nome_cliente, ''))))"
+
+
+def _expr_ativo(prefixo=''):
+    """SQL condition for an order that counts as a purchase (not deleted, not cancelled)."""
+    return (
+        f"({prefixo}deleted_at IS NULL AND {prefixo}data_criacao IS NOT NULL "
+        f"AND lower(ifnull({prefixo}status, '')) NOT IN ({', '.join(repr(s) for s in STATUS_CANCELADOS)}))"
+    )
+
+
+def _expr_valor(prefixo=''):
+    return f"(ifnull({prefixo}valor_produto, 0) + ifnull({prefixo}frete, 0))"
+
+
+def _somar(linha):
+    """Trigger statement adding the order to its client (creating the client row if needed)."""
+    return f"""
+        INSERT INTO cliente_estatisticas (chave, nome, cpf_cliente, pedidos, total_gasto, primeira_compra, ultima_compra)
+        SELECT {expr_chave_cliente(linha + '.')}, {linha}.nome_cliente, {linha}.cpf_cliente, 1,
+               {_expr_valor(linha + '.')}, {linha}.data_criacao, {linha}.data_criacao
+        WHERE {_expr_ativo(linha + '.')}
+        ON CONFLICT(chave) DO UPDATE SET
+            pedidos = pedidos + 1,
+            total_gasto = total_gasto + excluded.total_gasto,
+            primeira_compra = min(primeira_compra, excluded.primeira_compra),
+            ultima_compra = max(ultima_compra, excluded.ultima_compra),
+            nome = CASE WHEN excluded.ultima_compra >= ultima_compra THEN excluded.nome ELSE nome END,
+            cpf_cliente = CASE WHEN excluded.ultima_compra >= ultima_compra THEN excluded.cpf_cliente ELSE cpf_cliente END;
+    """
+
+
+def _subtrair(linha):
+    """Trigger statements removing the order from its client. First/last purchase are looked up
+    again (through idx_ordem_cliente_chave) only when the removed order was one of them."""
+    chave = expr_chave_cliente(linha + '.')
+    return f"""
+        UPDATE cliente_estatisticas SET
+            pedidos = pedidos - 1,
+            total_gasto = total_gasto - {_expr_valor(linha + '.')}
+        WHERE chave = {chave} AND {_expr_ativo(linha + '.')};
+        DELETE FROM cliente_estatisticas WHERE chave = {chave} AND pedidos <= 0;
+        UPDATE cliente_estatisticas SET
+            primeira_compra = (
+                SELECT min(o.data_criacao) FROM ordem_servico o
+                WHERE {expr_chave_cliente('o.')} = cliente_estatisticas.chave AND {_expr_ativo('o.')}
+            ),
+            ultima_compra = (
+                SELECT max(o.data_criacao) FROM ordem_servico o
+                WHERE {expr_chave_cliente('o.')} = cliente_estatisticas.chave AND {_expr_ativo('o.')}
+            )
+        WHERE chave = {chave} AND {_expr_ativo(linha + '.')}
+          AND {linha}.data_criacao IN (primeira_compra, ultima_compra);
+    """
+
+
+def criar_tabela_e_gatilhos(cursor):
+    """Create the stats table, its indices and the insert/update/delete triggers on ordem_servico."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS cliente_estatisticas (
+            chave TEXT PRIMARY KEY,
+            nome TEXT,
+            cpf_cliente TEXT,
+            pedidos INTEGER NOT NULL DEFAULT 0,
+            total_gasto REAL NOT NULL DEFAULT 0,
+            primeira_compra TEXT,
+            ultima_compra TEXT
+        )
+    """)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_cliente_estatisticas_top "
+        "ON cliente_estatisticas(pedidos DESC, total_gasto DESC)"
+    )
+    # Per-client lookup of active orders, used when first/last purchase must be found again
+    cursor.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_ordem_cliente_chave
+        ON ordem_servico({expr_chave_cliente()}, data_criacao)
+        WHERE deleted_at IS NULL
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_cliente_estatisticas_insert
+        AFTER INSERT ON ordem_servico
+        BEGIN
+            {_somar('NEW')}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_cliente_estatisticas_update
+        AFTER UPDATE OF data_criacao, nome_cliente, cpf_cliente, documento_norm,
+                        valor_produto, frete, status, deleted_at ON ordem_servico
+        BEGIN
+            {_subtrair('OLD')}
+            {_somar('NEW')}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_cliente_estatisticas_delete
+        AFTER DELETE ON ordem_servico
+        BEGIN
+            {_subtrair('OLD')}
+        END
+    """)
+
+
+COLUNAS = ('chave', 'nome', 'cpf_cliente', 'pedidos', 'total_gasto', 'primeira_compra', 'ultima_compra')
+
+
+def sql_recalculo():
+    """SELECT producing the expected rows (in COLUNAS order) straight from ordem_servico."""
+    return f"""
+        SELECT chave, nome_cliente, cpf_cliente, pedidos, total_gasto, primeira_compra, ultima_compra
+        FROM (
+            SELECT {expr_chave_cliente('o.')} as chave, o.nome_cliente, o.cpf_cliente,
+                   COUNT(*) OVER cliente as pedidos,
+                   SUM({_expr_valor('o.')}) OVER cliente as total_gasto,
+                   MIN(o.data_criacao) OVER cliente as primeira_compra,
+                   MAX(o.data_criacao) OVER cliente as ultima_compra,
+                   ROW_NUMBER() OVER (PARTITION BY {expr_chave_cliente('o.')}
+                                      ORDER BY o.data_criacao DESC, o.id DESC) as posicao
+            FROM ordem_servico o
+            WHERE {_expr_ativo('o.')}
+            WINDOW cliente AS (PARTITION BY {expr_chave_cliente('o.')})
+        )
+        WHERE posicao = 1
+    """
+
+
+def recalcular_cliente_estatisticas(cursor):
+    """Rebuild every client row from ordem_servico. Does not commit; returns the number of clients."""
+    cursor.execute("DELETE FROM cliente_estatisticas")
+    cursor.execute(f"INSERT INTO cliente_estatisticas ({', '.join(COLUNAS)}) {sql_recalculo()}")
+    return cursor.rowcount
+
+
+def migrate_add_cliente_estatisticas(db_connection):
+    """
+    Creates the cliente_estatisticas table, its maintenance triggers, and fills it once from ordem_servico.
+    Args:
+        db_connection: Open SQLite connection (sqlite3.Connection)
+    Returns:
+        bool: True if successful, False if error
+    """
+    if db_connection is None:
+        print("❌ Conexão com banco de dados inválida")  # User-facing message in Portuguese
+        print("Invalid database connection")  # Log in English
+        return False
+
+    try:
+        cursor = db_connection.cursor()
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='cliente_estatisticas'")
+        if cursor.fetchone():
+            # Already migrated: triggers maintain the stats on every order write
+            return True
+
+        print("📝 Criando estatísticas por cliente...")  # User-facing message in Portuguese
+        print("Creating cliente_estatisticas table...")  # Log in English
+
+        # Table, triggers and backfill commit together, so a failed backfill is retried on next start
+        if not db_connection.in_transaction:
+            cursor.execute("BEGIN")
+        criar_tabela_e_gatilhos(cursor)
+        clientes = recalcular_cliente_estatisticas(cursor)
+        db_connection.commit()
+
+        print(f"✅ Estatísticas por cliente criadas! ({clientes} clientes)")  # User-facing message in Portuguese
+        print(f"cliente_estatisticas migration completed! ({clientes} clients)")  # Log in English
+        return True
+
+    except Exception as e:
+        db_connection.rollback()
+        print(f"❌ Erro na migração: {e}")  # User-facing message in Portuguese
+        print(f"Error in migration: {e}")  # Log in English
+        return False
+
+
+if __name__ == "__main__":
+    # Standalone script for testing (uses default database)
+    import sys
+    base_path = os.path.expanduser("~/Documents")
+    db_dir = os.path.join(base_path, "OrdemServico")
+    db_path = os.path.join(db_dir, "ordem_servico.db")
+
+    if not os.path.exists(db_path):
+        print(f"❌ Banco de dados não encontrado: {db_path}")  # User-facing message in Portuguese
+        print(f"Database not found: {db_path}")  # Log in English
+        sys.exit(1)
+
+    print("🔄 Iniciando migração: criar cliente_estatisticas")  # User-facing message in Portuguese
+    print("=" * 60)
+    print("Starting migration: create cliente_estatisticas")  # Log in English
+
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate_add_cliente_estatisticas(conn)
+    finally:
+        conn.close()
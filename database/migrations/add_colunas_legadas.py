@@ -0,0 +1,86 @@
+"""
+Migration that adds the columns introduced after the first release (clientes.cnpj,
+inscricao_estadual and cep, ordem_servico.status, produtos.codigo) to older databases,
+plus the indices on them. Replaces the try/except ALTER TABLE statements that ran on every start.
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import sqlite3
+import os
+
+
+# (table, column, definition)
+COLUNAS = [
+    ('clientes', 'cnpj', 'TEXT'),
+    ('clientes', 'inscricao_estadual', 'TEXT'),
+    ('clientes', 'cep', 'TEXT'),
+    ('ordem_servico', 'status', "TEXT DEFAULT 'Em Andamento'"),
+    ('produtos', 'codigo', 'TEXT'),
+]
+
+INDICES = [
+    ('idx_status', 'ordem_servico', 'status'),
+    ('idx_cliente_cnpj', 'clientes', 'cnpj'),
+]
+
+
+def migrate_add_colunas_legadas(db_connection):
+    """
+    Adds any missing column from COLUNAS and creates the indices that depend on them.
+    Args:
+        db_connection: Open SQLite connection (sqlite3.Connection)
+    Returns:
+        bool: True if successful, False if error
+    """
+    if db_connection is None:
+        print("❌ Conexão com banco de dados inválida")  # User-facing message in Portuguese
+        print("Invalid database connection")  # Log in English
+        return False
+
+    try:
+        cursor = db_connection.cursor()
+        existentes = {}
+        for tabela in {t for t, _, _ in COLUNAS}:
+            cursor.execute(f"PRAGMA table_info({tabela})")
+            existentes[tabela] = {col[1] for col in cursor.fetchall()}
+
+        if not db_connection.in_transaction:
+            cursor.execute("BEGIN")
+        for tabela, coluna, definicao in COLUNAS:
+            if coluna not in existentes[tabela]:
+                print(f"📝 Adicionando coluna {tabela}.{coluna}...")  # User-facing message in Portuguese
+                print(f"Adding column {tabela}.{coluna}...")  # Log in English
+                cursor.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {definicao}")
+        for nome, tabela, coluna in INDICES:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {nome} ON {tabela}({coluna})")
+        db_connection.commit()
+        return True
+
+    except Exception as e:
+        db_connection.rollback()
+        print(f"❌ Erro na migração: {e}")  # User-facing message in Portuguese
+        print(f"Error in migration: {e}")  # Log in English
+        return False
+
+
+if __name__ == "__main__":
+    # Standalone script for testing (uses default database)
+    import sys
+    base_path = os.path.expanduser("~/Documents")
+    db_dir = os.path.join(base_path, "OrdemServico")
+    db_path = os.path.join(db_dir, "ordem_servico.db")
+
+    if not os.path.exists(db_path):
+        print(f"❌ Banco de dados não encontrado: {db_path}")  # User-facing message in Portuguese
+        print(f"Database not found: {db_path}")  # Log in English
+        sys.exit(1)
+
+    print("🔄 Iniciando migração: colunas legadas")  # User-facing message in Portuguese
+    print("=" * 60)
+    print("Starting migration: legacy columns")  # Log in English
+
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate_add_colunas_legadas(conn)
+    finally:
+        conn.close()
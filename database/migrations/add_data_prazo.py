@@ -0,0 +1,141 @@
+"""
+Migration that adds ordem_servico.data_prazo, the ISO delivery deadline of each order
+(explicit dados_json data_entrega, else data_criacao + prazo days), kept up to date by triggers.
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import sqlite3
+import os
+
+
+def expr_concluido(prefixo=''):
+    """SQL expression that is 1 for orders in a final status (they go after the active ones) and 0 otherwise,
+    never NULL: orders without a status are active, and a NULL would break the keyset comparison."""
+    status = f"lower(ifnull({prefixo}status, ''))"
+    return f"({status} = 'entregue' OR instr({status}, 'conclu') > 0)"
+
+
+def expr_prazo_ordem(prefixo=''):
+    """SQL sort key for the deadline; orders without one go last."""
+    return f"ifnull({prefixo}data_prazo, '9999-12-31')"
+
+
+def criar_indice_prazo(cursor):
+    """Create idx_ordem_prazo, the index behind the "active first, nearest deadline first" listing."""
+    cursor.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_ordem_prazo
+        ON ordem_servico({expr_concluido()}, {expr_prazo_ordem()}, id)
+        WHERE deleted_at IS NULL
+    """)
+
+
+def _expr_data_prazo(prefixo=''):
+    """SQL expression computing data_prazo from the row columns ('NEW.' inside triggers)."""
+    entrega = (
+        f"(CASE WHEN json_valid({prefixo}dados_json) "
+        f"THEN json_extract({prefixo}dados_json, '$.data_entrega') END)"
+    )
+    return f"""
+        COALESCE(
+            CASE
+                WHEN {entrega} GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*'
+                    THEN date(substr({entrega}, 1, 10))
+                WHEN {entrega} GLOB '[0-9][0-9]/[0-9][0-9]/[0-9][0-9][0-9][0-9]*'
+                    THEN date(substr({entrega}, 7, 4) || '-' || substr({entrega}, 4, 2) || '-' || substr({entrega}, 1, 2))
+            END,
+            CASE WHEN {prefixo}prazo > 0
+                THEN date({prefixo}data_criacao, '+' || {prefixo}prazo || ' days')
+            END
+        )
+    """
+
+
+def _criar_gatilhos(cursor):
+    """Create the triggers that recompute data_prazo whenever its source columns change."""
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_ordem_data_prazo_insert
+        AFTER INSERT ON ordem_servico
+        BEGIN
+            UPDATE ordem_servico SET data_prazo = {_expr_data_prazo('NEW.')} WHERE id = NEW.id;
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_ordem_data_prazo_update
+        AFTER UPDATE OF data_criacao, prazo, dados_json ON ordem_servico
+        BEGIN
+            UPDATE ordem_servico SET data_prazo = {_expr_data_prazo('NEW.')} WHERE id = NEW.id;
+        END
+    """)
+
+
+def migrate_add_data_prazo(db_connection):
+    """
+    Adds the data_prazo column, backfills it once, creates the triggers that maintain it
+    and the index behind the "active first, nearest deadline first" ordering.
+    Args:
+        db_connection: Open SQLite connection (sqlite3.Connection)
+    Returns:
+        bool: True if successful, False if error
+    """
+    if db_connection is None:
+        print("❌ Conexão com banco de dados inválida")  # User-facing message in Portuguese
+        print("Invalid database connection")  # Log in English
+        return False
+
+    try:
+        cursor = db_connection.cursor()
+
+        cursor.execute("PRAGMA table_info(ordem_servico)")
+        ordem_columns = [col[1] for col in cursor.fetchall()]
+        if 'data_prazo' in ordem_columns:
+            # Already migrated: triggers keep the column up to date
+            return True
+
+        print("📝 Adicionando coluna de prazo de entrega...")  # User-facing message in Portuguese
+        print("Adding data_prazo column...")  # Log in English
+
+        # Column creation and backfill commit together, so a failed backfill is retried on next start
+        if not db_connection.in_transaction:
+            cursor.execute("BEGIN")
+        cursor.execute("ALTER TABLE ordem_servico ADD COLUMN data_prazo TEXT")
+        cursor.execute(f"UPDATE ordem_servico SET data_prazo = {_expr_data_prazo()}")
+        _criar_gatilhos(cursor)
+        criar_indice_prazo(cursor)
+        # Without statistics the planner prefers the deleted_at index and sorts every row
+        cursor.execute("ANALYZE ordem_servico")
+        db_connection.commit()
+
+        cursor.execute("SELECT COUNT(*) FROM ordem_servico WHERE data_prazo IS NOT NULL")
+        total = cursor.fetchone()[0]
+        print(f"✅ Migração de prazo concluída! ({total} pedidos com prazo)")  # User-facing message in Portuguese
+        print(f"data_prazo migration completed! ({total} orders with a deadline)")  # Log in English
+        return True
+
+    except Exception as e:
+        db_connection.rollback()
+        print(f"❌ Erro na migração: {e}")  # User-facing message in Portuguese
+        print(f"Error in migration: {e}")  # Log in English
+        return False
+
+
+if __name__ == "__main__":
+    # Standalone script for testing (uses default database)
+    import sys
+    base_path = os.path.expanduser("~/Documents")
+    db_dir = os.path.join(base_path, "OrdemServico")
+    db_path = os.path.join(db_dir, "ordem_servico.db")
+
+    if not os.path.exists(db_path):
+        print(f"❌ Banco de dados não encontrado: {db_path}")  # User-facing message in Portuguese
+        print(f"Database not found: {db_path}")  # Log in English
+        sys.exit(1)
+
+    print("🔄 Iniciando migração: adicionar data_prazo")  # User-facing message in Portuguese
+    print("=" * 60)
+    print("Starting migration: add data_prazo")  # Log in English
+
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate_add_data_prazo(conn)
+    finally:
+        conn.close()
@@ -0,0 +1,68 @@
+"""
+Migration that adds the soft-delete column (deleted_at) and its index to the main tables.
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import sqlite3
+import os
+
+
+TABELAS = ['ordem_servico', 'clientes', 'produtos', 'gastos']
+
+
+def migrate_add_deleted_at(db_connection):
+    """
+    Adds deleted_at to every table in TABELAS that lacks it, plus an idx_<table>_deleted index.
+    Runs on the given connection (no second connection to the database file).
+    Args:
+        db_connection: Open SQLite connection (sqlite3.Connection)
+    Returns:
+        bool: True if successful, False if error
+    """
+    if db_connection is None:
+        print("❌ Conexão com banco de dados inválida")  # User-facing message in Portuguese
+        print("Invalid database connection")  # Log in English
+        return False
+
+    try:
+        cursor = db_connection.cursor()
+        if not db_connection.in_transaction:
+            cursor.execute("BEGIN")
+        for tabela in TABELAS:
+            cursor.execute(f"PRAGMA table_info({tabela})")
+            if 'deleted_at' not in [col[1] for col in cursor.fetchall()]:
+                cursor.execute(f"ALTER TABLE {tabela} ADD COLUMN deleted_at TEXT")
+                print(f"✅ Coluna deleted_at adicionada em {tabela}")  # User-facing message in Portuguese
+                print(f"deleted_at column added to {tabela}")  # Log in English
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{tabela}_deleted ON {tabela}(deleted_at)")
+        db_connection.commit()
+        return True
+
+    except Exception as e:
+        db_connection.rollback()
+        print(f"❌ Erro na migração: {e}")  # User-facing message in Portuguese
+        print(f"Error in migration: {e}")  # Log in English
+        return False
+
+
+if __name__ == "__main__":
+    # Standalone script for testing (uses default database)
+    import sys
+    base_path = os.path.expanduser("~/Documents")
+    db_dir = os.path.join(base_path, "OrdemServico")
+    db_path = os.path.join(db_dir, "ordem_servico.db")
+
+    if not os.path.exists(db_path):
+        print(f"❌ Banco de dados não encontrado: {db_path}")  # User-facing message in Portuguese
+        print(f"Database not found: {db_path}")  # Log in English
+        sys.exit(1)
+
+    print("🔄 Iniciando migração: adicionar deleted_at")  # User-facing message in Portuguese
+    print("=" * 60)
+    print("Starting migration: add deleted_at")  # Log in English
+
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate_add_deleted_at(conn)
+    finally:
+        conn.close()
@@ -0,0 +1,107 @@
+"""
+Migration to add the documento_norm field (digits-only CPF/CNPJ) to clientes and ordem_servico.
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import sqlite3
+import os
+
+from database.core.documento import normalize_documento, documento_cliente
+
+
+def _criar_indices(cursor):
+    """Create the documento_norm indices. Falls back to a plain index if legacy clients share a document."""
+    try:
+        cursor.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_cliente_documento_norm "
+            "ON clientes(documento_norm) WHERE documento_norm IS NOT NULL"
+        )
+    except sqlite3.IntegrityError as e:
+        print("⚠️ Clientes com documento duplicado; índice de documento criado sem unicidade")  # User-facing message in Portuguese
+        print(f"Duplicate client documents, creating non-unique documento_norm index: {e}")  # Log in English
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_cliente_documento_norm_dup ON clientes(documento_norm)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ordem_documento_norm ON ordem_servico(documento_norm)")
+
+
+def migrate_add_documento_norm(db_connection):
+    """
+    Adds the documento_norm column to clientes and ordem_servico, backfills it once
+    from cpf/cnpj and cpf_cliente, and creates the lookup indices.
+    Args:
+        db_connection: Open SQLite connection (sqlite3.Connection)
+    Returns:
+        bool: True if successful, False if error
+    """
+    if db_connection is None:
+        print("❌ Conexão com banco de dados inválida")  # User-facing message in Portuguese
+        print("Invalid database connection")  # Log in English
+        return False
+
+    try:
+        cursor = db_connection.cursor()
+
+        cursor.execute("PRAGMA table_info(clientes)")
+        clientes_columns = [col[1] for col in cursor.fetchall()]
+        cursor.execute("PRAGMA table_info(ordem_servico)")
+        ordem_columns = [col[1] for col in cursor.fetchall()]
+
+        if 'documento_norm' in clientes_columns and 'documento_norm' in ordem_columns:
+            # Already migrated: values are maintained on every insert/update
+            return True
+
+        print("📝 Adicionando coluna documento_norm...")  # User-facing message in Portuguese
+        print("Adding documento_norm column...")  # Log in English
+
+        # Column creation and backfill commit together, so a failed backfill is retried on next start
+        if not db_connection.in_transaction:
+            cursor.execute("BEGIN")
+        if 'documento_norm' not in clientes_columns:
+            cursor.execute("ALTER TABLE clientes ADD COLUMN documento_norm TEXT")
+        if 'documento_norm' not in ordem_columns:
+            cursor.execute("ALTER TABLE ordem_servico ADD COLUMN documento_norm TEXT")
+
+        # Backfill clients (CPF first, then CNPJ)
+        cursor.execute("SELECT id, cpf, cnpj FROM clientes")
+        clientes = [(documento_cliente(cpf, cnpj), id_) for id_, cpf, cnpj in cursor.fetchall()]
+        cursor.executemany("UPDATE clientes SET documento_norm = ? WHERE id = ?", clientes)
+
+        # Backfill orders
+        cursor.execute("SELECT id, cpf_cliente FROM ordem_servico")
+        ordens = [(normalize_documento(cpf), id_) for id_, cpf in cursor.fetchall()]
+        cursor.executemany("UPDATE ordem_servico SET documento_norm = ? WHERE id = ?", ordens)
+
+        _criar_indices(cursor)
+        db_connection.commit()
+
+        print(f"✅ Migração documento_norm concluída! ({len(clientes)} clientes, {len(ordens)} pedidos)")  # User-facing message in Portuguese
+        print(f"documento_norm migration completed! ({len(clientes)} clients, {len(ordens)} orders)")  # Log in English
+        return True
+
+    except Exception as e:
+        db_connection.rollback()
+        print(f"❌ Erro na migração: {e}")  # User-facing message in Portuguese
+        print(f"Error in migration: {e}")  # Log in English
+        return False
+
+
+if __name__ == "__main__":
+    # Standalone script for testing (uses default database)
+    import sys
+    base_path = os.path.expanduser("~/Documents")
+    db_dir = os.path.join(base_path, "OrdemServico")
+    db_path = os.path.join(db_dir, "ordem_servico.db")
+
+    if not os.path.exists(db_path):
+        print(f"❌ Banco de dados não encontrado: {db_path}")  # User-facing message in Portuguese
+        print(f"Database not found: {db_path}")  # Log in English
+        sys.exit(1)
+
+    print("🔄 Iniciando migração: adicionar documento_norm")  # User-facing message in Portuguese
+    print("=" * 60)
+    print("Starting migration: add documento_norm")  # Log in English
+
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate_add_documento_norm(conn)
+    finally:
+        conn.close()
@@ -0,0 +1,154 @@
+"""
+Migration that moves the clientes.numero_compras upkeep into triggers (create, soft delete, restore,
+hard delete and document change of an order, plus clients registered after their orders) and
+recounts every client once.
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import sqlite3
+import os
+
+
+def _expr_conta(linha):
+    """SQL condition for an order that counts as a purchase of the client with its document."""
+    return f"({linha}.deleted_at IS NULL AND {linha}.documento_norm IS NOT NULL)"
+
+
+def _ajustar(linha, delta):
+    """Trigger statement adding delta to the counter of the order's client (when the order counts)."""
+    return f"""
+        UPDATE clientes SET numero_compras = ifnull(numero_compras, 0) + ({delta})
+        WHERE documento_norm = {linha}.documento_norm AND {_expr_conta(linha)};
+    """
+
+
+def _recontar_cliente(linha):
+    """Trigger statement recounting a single client (through idx_ordem_documento_norm)."""
+    return f"""
+        UPDATE clientes SET numero_compras = (
+            SELECT COUNT(*) FROM ordem_servico o
+            WHERE o.documento_norm = {linha}.documento_norm AND o.deleted_at IS NULL
+        )
+        WHERE id = {linha}.id;
+    """
+
+
+def criar_gatilhos(cursor):
+    """Create the triggers on ordem_servico and clientes that keep numero_compras up to date."""
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_numero_compras_insert
+        AFTER INSERT ON ordem_servico
+        BEGIN
+            {_ajustar('NEW', 1)}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_numero_compras_update
+        AFTER UPDATE OF documento_norm, deleted_at ON ordem_servico
+        WHEN OLD.documento_norm IS NOT NEW.documento_norm
+          OR (OLD.deleted_at IS NULL) != (NEW.deleted_at IS NULL)
+        BEGIN
+            {_ajustar('OLD', -1)}
+            {_ajustar('NEW', 1)}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_numero_compras_delete
+        AFTER DELETE ON ordem_servico
+        BEGIN
+            {_ajustar('OLD', -1)}
+        END
+    """)
+    # A client registered (or given a document) after placing orders starts from their real count
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_numero_compras_cliente_insert
+        AFTER INSERT ON clientes
+        WHEN NEW.documento_norm IS NOT NULL
+        BEGIN
+            {_recontar_cliente('NEW')}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_numero_compras_cliente_update
+        AFTER UPDATE OF documento_norm ON clientes
+        WHEN OLD.documento_norm IS NOT NEW.documento_norm
+        BEGIN
+            {_recontar_cliente('NEW')}
+        END
+    """)
+
+
+def recalcular_numero_compras(cursor):
+    """Recount every client from ordem_servico. Does not commit; returns the number of clients updated."""
+    cursor.execute("""
+        UPDATE clientes SET numero_compras = (
+            SELECT COUNT(*) FROM ordem_servico o
+            WHERE o.documento_norm = clientes.documento_norm AND o.deleted_at IS NULL
+        )
+    """)
+    return cursor.rowcount
+
+
+def migrate_add_gatilhos_numero_compras(db_connection):
+    """
+    Creates the numero_compras triggers and recounts every client once.
+    Args:
+        db_connection: Open SQLite connection (sqlite3.Connection)
+    Returns:
+        bool: True if successful, False if error
+    """
+    if db_connection is None:
+        print("❌ Conexão com banco de dados inválida")  # User-facing message in Portuguese
+        print("Invalid database connection")  # Log in English
+        return False
+
+    try:
+        cursor = db_connection.cursor()
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='trigger' AND name='trg_numero_compras_insert'")
+        if cursor.fetchone():
+            # Already migrated: triggers maintain the counter on every order write
+            return True
+
+        print("📝 Criando gatilhos do número de compras...")  # User-facing message in Portuguese
+        print("Creating numero_compras triggers...")  # Log in English
+
+        # Triggers and recount commit together, so no write lands between them uncounted
+        if not db_connection.in_transaction:
+            cursor.execute("BEGIN")
+        criar_gatilhos(cursor)
+        clientes = recalcular_numero_compras(cursor)
+        db_connection.commit()
+
+        print(f"✅ Gatilhos do número de compras criados! ({clientes} clientes)")  # User-facing message in Portuguese
+        print(f"numero_compras triggers migration completed! ({clientes} clients)")  # Log in English
+        return True
+
+    except Exception as e:
+        db_connection.rollback()
+        print(f"❌ Erro na migração: {e}")  # User-facing message in Portuguese
+        print(f"Error in migration: {e}")  # Log in English
+        return False
+
+
+if __name__ == "__main__":
+    # Standalone script for testing (uses default database)
+    import sys
+    base_path = os.path.expanduser("~/Documents")
+    db_dir = os.path.join(base_path, "OrdemServico")
+    db_path = os.path.join(db_dir, "ordem_servico.db")
+
+    if not os.path.exists(db_path):
+        print(f"❌ Banco de dados não encontrado: {db_path}")  # User-facing message in Portuguese
+        print(f"Database not found: {db_path}")  # Log in English
+        sys.exit(1)
+
+    print("🔄 Iniciando migração: gatilhos do número de compras")  # User-facing message in Portuguese
+    print("=" * 60)
+    print("Starting migration: numero_compras triggers")  # Log in English
+
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate_add_gatilhos_numero_compras(conn)
+    finally:
+        conn.close()
@@ -5,13 +5,19 @@ All user-facing messages are in Portuguese. All comments, docstrings, and logs a
 
 import sqlite3
 import os
-from datetime import datetime, timedelta
+
+from database.migrations.schema_version import migracao_aplicada, registrar_migracao
+
+
+MIGRACAO = 'add_numero_compras'
 
 
 def migrate_add_numero_compras(db_connection):
     """
     Adds the numero_compras column to the clientes table and calculates the initial value
-    based on existing orders.
+    based on existing orders. Runs once per database (recorded in schema_version); afterwards
+    the counter is kept up to date by the triggers from add_gatilhos_numero_compras, and drift
+    is fixed on demand by database/services/verificar_contadores.py.
     Args:
         db_connection: Open SQLite connection (sqlite3.Connection)
     Returns:
@@ -24,6 +30,13 @@ def migrate_add_numero_compras(db_connection):
     
     try:
         cursor = db_connection.cursor()
+
+        if migracao_aplicada(cursor, MIGRACAO):
+            return True
+
+        # Lookups below rely on the documento_norm column
+        from database.migrations.add_documento_norm import migrate_add_documento_norm
+        migrate_add_documento_norm(db_connection)
         
         # Check if column already exists
         cursor.execute("PRAGMA table_info(clientes)")
@@ -35,6 +48,7 @@ def migrate_add_numero_compras(db_connection):
             print("Adding numero_compras column...")  # Log in English
             cursor.execute("ALTER TABLE clientes ADD COLUMN numero_compras INTEGER DEFAULT 0")
         else:
+            # Databases from before schema_version: recompute once more with the current rule
             print("ℹ️ Coluna numero_compras já existe, recalculando valores...")  # User-facing message in Portuguese
             print("numero_compras column already exists, recalculating values...")  # Log in English
         
@@ -52,65 +66,23 @@ def migrate_add_numero_compras(db_connection):
         ordem_columns = [col[1] for col in cursor.fetchall()]
         has_deleted_at = 'deleted_at' in ordem_columns
         
-        # Consider only orders from the last year, not canceled or deleted
-        hoje = datetime.now()
-        um_ano_atras = (hoje - timedelta(days=365)).strftime('%Y-%m-%d %H:%M:%S')
-        hoje_str = hoje.strftime('%Y-%m-%d %H:%M:%S')
-        
-        # Detect valid date column
-        data_col = None
-        for candidate in ['data_criacao', 'data_emissao', 'created_at', 'data']:
-            if candidate in ordem_columns:
-                data_col = candidate
-                break
-        if not data_col:
-            raise Exception('Nenhuma coluna de data encontrada em ordem_servico')
-        
-        # Only filter by status if column exists
-        has_status = 'status' in ordem_columns
-        if has_deleted_at and has_status:
-            deleted_filter = "AND ordem_servico.deleted_at IS NULL AND (ordem_servico.status IS NULL OR ordem_servico.status NOT IN ('cancelado', 'cancelada'))"
-        elif has_deleted_at:
-            deleted_filter = "AND ordem_servico.deleted_at IS NULL"
-        elif has_status:
-            deleted_filter = "AND (ordem_servico.status IS NULL OR ordem_servico.status NOT IN ('cancelado', 'cancelada'))"
-        else:
-            deleted_filter = ""
-
-        # Update based on CPF (normalized - no punctuation)
-        cursor.execute(f"""
-            UPDATE clientes 
-            SET numero_compras = (
-                SELECT COUNT(*) 
-                FROM ordem_servico 
-                WHERE replace(replace(replace(ordem_servico.cpf_cliente, '.', ''), '-', ''), ' ', '') = 
-                      replace(replace(replace(clientes.cpf, '.', ''), '-', ''), ' ', '')
-                  AND clientes.cpf IS NOT NULL
-                  AND clientes.cpf != ''
-                  AND ordem_servico.{data_col} >= ? AND ordem_servico.{data_col} <= ?
-                  {deleted_filter}
-            )
-            WHERE clientes.cpf IS NOT NULL AND clientes.cpf != ''
-        """, (um_ano_atras, hoje_str))
+        # Count every non-deleted order, the same rule the numero_compras triggers follow and
+        # verificar_contadores uses to repair it (a rolling window could not be kept incrementally)
+        deleted_filter = "AND ordem_servico.deleted_at IS NULL" if has_deleted_at else ""
 
-        # Update based on CNPJ (normalized - no punctuation)
+        # Update based on the indexed digits-only document (CPF or CNPJ)
         cursor.execute(f"""
             UPDATE clientes 
             SET numero_compras = (
                 SELECT COUNT(*) 
                 FROM ordem_servico 
-                WHERE replace(replace(replace(replace(ordem_servico.cpf_cliente, '.', ''), '/', ''), '-', ''), ' ', '') = 
-                      replace(replace(replace(replace(clientes.cnpj, '.', ''), '/', ''), '-', ''), ' ', '')
-                  AND clientes.cnpj IS NOT NULL
-                  AND clientes.cnpj != ''
-                  AND ordem_servico.{data_col} >= ? AND ordem_servico.{data_col} <= ?
+                WHERE ordem_servico.documento_norm = clientes.documento_norm
                   {deleted_filter}
             )
-            WHERE clientes.cnpj IS NOT NULL 
-              AND clientes.cnpj != ''
-              AND numero_compras = 0
-        """, (um_ano_atras, hoje_str))
+            WHERE clientes.documento_norm IS NOT NULL
+        """)
         
+        registrar_migracao(cursor, MIGRACAO)
         db_connection.commit()
         
         # Show statistics
@@ -0,0 +1,119 @@
+"""
+Migration that moves order products out of ordem_servico.dados_json / detalhes_produto text
+into the normalized ordem_item table (one row per product line).
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import sqlite3
+import os
+import json
+
+from database.crud.order_items import OrderItemsCRUD, montar_itens
+
+
+def _criar_tabela(cursor):
+    """Create the ordem_item table and its indices."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ordem_item (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ordem_id INTEGER NOT NULL REFERENCES ordem_servico(id) ON DELETE CASCADE,
+            posicao INTEGER NOT NULL DEFAULT 0,
+            produto_id INTEGER,
+            codigo TEXT,
+            descricao TEXT NOT NULL,
+            quantidade INTEGER NOT NULL DEFAULT 1,
+            valor_unitario REAL NOT NULL DEFAULT 0,
+            cor TEXT,
+            cor_data TEXT
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ordem_item_ordem ON ordem_item(ordem_id, posicao)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ordem_item_produto ON ordem_item(produto_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ordem_item_codigo ON ordem_item(codigo, descricao)")
+
+
+def migrate_add_ordem_item(db_connection):
+    """
+    Creates the ordem_item table and backfills it once from dados_json['produtos']
+    (or the detalhes_produto text for legacy orders). The 'produtos' key is removed from the JSON blob.
+    Args:
+        db_connection: Open SQLite connection (sqlite3.Connection)
+    Returns:
+        bool: True if successful, False if error
+    """
+    if db_connection is None:
+        print("❌ Conexão com banco de dados inválida")  # User-facing message in Portuguese
+        print("Invalid database connection")  # Log in English
+        return False
+
+    try:
+        cursor = db_connection.cursor()
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='ordem_item'")
+        if cursor.fetchone():
+            # Already migrated: items are written together with every order
+            return True
+
+        print("📝 Criando tabela de itens do pedido...")  # User-facing message in Portuguese
+        print("Creating ordem_item table...")  # Log in English
+
+        # Table creation and backfill commit together, so a failed backfill is retried on next start
+        if not db_connection.in_transaction:
+            cursor.execute("BEGIN")
+        _criar_tabela(cursor)
+
+        itens_crud = OrderItemsCRUD(cursor, db_connection)
+        catalogo = itens_crud.carregar_catalogo()
+
+        cursor.execute("SELECT id, detalhes_produto, dados_json FROM ordem_servico")
+        ordens = cursor.fetchall()
+        atualizacoes = []
+        total_itens = 0
+        for id_, detalhes, dados_json in ordens:
+            dados = {}
+            if dados_json:
+                try:
+                    dados = json.loads(dados_json) or {}
+                except Exception:
+                    dados = {}
+            itens = montar_itens({'produtos': dados.get('produtos'), 'detalhes_produto': detalhes})
+            itens_crud.substituir_itens(id_, itens, catalogo)
+            total_itens += len(itens)
+            if 'produtos' in dados:
+                dados.pop('produtos', None)
+                atualizacoes.append((json.dumps(dados, ensure_ascii=False), id_))
+        cursor.executemany("UPDATE ordem_servico SET dados_json = ? WHERE id = ?", atualizacoes)
+        db_connection.commit()
+
+        print(f"✅ Migração de itens concluída! ({len(ordens)} pedidos, {total_itens} itens)")  # User-facing message in Portuguese
+        print(f"Order items migration completed! ({len(ordens)} orders, {total_itens} items)")  # Log in English
+        return True
+
+    except Exception as e:
+        db_connection.rollback()
+        print(f"❌ Erro na migração: {e}")  # User-facing message in Portuguese
+        print(f"Error in migration: {e}")  # Log in English
+        return False
+
+
+if __name__ == "__main__":
+    # Standalone script for testing (uses default database)
+    import sys
+    base_path = os.path.expanduser("~/Documents")
+    db_dir = os.path.join(base_path, "OrdemServico")
+    db_path = os.path.join(db_dir, "ordem_servico.db")
+
+    if not os.path.exists(db_path):
+        print(f"❌ Banco de dados não encontrado: {db_path}")  # User-facing message in Portuguese
+        print(f"Database not found: {db_path}")  # Log in English
+        sys.exit(1)
+
+    print("🔄 Iniciando migração: criar tabela ordem_item")  # User-facing message in Portuguese
+    print("=" * 60)
+    print("Starting migration: create ordem_item table")  # Log in English
+
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate_add_ordem_item(conn)
+    finally:
+        conn.close()
@@ -0,0 +1,86 @@
+"""
+Migration that creates the OS-number sequence (sequencia) and the reservation table
+used to hand out numero_os atomically instead of scanning MAX(numero_os).
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import sqlite3
+import os
+
+
+def migrate_add_sequencia_os(db_connection):
+    """
+    Creates the sequencia and numero_os_reserva tables and seeds the 'numero_os'
+    sequence once from the highest existing order number.
+    Args:
+        db_connection: Open SQLite connection (sqlite3.Connection)
+    Returns:
+        bool: True if successful, False if error
+    """
+    if db_connection is None:
+        print("❌ Conexão com banco de dados inválida")  # User-facing message in Portuguese
+        print("Invalid database connection")  # Log in English
+        return False
+
+    try:
+        cursor = db_connection.cursor()
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='sequencia'")
+        if cursor.fetchone():
+            # Already migrated: the sequence is advanced by every allocation
+            return True
+
+        print("📝 Criando sequência de números de OS...")  # User-facing message in Portuguese
+        print("Creating OS number sequence...")  # Log in English
+
+        if not db_connection.in_transaction:
+            cursor.execute("BEGIN")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sequencia (
+                nome TEXT PRIMARY KEY,
+                valor INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS numero_os_reserva (
+                numero INTEGER PRIMARY KEY,
+                reservado_em TEXT NOT NULL
+            )
+        """)
+        cursor.execute("SELECT COALESCE(MAX(numero_os), 0) FROM ordem_servico")
+        ultimo = int(cursor.fetchone()[0] or 0)
+        cursor.execute("INSERT OR IGNORE INTO sequencia (nome, valor) VALUES ('numero_os', ?)", (ultimo,))
+        db_connection.commit()
+
+        print(f"✅ Sequência de OS criada! (último número: {ultimo})")  # User-facing message in Portuguese
+        print(f"OS number sequence created! (last number: {ultimo})")  # Log in English
+        return True
+
+    except Exception as e:
+        db_connection.rollback()
+        print(f"❌ Erro na migração: {e}")  # User-facing message in Portuguese
+        print(f"Error in migration: {e}")  # Log in English
+        return False
+
+
+if __name__ == "__main__":
+    # Standalone script for testing (uses default database)
+    import sys
+    base_path = os.path.expanduser("~/Documents")
+    db_dir = os.path.join(base_path, "OrdemServico")
+    db_path = os.path.join(db_dir, "ordem_servico.db")
+
+    if not os.path.exists(db_path):
+        print(f"❌ Banco de dados não encontrado: {db_path}")  # User-facing message in Portuguese
+        print(f"Database not found: {db_path}")  # Log in English
+        sys.exit(1)
+
+    print("🔄 Iniciando migração: criar sequência de números de OS")  # User-facing message in Portuguese
+    print("=" * 60)
+    print("Starting migration: create OS number sequence")  # Log in English
+
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate_add_sequencia_os(conn)
+    finally:
+        conn.close()
@@ -0,0 +1,186 @@
+"""
+Migration that creates the vendas_diarias rollup (one row per day of order creation) and the
+triggers that keep it in step with ordem_servico inside the same transaction as every order write.
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import sqlite3
+import os
+
+
+# Status values counted as cancelled (compared case-insensitively)
+STATUS_CANCELADOS = ('cancelado', 'cancelada')
+
+
+def contribuicao(linha):
+    """SQL expressions for what one order row ('NEW' or 'OLD') adds to its day.
+    Soft-deleted orders add nothing; cancelled orders only count in 'cancelados'.
+    """
+    cancelado = f"(lower(ifnull({linha}.status, '')) IN ({', '.join(repr(s) for s in STATUS_CANCELADOS)}))"
+    return {
+        'data': f"substr({linha}.data_criacao, 1, 10)",
+        'quantidade': f"(CASE WHEN {cancelado} THEN 0 ELSE 1 END)",
+        'valor_produto': f"(CASE WHEN {cancelado} THEN 0 ELSE ifnull({linha}.valor_produto, 0) END)",
+        'frete': f"(CASE WHEN {cancelado} THEN 0 ELSE ifnull({linha}.frete, 0) END)",
+        'entradas': f"(CASE WHEN {cancelado} THEN 0 ELSE ifnull({linha}.valor_entrada, 0) END)",
+        'cancelados': f"(CASE WHEN {cancelado} THEN 1 ELSE 0 END)",
+    }
+
+
+COLUNAS_VALORES = ('quantidade', 'valor_produto', 'frete', 'entradas', 'cancelados')
+
+# Rollup rows left with no orders (sql_recalculo() has no row for them)
+SEM_PEDIDOS = "quantidade = 0 AND cancelados = 0"
+
+
+def _somar(linha):
+    """Trigger statement adding the row to its day (creating the day if needed)."""
+    c = contribuicao(linha)
+    return f"""
+        INSERT INTO vendas_diarias (data, {', '.join(COLUNAS_VALORES)})
+        SELECT {c['data']}, {', '.join(c[col] for col in COLUNAS_VALORES)}
+        WHERE {linha}.deleted_at IS NULL AND {linha}.data_criacao IS NOT NULL
+        ON CONFLICT(data) DO UPDATE SET
+            {', '.join(f'{col} = {col} + excluded.{col}' for col in COLUNAS_VALORES)};
+    """
+
+
+def _subtrair(linha):
+    """Trigger statements removing the row from its day (the day is dropped once no order is left in it)."""
+    c = contribuicao(linha)
+    return f"""
+        UPDATE vendas_diarias SET
+            {', '.join(f'{col} = {col} - {c[col]}' for col in COLUNAS_VALORES)}
+        WHERE data = {c['data']} AND {linha}.deleted_at IS NULL;
+        DELETE FROM vendas_diarias
+        WHERE data = {c['data']} AND {SEM_PEDIDOS};
+    """
+
+
+def criar_tabela_e_gatilhos(cursor):
+    """Create the rollup table and the insert/update/delete triggers on ordem_servico."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS vendas_diarias (
+            data TEXT PRIMARY KEY,
+            quantidade INTEGER NOT NULL DEFAULT 0,
+            valor_produto REAL NOT NULL DEFAULT 0,
+            frete REAL NOT NULL DEFAULT 0,
+            entradas REAL NOT NULL DEFAULT 0,
+            cancelados INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_vendas_diarias_insert
+        AFTER INSERT ON ordem_servico
+        BEGIN
+            {_somar('NEW')}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_vendas_diarias_update
+        AFTER UPDATE OF data_criacao, valor_produto, frete, valor_entrada, status, deleted_at ON ordem_servico
+        BEGIN
+            {_subtrair('OLD')}
+            {_somar('NEW')}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_vendas_diarias_delete
+        AFTER DELETE ON ordem_servico
+        BEGIN
+            {_subtrair('OLD')}
+        END
+    """)
+
+
+def sql_recalculo():
+    """SELECT producing the expected rollup rows (data, quantidade, ...) straight from ordem_servico."""
+    c = contribuicao('o')
+    return f"""
+        SELECT {c['data']} as dia, {', '.join(f'SUM({c[col]})' for col in COLUNAS_VALORES)}
+        FROM ordem_servico o
+        WHERE o.deleted_at IS NULL AND o.data_criacao IS NOT NULL
+        GROUP BY dia
+    """
+
+
+def recriar_gatilhos(cursor):
+    """Replace the maintenance triggers with the current definitions and drop the rows left with no orders
+    by older triggers. Does not commit."""
+    for gatilho in ('trg_vendas_diarias_insert', 'trg_vendas_diarias_update', 'trg_vendas_diarias_delete'):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {gatilho}")
+    criar_tabela_e_gatilhos(cursor)
+    cursor.execute(f"DELETE FROM vendas_diarias WHERE {SEM_PEDIDOS}")
+    return cursor.rowcount
+
+
+def recalcular_vendas_diarias(cursor):
+    """Rebuild every rollup row from ordem_servico. Does not commit; returns the number of days."""
+    cursor.execute("DELETE FROM vendas_diarias")
+    cursor.execute(f"INSERT INTO vendas_diarias (data, {', '.join(COLUNAS_VALORES)}) {sql_recalculo()}")
+    return cursor.rowcount
+
+
+def migrate_add_vendas_diarias(db_connection):
+    """
+    Creates the vendas_diarias rollup, its maintenance triggers, and fills it once from ordem_servico.
+    Args:
+        db_connection: Open SQLite connection (sqlite3.Connection)
+    Returns:
+        bool: True if successful, False if error
+    """
+    if db_connection is None:
+        print("❌ Conexão com banco de dados inválida")  # User-facing message in Portuguese
+        print("Invalid database connection")  # Log in English
+        return False
+
+    try:
+        cursor = db_connection.cursor()
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='vendas_diarias'")
+        if cursor.fetchone():
+            # Already migrated: triggers maintain the rollup on every order write
+            return True
+
+        print("📝 Criando resumo diário de vendas...")  # User-facing message in Portuguese
+        print("Creating vendas_diarias rollup...")  # Log in English
+
+        # Table, triggers and backfill commit together, so a failed backfill is retried on next start
+        if not db_connection.in_transaction:
+            cursor.execute("BEGIN")
+        criar_tabela_e_gatilhos(cursor)
+        dias = recalcular_vendas_diarias(cursor)
+        db_connection.commit()
+
+        print(f"✅ Resumo diário de vendas criado! ({dias} dias)")  # User-facing message in Portuguese
+        print(f"vendas_diarias migration completed! ({dias} days)")  # Log in English
+        return True
+
+    except Exception as e:
+        db_connection.rollback()
+        print(f"❌ Erro na migração: {e}")  # User-facing message in Portuguese
+        print(f"Error in migration: {e}")  # Log in English
+        return False
+
+
+if __name__ == "__main__":
+    # Standalone script for testing (uses default database)
+    import sys
+    base_path = os.path.expanduser("~/Documents")
+    db_dir = os.path.join(base_path, "OrdemServico")
+    db_path = os.path.join(db_dir, "ordem_servico.db")
+
+    if not os.path.exists(db_path):
+        print(f"❌ Banco de dados não encontrado: {db_path}")  # User-facing message in Portuguese
+        print(f"Database not found: {db_path}")  # Log in English
+        sys.exit(1)
+
+    print("🔄 Iniciando migração: criar vendas_diarias")  # User-facing message in Portuguese
+    print("=" * 60)
+    print("Starting migration: create vendas_diarias")  # Log in English
+
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate_add_vendas_diarias(conn)
+    finally:
+        conn.close()
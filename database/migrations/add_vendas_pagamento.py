@@ -0,0 +1,179 @@
+"""
+Migration that creates vendas_pagamento_diarias, the daily sales rollup split by payment method
+(forma_pagamento), kept in step with ordem_servico by triggers like vendas_diarias.
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import sqlite3
+import os
+
+from database.migrations.add_vendas_diarias import COLUNAS_VALORES, SEM_PEDIDOS, contribuicao
+
+
+# Label for orders without a payment method
+SEM_FORMA = 'Não informado'
+
+
+def expr_forma_pagamento(prefixo=''):
+    """SQL expression grouping an order by payment method (blank values go to SEM_FORMA)."""
+    return f"COALESCE(NULLIF(trim({prefixo}forma_pagamento), ''), '{SEM_FORMA}')"
+
+
+def _somar(linha):
+    """Trigger statement adding the row to its (day, payment method)."""
+    c = contribuicao(linha)
+    return f"""
+        INSERT INTO vendas_pagamento_diarias (data, forma_pagamento, {', '.join(COLUNAS_VALORES)})
+        SELECT {c['data']}, {expr_forma_pagamento(linha + '.')}, {', '.join(c[col] for col in COLUNAS_VALORES)}
+        WHERE {linha}.deleted_at IS NULL AND {linha}.data_criacao IS NOT NULL
+        ON CONFLICT(data, forma_pagamento) DO UPDATE SET
+            {', '.join(f'{col} = {col} + excluded.{col}' for col in COLUNAS_VALORES)};
+    """
+
+
+def _subtrair(linha):
+    """Trigger statements removing the row from its (day, payment method), dropping it once no order is left."""
+    c = contribuicao(linha)
+    return f"""
+        UPDATE vendas_pagamento_diarias SET
+            {', '.join(f'{col} = {col} - {c[col]}' for col in COLUNAS_VALORES)}
+        WHERE data = {c['data']} AND forma_pagamento = {expr_forma_pagamento(linha + '.')}
+          AND {linha}.deleted_at IS NULL;
+        DELETE FROM vendas_pagamento_diarias
+        WHERE data = {c['data']} AND forma_pagamento = {expr_forma_pagamento(linha + '.')} AND {SEM_PEDIDOS};
+    """
+
+
+def criar_tabela_e_gatilhos(cursor):
+    """Create the rollup table and the insert/update/delete triggers on ordem_servico."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS vendas_pagamento_diarias (
+            data TEXT NOT NULL,
+            forma_pagamento TEXT NOT NULL,
+            quantidade INTEGER NOT NULL DEFAULT 0,
+            valor_produto REAL NOT NULL DEFAULT 0,
+            frete REAL NOT NULL DEFAULT 0,
+            entradas REAL NOT NULL DEFAULT 0,
+            cancelados INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (data, forma_pagamento)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_vendas_pagamento_insert
+        AFTER INSERT ON ordem_servico
+        BEGIN
+            {_somar('NEW')}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_vendas_pagamento_update
+        AFTER UPDATE OF data_criacao, valor_produto, frete, valor_entrada, status, deleted_at, forma_pagamento
+        ON ordem_servico
+        BEGIN
+            {_subtrair('OLD')}
+            {_somar('NEW')}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_vendas_pagamento_delete
+        AFTER DELETE ON ordem_servico
+        BEGIN
+            {_subtrair('OLD')}
+        END
+    """)
+
+
+def sql_recalculo():
+    """SELECT producing the expected rollup rows (data, forma_pagamento, quantidade, ...) from ordem_servico."""
+    c = contribuicao('o')
+    return f"""
+        SELECT {c['data']} as dia, {expr_forma_pagamento('o.')} as forma,
+               {', '.join(f'SUM({c[col]})' for col in COLUNAS_VALORES)}
+        FROM ordem_servico o
+        WHERE o.deleted_at IS NULL AND o.data_criacao IS NOT NULL
+        GROUP BY dia, forma
+    """
+
+
+def recriar_gatilhos(cursor):
+    """Replace the maintenance triggers with the current definitions and drop the rows left with no orders
+    by older triggers. Does not commit."""
+    for gatilho in ('trg_vendas_pagamento_insert', 'trg_vendas_pagamento_update', 'trg_vendas_pagamento_delete'):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {gatilho}")
+    criar_tabela_e_gatilhos(cursor)
+    cursor.execute(f"DELETE FROM vendas_pagamento_diarias WHERE {SEM_PEDIDOS}")
+    return cursor.rowcount
+
+
+def recalcular_vendas_pagamento(cursor):
+    """Rebuild every rollup row from ordem_servico. Does not commit; returns the number of rows."""
+    cursor.execute("DELETE FROM vendas_pagamento_diarias")
+    cursor.execute(
+        f"INSERT INTO vendas_pagamento_diarias (data, forma_pagamento, {', '.join(COLUNAS_VALORES)}) {sql_recalculo()}"
+    )
+    return cursor.rowcount
+
+
+def migrate_add_vendas_pagamento(db_connection):
+    """
+    Creates the vendas_pagamento_diarias rollup, its maintenance triggers, and fills it once from ordem_servico.
+    Args:
+        db_connection: Open SQLite connection (sqlite3.Connection)
+    Returns:
+        bool: True if successful, False if error
+    """
+    if db_connection is None:
+        print("❌ Conexão com banco de dados inválida")  # User-facing message in Portuguese
+        print("Invalid database connection")  # Log in English
+        return False
+
+    try:
+        cursor = db_connection.cursor()
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='vendas_pagamento_diarias'")
+        if cursor.fetchone():
+            # Already migrated: triggers maintain the rollup on every order write
+            return True
+
+        print("📝 Criando resumo de vendas por forma de pagamento...")  # User-facing message in Portuguese
+        print("Creating vendas_pagamento_diarias rollup...")  # Log in English
+
+        # Table, triggers and backfill commit together, so a failed backfill is retried on next start
+        if not db_connection.in_transaction:
+            cursor.execute("BEGIN")
+        criar_tabela_e_gatilhos(cursor)
+        linhas = recalcular_vendas_pagamento(cursor)
+        db_connection.commit()
+
+        print(f"✅ Resumo por forma de pagamento criado! ({linhas} linhas)")  # User-facing message in Portuguese
+        print(f"vendas_pagamento_diarias migration completed! ({linhas} rows)")  # Log in English
+        return True
+
+    except Exception as e:
+        db_connection.rollback()
+        print(f"❌ Erro na migração: {e}")  # User-facing message in Portuguese
+        print(f"Error in migration: {e}")  # Log in English
+        return False
+
+
+if __name__ == "__main__":
+    # Standalone script for testing (uses default database)
+    import sys
+    base_path = os.path.expanduser("~/Documents")
+    db_dir = os.path.join(base_path, "OrdemServico")
+    db_path = os.path.join(db_dir, "ordem_servico.db")
+
+    if not os.path.exists(db_path):
+        print(f"❌ Banco de dados não encontrado: {db_path}")  # User-facing message in Portuguese
+        print(f"Database not found: {db_path}")  # Log in English
+        sys.exit(1)
+
+    print("🔄 Iniciando migração: criar vendas_pagamento_diarias")  # User-facing message in Portuguese
+    print("=" * 60)
+    print("Starting migration: create vendas_pagamento_diarias")  # Log in English
+
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate_add_vendas_pagamento(conn)
+    finally:
+        conn.close()
@@ -0,0 +1,77 @@
+"""
+Migration that rewrites ordem_servico.status in its normalized form (trimmed, Unicode-lowercased),
+so the status filter can compare with '=' on the indexed column. New writes are normalized by
+normalizar_status in the CRUD layer.
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import sqlite3
+import os
+
+from database.migrations.promote_json_fields import normalizar_status
+
+
+def migrate_normalizar_status(db_connection):
+    """
+    Normalizes every stored order status (only rows whose value changes are written).
+    Args:
+        db_connection: Open SQLite connection (sqlite3.Connection)
+    Returns:
+        bool: True if successful, False if error
+    """
+    if db_connection is None:
+        print("❌ Conexão com banco de dados inválida")  # User-facing message in Portuguese
+        print("Invalid database connection")  # Log in English
+        return False
+
+    try:
+        cursor = db_connection.cursor()
+        cursor.execute("SELECT id, status FROM ordem_servico WHERE status IS NOT NULL")
+        atualizacoes = [
+            (normalizar_status(status), id_) for id_, status in cursor.fetchall()
+            if normalizar_status(status) != status
+        ]
+        if not atualizacoes:
+            # Nothing to rewrite: statuses are normalized when written
+            return True
+
+        print("📝 Normalizando status dos pedidos...")  # User-facing message in Portuguese
+        print("Normalizing order statuses...")  # Log in English
+
+        if not db_connection.in_transaction:
+            cursor.execute("BEGIN")
+        cursor.executemany("UPDATE ordem_servico SET status = ? WHERE id = ?", atualizacoes)
+        db_connection.commit()
+
+        print(f"✅ Status normalizados! ({len(atualizacoes)} pedidos)")  # User-facing message in Portuguese
+        print(f"Order status normalization completed! ({len(atualizacoes)} orders)")  # Log in English
+        return True
+
+    except Exception as e:
+        db_connection.rollback()
+        print(f"❌ Erro na migração: {e}")  # User-facing message in Portuguese
+        print(f"Error in migration: {e}")  # Log in English
+        return False
+
+
+if __name__ == "__main__":
+    # Standalone script for testing (uses default database)
+    import sys
+    base_path = os.path.expanduser("~/Documents")
+    db_dir = os.path.join(base_path, "OrdemServico")
+    db_path = os.path.join(db_dir, "ordem_servico.db")
+
+    if not os.path.exists(db_path):
+        print(f"❌ Banco de dados não encontrado: {db_path}")  # User-facing message in Portuguese
+        print(f"Database not found: {db_path}")  # Log in English
+        sys.exit(1)
+
+    print("🔄 Iniciando migração: normalizar status dos pedidos")  # User-facing message in Portuguese
+    print("=" * 60)
+    print("Starting migration: normalize order statuses")  # Log in English
+
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate_normalizar_status(conn)
+    finally:
+        conn.close()
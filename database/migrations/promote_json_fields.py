@@ -0,0 +1,137 @@
+"""
+Migration that promotes status, desconto, cor and reforco out of ordem_servico.dados_json
+into real columns, which become the authoritative source for those fields.
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import sqlite3
+import os
+import json
+
+
+# Fields that live in real ordem_servico columns instead of dados_json
+CAMPOS_PROMOVIDOS = ('status', 'desconto', 'cor', 'reforco')
+
+
+def normalizar_status(status):
+    """Stored form of a status: trimmed and lowercased with Unicode folding ('Em Produção ' -> 'em produção').
+    SQLite's lower() and NOCASE only fold ASCII, so the value is normalized in Python before it is written."""
+    return str(status).strip().lower()
+
+
+def valores_promovidos(dados):
+    """Convert promoted fields found in a dados_json dict to their column values."""
+    valores = {}
+    if not isinstance(dados, dict):
+        return valores
+    if dados.get('status'):
+        valores['status'] = normalizar_status(dados['status'])
+    if 'desconto' in dados:
+        try:
+            valores['desconto'] = float(dados.get('desconto') or 0)
+        except Exception:
+            valores['desconto'] = 0.0
+    if 'cor' in dados:
+        valores['cor'] = str(dados.get('cor') or '')
+    if 'reforco' in dados:
+        valores['reforco'] = 1 if str(dados.get('reforco')).lower() in ('1', 'true', 'sim', 'yes') else 0
+    return valores
+
+
+def migrate_promote_json_fields(db_connection):
+    """
+    Adds desconto, cor and reforco columns to ordem_servico and backfills them (and status)
+    once from dados_json. The promoted keys are removed from the JSON blob.
+    Args:
+        db_connection: Open SQLite connection (sqlite3.Connection)
+    Returns:
+        bool: True if successful, False if error
+    """
+    if db_connection is None:
+        print("❌ Conexão com banco de dados inválida")  # User-facing message in Portuguese
+        print("Invalid database connection")  # Log in English
+        return False
+
+    try:
+        cursor = db_connection.cursor()
+
+        cursor.execute("PRAGMA table_info(ordem_servico)")
+        ordem_columns = [col[1] for col in cursor.fetchall()]
+        novas_colunas = [
+            ('desconto', "REAL DEFAULT 0"),
+            ('cor', "TEXT DEFAULT ''"),
+            ('reforco', "INTEGER DEFAULT 0"),
+        ]
+        if all(nome in ordem_columns for nome, _ in novas_colunas):
+            # Already migrated: columns are written directly from now on
+            return True
+
+        print("📝 Promovendo campos do dados_json para colunas...")  # User-facing message in Portuguese
+        print("Promoting dados_json fields to columns...")  # Log in English
+
+        # Column creation and backfill commit together, so a failed backfill is retried on next start
+        if not db_connection.in_transaction:
+            cursor.execute("BEGIN")
+        for nome, tipo in novas_colunas:
+            if nome not in ordem_columns:
+                cursor.execute(f"ALTER TABLE ordem_servico ADD COLUMN {nome} {tipo}")
+
+        cursor.execute("SELECT id, dados_json, status FROM ordem_servico WHERE dados_json IS NOT NULL AND dados_json != ''")
+        atualizacoes = []
+        for id_, dados_json, status_atual in cursor.fetchall():
+            try:
+                dados = json.loads(dados_json) or {}
+            except Exception:
+                continue
+            valores = valores_promovidos(dados)
+            for campo in CAMPOS_PROMOVIDOS:
+                dados.pop(campo, None)
+            atualizacoes.append((
+                valores.get('status', status_atual),
+                valores.get('desconto', 0.0),
+                valores.get('cor', ''),
+                valores.get('reforco', 0),
+                json.dumps(dados, ensure_ascii=False),
+                id_,
+            ))
+        cursor.executemany(
+            "UPDATE ordem_servico SET status = ?, desconto = ?, cor = ?, reforco = ?, dados_json = ? WHERE id = ?",
+            atualizacoes
+        )
+
+        # Case-insensitive status filtering (the Pedidos filter lowercases the selected status)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_status_nocase ON ordem_servico(status COLLATE NOCASE)")
+        db_connection.commit()
+
+        print(f"✅ Migração de campos do pedido concluída! ({len(atualizacoes)} pedidos)")  # User-facing message in Portuguese
+        print(f"Order fields migration completed! ({len(atualizacoes)} orders)")  # Log in English
+        return True
+
+    except Exception as e:
+        db_connection.rollback()
+        print(f"❌ Erro na migração: {e}")  # User-facing message in Portuguese
+        print(f"Error in migration: {e}")  # Log in English
+        return False
+
+
+if __name__ == "__main__":
+    # Standalone script for testing (uses default database)
+    import sys
+    base_path = os.path.expanduser("~/Documents")
+    db_dir = os.path.join(base_path, "OrdemServico")
+    db_path = os.path.join(db_dir, "ordem_servico.db")
+
+    if not os.path.exists(db_path):
+        print(f"❌ Banco de dados não encontrado: {db_path}")  # User-facing message in Portuguese
+        print(f"Database not found: {db_path}")  # Log in English
+        sys.exit(1)
+
+    print("🔄 Iniciando migração: promover campos do dados_json")  # User-facing message in Portuguese
+    print("=" * 60)
+    print("Starting migration: promote dados_json fields")  # Log in English
+
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate_promote_json_fields(conn)
+    finally:
+        conn.close()
@@ -0,0 +1,78 @@
+"""
+Migration that rebuilds idx_ordem_prazo when it was created with an older expr_concluido (the status
+group used to be NULL for orders without a status, which sorted them first and stopped the keyset
+pagination of the deadline listing after the first page).
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import sqlite3
+import os
+
+from database.migrations.add_data_prazo import expr_concluido, criar_indice_prazo
+
+
+def migrate_recriar_indice_prazo(db_connection):
+    """
+    Drops and recreates idx_ordem_prazo unless it already uses the current status group expression.
+    Args:
+        db_connection: Open SQLite connection (sqlite3.Connection)
+    Returns:
+        bool: True if successful, False if error
+    """
+    if db_connection is None:
+        print("❌ Conexão com banco de dados inválida")  # User-facing message in Portuguese
+        print("Invalid database connection")  # Log in English
+        return False
+
+    try:
+        cursor = db_connection.cursor()
+
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type='index' AND name='idx_ordem_prazo'")
+        row = cursor.fetchone()
+        if row and expr_concluido() in row[0]:
+            # Created by add_data_prazo with the current expression
+            return True
+
+        print("📝 Recriando índice de prazo dos pedidos...")  # User-facing message in Portuguese
+        print("Rebuilding idx_ordem_prazo...")  # Log in English
+
+        if not db_connection.in_transaction:
+            cursor.execute("BEGIN")
+        cursor.execute("DROP INDEX IF EXISTS idx_ordem_prazo")
+        criar_indice_prazo(cursor)
+        # Fresh statistics keep the planner on the new index instead of sorting every row
+        cursor.execute("ANALYZE ordem_servico")
+        db_connection.commit()
+
+        print("✅ Índice de prazo recriado!")  # User-facing message in Portuguese
+        print("idx_ordem_prazo rebuild completed!")  # Log in English
+        return True
+
+    except Exception as e:
+        db_connection.rollback()
+        print(f"❌ Erro na migração: {e}")  # User-facing message in Portuguese
+        print(f"Error in migration: {e}")  # Log in English
+        return False
+
+
+if __name__ == "__main__":
+    # Standalone script for testing (uses default database)
+    import sys
+    base_path = os.path.expanduser("~/Documents")
+    db_dir = os.path.join(base_path, "OrdemServico")
+    db_path = os.path.join(db_dir, "ordem_servico.db")
+
+    if not os.path.exists(db_path):
+        print(f"❌ Banco de dados não encontrado: {db_path}")  # User-facing message in Portuguese
+        print(f"Database not found: {db_path}")  # Log in English
+        sys.exit(1)
+
+    print("🔄 Iniciando migração: recriar índice de prazo")  # User-facing message in Portuguese
+    print("=" * 60)
+    print("Starting migration: rebuild idx_ordem_prazo")  # Log in English
+
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate_recriar_indice_prazo(conn)
+    finally:
+        conn.close()
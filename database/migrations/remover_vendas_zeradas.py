@@ -0,0 +1,76 @@
+"""
+Migration that updates the vendas_diarias and vendas_pagamento_diarias triggers so a day (or day and
+payment method) is removed once its last order is deleted, moved or soft-deleted, and drops the
+all-zero rows the previous triggers left behind.
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import sqlite3
+import os
+
+from database.migrations import add_vendas_diarias, add_vendas_pagamento
+
+
+def migrate_remover_vendas_zeradas(db_connection):
+    """
+    Recreates the sales rollup triggers and removes rollup rows with no orders.
+    Args:
+        db_connection: Open SQLite connection (sqlite3.Connection)
+    Returns:
+        bool: True if successful, False if error
+    """
+    if db_connection is None:
+        print("❌ Conexão com banco de dados inválida")  # User-facing message in Portuguese
+        print("Invalid database connection")  # Log in English
+        return False
+
+    try:
+        cursor = db_connection.cursor()
+
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type='trigger' AND name='trg_vendas_pagamento_delete'")
+        row = cursor.fetchone()
+        if row and 'DELETE FROM vendas_pagamento_diarias' in row[0]:
+            # Already migrated: the triggers drop empty rows themselves
+            return True
+
+        print("📝 Atualizando gatilhos do resumo de vendas...")  # User-facing message in Portuguese
+        print("Updating sales rollup triggers...")  # Log in English
+
+        if not db_connection.in_transaction:
+            cursor.execute("BEGIN")
+        linhas = add_vendas_diarias.recriar_gatilhos(cursor)
+        linhas += add_vendas_pagamento.recriar_gatilhos(cursor)
+        db_connection.commit()
+
+        print(f"✅ Gatilhos atualizados! ({linhas} linhas vazias removidas)")  # User-facing message in Portuguese
+        print(f"Sales rollup triggers updated! ({linhas} empty rows removed)")  # Log in English
+        return True
+
+    except Exception as e:
+        db_connection.rollback()
+        print(f"❌ Erro na migração: {e}")  # User-facing message in Portuguese
+        print(f"Error in migration: {e}")  # Log in English
+        return False
+
+
+if __name__ == "__main__":
+    # Standalone script for testing (uses default database)
+    import sys
+    base_path = os.path.expanduser("~/Documents")
+    db_dir = os.path.join(base_path, "OrdemServico")
+    db_path = os.path.join(db_dir, "ordem_servico.db")
+
+    if not os.path.exists(db_path):
+        print(f"❌ Banco de dados não encontrado: {db_path}")  # User-facing message in Portuguese
+        print(f"Database not found: {db_path}")  # Log in English
+        sys.exit(1)
+
+    print("🔄 Iniciando migração: atualizar gatilhos do resumo de vendas")  # User-facing message in Portuguese
+    print("=" * 60)
+    print("Starting migration: update sales rollup triggers")  # Log in English
+
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate_remover_vendas_zeradas(conn)
+    finally:
+        conn.close()
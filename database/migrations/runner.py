@@ -0,0 +1,129 @@
+"""
+Versioned migration runner.
+Every schema change is an ordered, idempotent step. PRAGMA user_version holds the number of the
+last step applied, so starting on an up-to-date database costs a single version check; pending steps
+run in order, each one is recorded in schema_version together with how long it took.
+Run: python -m database.migrations.runner
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import time
+
+from database.migrations.schema_version import criar_tabela_versao, registrar_migracao
+
+
+def _criar_tabelas(db_connection):
+    from database.core.db_setup import DatabaseSetup
+    return DatabaseSetup.criar_tabelas(db_connection.cursor())
+
+
+def passos():
+    """Ordered (version, name, function(db_connection) -> bool) list. Append new steps at the end;
+    never renumber or remove a step that has shipped."""
+    from database.migrations.add_colunas_legadas import migrate_add_colunas_legadas
+    from database.migrations.add_deleted_at import migrate_add_deleted_at
+    from database.migrations.add_documento_norm import migrate_add_documento_norm
+    from database.migrations.promote_json_fields import migrate_promote_json_fields
+    from database.migrations.add_ordem_item import migrate_add_ordem_item
+    from database.migrations.add_sequencia_os import migrate_add_sequencia_os
+    from database.migrations.add_data_prazo import migrate_add_data_prazo
+    from database.migrations.add_vendas_diarias import migrate_add_vendas_diarias
+    from database.migrations.add_cliente_estatisticas import migrate_add_cliente_estatisticas
+    from database.migrations.add_numero_compras import migrate_add_numero_compras
+    from database.migrations.add_vendas_pagamento import migrate_add_vendas_pagamento
+    from database.migrations.add_busca_fts import migrate_add_busca_fts
+    from database.migrations.add_busca_clientes import migrate_add_busca_clientes
+    from database.migrations.remover_vendas_zeradas import migrate_remover_vendas_zeradas
+    from database.migrations.normalizar_status import migrate_normalizar_status
+    from database.migrations.add_gatilhos_numero_compras import migrate_add_gatilhos_numero_compras
+    from database.migrations.add_busca_clientes_digitos import migrate_add_busca_clientes_digitos
+    from database.migrations.recriar_indice_prazo import migrate_recriar_indice_prazo
+    return [
+        (1, 'criar_tabelas', _criar_tabelas),
+        (2, 'add_colunas_legadas', migrate_add_colunas_legadas),
+        (3, 'add_deleted_at', migrate_add_deleted_at),
+        (4, 'add_documento_norm', migrate_add_documento_norm),
+        (5, 'promote_json_fields', migrate_promote_json_fields),
+        (6, 'add_ordem_item', migrate_add_ordem_item),
+        (7, 'add_sequencia_os', migrate_add_sequencia_os),
+        (8, 'add_data_prazo', migrate_add_data_prazo),
+        (9, 'add_vendas_diarias', migrate_add_vendas_diarias),
+        (10, 'add_cliente_estatisticas', migrate_add_cliente_estatisticas),
+        (11, 'add_numero_compras', migrate_add_numero_compras),
+        (12, 'add_vendas_pagamento', migrate_add_vendas_pagamento),
+        (13, 'add_busca_fts', migrate_add_busca_fts),
+        (14, 'add_busca_clientes', migrate_add_busca_clientes),
+        (15, 'remover_vendas_zeradas', migrate_remover_vendas_zeradas),
+        (16, 'normalizar_status', migrate_normalizar_status),
+        (17, 'add_gatilhos_numero_compras', migrate_add_gatilhos_numero_compras),
+        (18, 'add_busca_clientes_digitos', migrate_add_busca_clientes_digitos),
+        (19, 'recriar_indice_prazo', migrate_recriar_indice_prazo),
+    ]
+
+
+def versao_atual(db_connection):
+    """Number of the last migration step applied to the database (0 for a new or pre-runner database)."""
+    return db_connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def executar_migracoes(db_connection):
+    """
+    Apply the pending migration steps in order. A failed step stops the run; it and the following
+    steps are retried on the next start.
+    Args:
+        db_connection: Open SQLite connection (sqlite3.Connection)
+    Returns:
+        bool: True if the database is up to date, False if a step failed
+    """
+    lista = passos()
+    atual = versao_atual(db_connection)
+    if atual >= lista[-1][0]:
+        return True
+
+    cursor = db_connection.cursor()
+    criar_tabela_versao(cursor)
+    db_connection.commit()
+    print(f"🔄 Atualizando banco de dados (versão {atual} → {lista[-1][0]})...")  # User-facing message in Portuguese
+    print(f"Migrating database from version {atual} to {lista[-1][0]}...")  # Log in English
+
+    inicio_total = time.perf_counter()
+    for versao, nome, migrar in lista:
+        if versao <= atual:
+            continue
+        inicio = time.perf_counter()
+        try:
+            ok = migrar(db_connection)
+        except Exception as e:
+            print(f"Migration {versao} ({nome}) raised: {e}")  # Log in English
+            ok = False
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+        if not ok:
+            if db_connection.in_transaction:
+                db_connection.rollback()
+            print(f"❌ Migração {versao} ({nome}) falhou; será repetida na próxima inicialização")  # User-facing message in Portuguese
+            print(f"Migration {versao} ({nome}) failed after {duracao_ms:.1f} ms; it will be retried on next start")  # Log in English
+            return False
+        registrar_migracao(cursor, nome, versao, duracao_ms)
+        cursor.execute(f"PRAGMA user_version = {int(versao)}")
+        db_connection.commit()
+        print(f"Migration {versao} ({nome}) applied in {duracao_ms:.1f} ms")  # Log in English
+
+    duracao_total = (time.perf_counter() - inicio_total) * 1000
+    print(f"✅ Banco de dados atualizado em {duracao_total:.0f} ms")  # User-facing message in Portuguese
+    print(f"Database migrated in {duracao_total:.1f} ms")  # Log in English
+    return True
+
+
+if __name__ == "__main__":
+    # Standalone: bring the default database up to date and list the applied steps
+    import sqlite3
+    from database.core.db_setup import DatabaseSetup
+    conn = sqlite3.connect(DatabaseSetup.get_database_path())
+    try:
+        executar_migracoes(conn)
+        for nome, versao, aplicada_em, duracao_ms in conn.execute(
+            "SELECT nome, versao, aplicada_em, duracao_ms FROM schema_version ORDER BY versao"
+        ):
+            print(f"{versao or '-':>3}  {nome:<28} {aplicada_em}  {duracao_ms or 0:.1f} ms")
+    finally:
+        conn.close()
@@ -0,0 +1,41 @@
+"""
+schema_version bookkeeping: records which migrations already ran on a database (with their
+runner version and duration), so they are skipped on later starts instead of being re-checked or recomputed.
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+from datetime import datetime
+
+
+def criar_tabela_versao(cursor):
+    """Create the schema_version table if needed."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            nome TEXT PRIMARY KEY,
+            aplicada_em TEXT NOT NULL,
+            versao INTEGER,
+            duracao_ms REAL
+        )
+    """)
+    # Tables created before the runner only had (nome, aplicada_em)
+    cursor.execute("PRAGMA table_info(schema_version)")
+    colunas = [col[1] for col in cursor.fetchall()]
+    for coluna, tipo in (('versao', 'INTEGER'), ('duracao_ms', 'REAL')):
+        if coluna not in colunas:
+            cursor.execute(f"ALTER TABLE schema_version ADD COLUMN {coluna} {tipo}")
+
+
+def migracao_aplicada(cursor, nome):
+    """True if the migration 'nome' is recorded in schema_version."""
+    criar_tabela_versao(cursor)
+    cursor.execute("SELECT 1 FROM schema_version WHERE nome = ?", (nome,))
+    return cursor.fetchone() is not None
+
+
+def registrar_migracao(cursor, nome, versao=None, duracao_ms=None):
+    """Record the migration 'nome' as applied. Does not commit (runs inside the migration transaction)."""
+    criar_tabela_versao(cursor)
+    cursor.execute(
+        "INSERT OR REPLACE INTO schema_version (nome, aplicada_em, versao, duracao_ms) VALUES (?, ?, ?, ?)",
+        (nome, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), versao, duracao_ms)
+    )
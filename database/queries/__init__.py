@@ -1,4 +1,5 @@
 """Query modules for reports and analytics."""
 from .report_queries import ReportQueries
+from .report_cache import ReportCache
 
-__all__ = ['ReportQueries']
+__all__ = ['ReportQueries', 'ReportCache']
@@ -0,0 +1,68 @@
+"""
+In-memory cache for report results, keyed by (query, period arguments).
+Entries belong to a group ('pedidos' or 'gastos') and are dropped when that group's data changes.
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+import functools
+import threading
+
+
+# Data a report can depend on: orders (and their rollups) and expenses
+GRUPOS = ('pedidos', 'gastos')
+
+# Per-thread flag raised by report methods that swallow an error and return a default value
+_falhas = threading.local()
+
+
+def registrar_falha():
+    """Mark the report being computed on this thread as failed (interrupted query, locked database...),
+    so its fallback value is returned but not cached."""
+    _falhas.ativa = True
+
+
+class ReportCache:
+    def __init__(self):
+        self._entradas = {}  # (grupo, nome, args) -> result
+        self._geracoes = {}  # grupo -> generation, bumped on every invalidation
+        self._lock = threading.Lock()
+
+    def obter(self, grupo, nome, args, calcular):
+        """Return the cached result of 'nome' for 'args', computing it with calcular() on a miss."""
+        chave = (grupo, nome, tuple(args))
+        with self._lock:
+            if chave in self._entradas:
+                return self._entradas[chave]
+            geracao = self._geracoes.get(grupo, 0)
+        anterior = getattr(_falhas, 'ativa', False)
+        _falhas.ativa = False
+        try:
+            resultado = calcular()
+        finally:
+            falhou = _falhas.ativa
+            _falhas.ativa = anterior or falhou
+        if falhou:
+            return resultado
+        with self._lock:
+            # Data changed while computing: the result may be stale, so do not keep it
+            if self._geracoes.get(grupo, 0) == geracao:
+                self._entradas[chave] = resultado
+        return resultado
+
+    def invalidar(self, *grupos):
+        """Drop the entries of the given groups (all groups when none is given)."""
+        with self._lock:
+            grupos = grupos or GRUPOS
+            for grupo in grupos:
+                self._geracoes[grupo] = self._geracoes.get(grupo, 0) + 1
+            self._entradas = {chave: valor for chave, valor in self._entradas.items() if chave[0] not in grupos}
+
+
+def em_cache(grupo):
+    """Decorator for DatabaseManager report methods: results are memoized in self.relatorios_cache."""
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def envolvido(self, *args, **kwargs):
+            chave = args + tuple(sorted(kwargs.items()))
+            return self.relatorios_cache.obter(grupo, metodo.__name__, chave, lambda: metodo(self, *args, **kwargs))
+        return envolvido
+    return decorador
@@ -5,6 +5,9 @@ All user-facing messages are in Portuguese. All comments, docstrings, and logs a
 import sqlite3
 from datetime import datetime, timedelta
 
+from database.core.documento import normalize_documento
+from database.queries.report_cache import registrar_falha
+
 class ReportQueries:
     def __init__(self, cursor):
         self.cursor = cursor
@@ -22,6 +25,7 @@ class ReportQueries:
             self.cursor.execute(query)
             return self.cursor.fetchall()
         except Exception as e:
+            registrar_falha()
             print(f"Erro ao buscar todas as ordens: {e}")  # User-facing message in Portuguese
             print(f"Error fetching all orders: {e}")  # Log in English
             return []
@@ -31,13 +35,14 @@ class ReportQueries:
         try:
             query = '''
             SELECT * FROM ordem_servico 
-            WHERE date(data_criacao) BETWEEN ? AND ?
+            WHERE data_criacao >= ? AND data_criacao < date(?, '+1 day')
             AND deleted_at IS NULL
             ORDER BY data_criacao DESC
             '''
-            self.cursor.execute(query, (data_inicio, data_fim))
+            self.cursor.execute(query, (str(data_inicio)[:10], str(data_fim)[:10]))
             return self.cursor.fetchall()
         except Exception as e:
+            registrar_falha()
             print(f"Erro ao buscar por período: {e}")  # User-facing message in Portuguese
             print(f"Error fetching by period: {e}")  # Log in English
             return []
@@ -54,6 +59,7 @@ class ReportQueries:
             self.cursor.execute(query, (f'%{nome_cliente}%',))
             return self.cursor.fetchall()
         except Exception as e:
+            registrar_falha()
             print(f"Erro ao buscar por cliente: {e}")  # User-facing message in Portuguese
             print(f"Error fetching by client: {e}")  # Log in English
             return []
@@ -61,80 +67,420 @@ class ReportQueries:
     def buscar_por_cpf(self, cpf_cliente):
         """Fetch orders by client CPF (exact match)."""
         try:
-            # Normalize CPF to digits-only for comparison
-            cpf = ''.join(ch for ch in str(cpf_cliente or '') if ch.isdigit())
-            # Normalize stored cpf_cliente by removing common punctuation before comparing
+            # Normalize CPF to digits-only and match the indexed documento_norm column
+            cpf = normalize_documento(cpf_cliente)
             query = '''
             SELECT * FROM ordem_servico
-            WHERE replace(replace(replace(cpf_cliente, '.', ''), '-', ''), ' ', '') = ?
+            WHERE documento_norm = ?
             AND deleted_at IS NULL
             ORDER BY data_criacao DESC
             '''
             self.cursor.execute(query, (cpf,))
             return self.cursor.fetchall()
         except Exception as e:
+            registrar_falha()
             print(f"Erro ao buscar por cpf: {e}")  # User-facing message in Portuguese
             print(f"Error fetching by cpf: {e}")  # Log in English
             return []
     
     def calcular_vendas_periodo(self, data_inicio, data_fim):
-        """Calculate sales by period."""
+        """Calculate sales by period (from the vendas_diarias rollup; deleted and cancelled orders excluded)."""
         try:
             query = '''
             SELECT 
-                COUNT(*) as total_vendas,
+                SUM(quantidade) as total_vendas,
                 SUM(valor_produto + frete) as total_valor,
-                SUM(valor_entrada) as total_entradas,
-                AVG(valor_produto + frete) as ticket_medio
-            FROM ordem_servico 
-            WHERE date(data_criacao) BETWEEN ? AND ?
+                SUM(entradas) as total_entradas,
+                SUM(valor_produto + frete) / NULLIF(SUM(quantidade), 0) as ticket_medio
+            FROM vendas_diarias 
+            WHERE data BETWEEN ? AND ?
             '''
-            self.cursor.execute(query, (data_inicio, data_fim))
-            return self.cursor.fetchone()
+            self.cursor.execute(query, (str(data_inicio)[:10], str(data_fim)[:10]))
+            total_vendas, total_valor, total_entradas, ticket_medio = self.cursor.fetchone()
+            return (total_vendas or 0, total_valor, total_entradas, ticket_medio)
         except Exception as e:
+            registrar_falha()
             print(f"Erro ao calcular vendas: {e}")  # User-facing message in Portuguese
             print(f"Error calculating sales: {e}")  # Log in English
             return (0, 0, 0, 0)
     
     def vendas_por_dia(self, dias=30):
-        """Sales for the last N days."""
+        """Sales for the last N days (one vendas_diarias row per day with orders)."""
         try:
             data_limite = (datetime.now() - timedelta(days=dias)).strftime('%Y-%m-%d')
             query = '''
             SELECT 
-                date(data_criacao) as data,
-                COUNT(*) as quantidade,
-                SUM(valor_produto + frete) as total
-            FROM ordem_servico 
-            WHERE date(data_criacao) >= ?
-            GROUP BY date(data_criacao)
+                data,
+                quantidade,
+                valor_produto + frete as total
+            FROM vendas_diarias 
+            WHERE data >= ? AND (quantidade > 0 OR cancelados > 0)
             ORDER BY data
             '''
             self.cursor.execute(query, (data_limite,))
             return self.cursor.fetchall()
         except Exception as e:
+            registrar_falha()
             print(f"Erro ao buscar vendas por dia: {e}")  # User-facing message in Portuguese
             print(f"Error fetching sales by day: {e}")  # Log in English
             return []
 
+    def vendas_agrupadas(self, inicio, fim, granularidade='dia'):
+        """Sales per bucket between two 'YYYY-MM-DD' dates (inclusive), from a single GROUP BY.
+        granularidade: 'dia', 'semana' (7-day buckets counted from 'inicio') or 'mes' (calendar months).
+        Returns [(bucket_start 'YYYY-MM-DD', quantidade, total_valor), ...] for every bucket in the
+        range, including empty ones; totals use the same rules as calcular_vendas_periodo.
+        Reads the vendas_diarias rollup, so a year is at most 366 rows.
+        """
+        inicio = str(inicio)[:10]
+        fim = str(fim)[:10]
+        if granularidade == 'semana':
+            chave = "CAST((julianday(data) - julianday(?)) / 7 AS INTEGER)"
+            chave_params = [inicio]
+        elif granularidade == 'mes':
+            chave = "substr(data, 1, 7)"
+            chave_params = []
+        else:
+            chave = "data"
+            chave_params = []
+        try:
+            query = f'''
+            SELECT {chave} as bucket,
+                   SUM(quantidade) as quantidade,
+                   SUM(valor_produto + frete) as total
+            FROM vendas_diarias
+            WHERE data BETWEEN ? AND ?
+            GROUP BY bucket
+            '''
+            self.cursor.execute(query, chave_params + [inicio, fim])
+            por_bucket = {bucket: (quantidade, total or 0.0) for bucket, quantidade, total in self.cursor.fetchall()}
+        except Exception as e:
+            registrar_falha()
+            print(f"Erro ao agrupar vendas: {e}")  # User-facing message in Portuguese
+            print(f"Error grouping sales: {e}")  # Log in English
+            por_bucket = {}
+
+        # Fill every bucket of the range, so charts get a bar per period even without sales
+        resultado = []
+        atual = datetime.strptime(inicio, '%Y-%m-%d')
+        limite = datetime.strptime(fim, '%Y-%m-%d')
+        indice = 0
+        while atual <= limite:
+            if granularidade == 'semana':
+                chave_bucket, proximo = indice, atual + timedelta(weeks=1)
+            elif granularidade == 'mes':
+                chave_bucket = atual.strftime('%Y-%m')
+                proximo = (atual.replace(day=1) + timedelta(days=32)).replace(day=1)
+            else:
+                chave_bucket, proximo = atual.strftime('%Y-%m-%d'), atual + timedelta(days=1)
+            quantidade, total = por_bucket.get(chave_bucket, (0, 0.0))
+            resultado.append((atual.strftime('%Y-%m-%d'), quantidade, total))
+            atual = proximo
+            indice += 1
+        return resultado
+
+    @staticmethod
+    def periodo_comparacao(inicio, fim, comparar_com='anterior'):
+        """Dates of the period a report is compared with: 'anterior' is the same number of days right
+        before 'inicio'; 'ano' is the same dates one year earlier.
+        Returns (inicio, fim, modificador) with 'YYYY-MM-DD' strings; modificador is the SQLite date()
+        modifier shifting a day into the compared period ('-1 year' or '-N days'). Each day d stands for
+        the compared days from date(d, modificador) to date(d, '+1 day', modificador, '-1 day'): one day,
+        except that 28/02 also covers the 29/02 of a leap previous year and a 29/02 covers none.
+        """
+        data_inicio = datetime.strptime(str(inicio)[:10], '%Y-%m-%d')
+        data_fim = datetime.strptime(str(fim)[:10], '%Y-%m-%d')
+        if comparar_com == 'ano':
+            def um_ano_antes(data):
+                try:
+                    return data.replace(year=data.year - 1)
+                except ValueError:
+                    # 29/02 -> 01/03, the same day date(d, '-1 year') gives in SQLite
+                    return data.replace(year=data.year - 1, month=3, day=1)
+            anterior_inicio = um_ano_antes(data_inicio)
+            anterior_fim = um_ano_antes(data_fim + timedelta(days=1)) - timedelta(days=1)
+            modificador = '-1 year'
+        else:
+            deslocamento = (data_fim - data_inicio).days + 1
+            anterior_inicio = data_inicio - timedelta(days=deslocamento)
+            anterior_fim = data_fim - timedelta(days=deslocamento)
+            modificador = f'-{deslocamento} days'
+        return anterior_inicio.strftime('%Y-%m-%d'), anterior_fim.strftime('%Y-%m-%d'), modificador
+
+    def analise_periodo(self, inicio, fim, comparar_com='anterior'):
+        """Daily series of a period compared with an earlier one, in a single query over vendas_diarias.
+        Each day is joined to its matching day(s) in the compared period (see periodo_comparacao, so a
+        year-over-year comparison follows the calendar across leap years) and window functions give the
+        7- and 30-day moving averages of the total (days without sales count as zero).
+        comparar_com: 'anterior' (previous period of the same length) or 'ano' (same dates last year).
+        Returns dict:
+            serie: [{data, quantidade, total, quantidade_anterior, total_anterior, media_7d, media_30d}, ...]
+            atual / anterior: {inicio, fim, quantidade, total}
+            variacao_pct: % change of the total against the compared period (None if it had no sales)
+        """
+        inicio = str(inicio)[:10]
+        fim = str(fim)[:10]
+        anterior_inicio, anterior_fim, modificador = self.periodo_comparacao(inicio, fim, comparar_com)
+        # The calendar starts early enough for the 30-day window
+        primeiro_dia = (datetime.strptime(inicio, '%Y-%m-%d') - timedelta(days=29)).strftime('%Y-%m-%d')
+        vazio = {
+            'serie': [],
+            'atual': {'inicio': inicio, 'fim': fim, 'quantidade': 0, 'total': 0.0},
+            'anterior': {'inicio': anterior_inicio, 'fim': anterior_fim, 'quantidade': 0, 'total': 0.0},
+            'variacao_pct': None,
+        }
+        try:
+            query = '''
+            WITH RECURSIVE calendario(dia) AS (
+                SELECT ?
+                UNION ALL
+                SELECT date(dia, '+1 day') FROM calendario WHERE dia < ?
+            ),
+            diario AS (
+                SELECT calendario.dia, ifnull(v.quantidade, 0) as quantidade, ifnull(v.valor_produto + v.frete, 0) as total
+                FROM calendario
+                LEFT JOIN vendas_diarias v ON v.data = calendario.dia
+            ),
+            janelas AS (
+                SELECT dia, quantidade, total,
+                       AVG(total) OVER (dias ROWS BETWEEN 6 PRECEDING AND CURRENT ROW) as media_7d,
+                       AVG(total) OVER (dias ROWS BETWEEN 29 PRECEDING AND CURRENT ROW) as media_30d
+                FROM diario
+                WINDOW dias AS (ORDER BY dia)
+            )
+            SELECT janelas.dia, janelas.quantidade, janelas.total,
+                   ifnull(SUM(a.quantidade), 0) as quantidade_anterior,
+                   ifnull(SUM(a.valor_produto + a.frete), 0) as total_anterior,
+                   janelas.media_7d, janelas.media_30d
+            FROM janelas
+            LEFT JOIN vendas_diarias a
+                   ON a.data BETWEEN date(janelas.dia, ?) AND date(janelas.dia, '+1 day', ?, '-1 day')
+            WHERE janelas.dia >= ?
+            GROUP BY janelas.dia
+            ORDER BY janelas.dia
+            '''
+            self.cursor.execute(query, (primeiro_dia, fim, modificador, modificador, inicio))
+            linhas = self.cursor.fetchall()
+        except Exception as e:
+            registrar_falha()
+            print(f"Erro ao analisar período: {e}")  # User-facing message in Portuguese
+            print(f"Error analysing period: {e}")  # Log in English
+            return vazio
+
+        serie = [
+            {
+                'data': dia, 'quantidade': quantidade, 'total': float(total),
+                'quantidade_anterior': quantidade_anterior, 'total_anterior': float(total_anterior),
+                'media_7d': float(media_7d), 'media_30d': float(media_30d),
+            }
+            for dia, quantidade, total, quantidade_anterior, total_anterior, media_7d, media_30d in linhas
+        ]
+        resultado = vazio
+        resultado['serie'] = serie
+        resultado['atual']['quantidade'] = sum(d['quantidade'] for d in serie)
+        resultado['atual']['total'] = sum(d['total'] for d in serie)
+        resultado['anterior']['quantidade'] = sum(d['quantidade_anterior'] for d in serie)
+        resultado['anterior']['total'] = sum(d['total_anterior'] for d in serie)
+        if resultado['anterior']['total']:
+            resultado['variacao_pct'] = (
+                (resultado['atual']['total'] - resultado['anterior']['total']) / resultado['anterior']['total'] * 100
+            )
+        return resultado
+
+    def vendas_por_forma_pagamento(self, inicio, fim):
+        """Sales per payment method between two dates (inclusive), from the vendas_pagamento_diarias rollup.
+        Returns [(forma_pagamento, quantidade, total, participacao_pct), ...] ordered by total;
+        the share of each method comes from a window over the grouped totals.
+        """
+        try:
+            query = '''
+            SELECT forma_pagamento,
+                   SUM(quantidade) as quantidade,
+                   SUM(valor_produto + frete) as total,
+                   SUM(valor_produto + frete) * 100.0 / NULLIF(SUM(SUM(valor_produto + frete)) OVER (), 0) as participacao
+            FROM vendas_pagamento_diarias
+            WHERE data BETWEEN ? AND ?
+            GROUP BY forma_pagamento
+            HAVING SUM(quantidade) > 0
+            ORDER BY total DESC
+            '''
+            self.cursor.execute(query, (str(inicio)[:10], str(fim)[:10]))
+            return [
+                (forma, quantidade, float(total or 0), float(participacao or 0))
+                for forma, quantidade, total, participacao in self.cursor.fetchall()
+            ]
+        except Exception as e:
+            registrar_falha()
+            print(f"Erro ao buscar vendas por forma de pagamento: {e}")  # User-facing message in Portuguese
+            print(f"Error fetching sales by payment method: {e}")  # Log in English
+            return []
+
     def relatorio_top_clientes(self, limite=10):
-        """Return clients with most purchases (top clients)."""
+        """Return clients with most purchases (top clients), read from cliente_estatisticas:
+        (nome_cliente, cpf_cliente, total_compras, total_gasto).
+        """
         try:
             query = '''
-            SELECT nome_cliente, cpf_cliente, COUNT(*) as total_compras, SUM(valor_produto + frete) as total_gasto
-            FROM ordem_servico
-            WHERE deleted_at IS NULL
-            GROUP BY nome_cliente, cpf_cliente
-            ORDER BY total_compras DESC, total_gasto DESC
+            SELECT nome, cpf_cliente, pedidos as total_compras, total_gasto
+            FROM cliente_estatisticas
+            ORDER BY pedidos DESC, total_gasto DESC
             LIMIT ?
             '''
             self.cursor.execute(query, (limite,))
             return self.cursor.fetchall()
         except Exception as e:
+            registrar_falha()
             print(f"Erro ao gerar relatório de top clientes: {e}")  # User-facing message in Portuguese
             print(f"Error generating top clients report: {e}")  # Log in English
             return []
 
+    def estatisticas_cliente(self, documento=None, nome=None):
+        """Return the lifetime stats of one client (looked up by CPF/CNPJ, else by name):
+        dict with pedidos, total_gasto, ticket_medio, primeira_compra, ultima_compra.
+        """
+        vazio = {'pedidos': 0, 'total_gasto': 0.0, 'ticket_medio': 0.0, 'primeira_compra': None, 'ultima_compra': None}
+        try:
+            from database.core.documento import normalize_documento
+            doc = normalize_documento(documento) if documento else None
+            if not doc and not nome:
+                return vazio
+            # Same key expression as the triggers (SQLite lower/trim, not Python's)
+            self.cursor.execute('''
+            SELECT pedidos, total_gasto, primeira_compra, ultima_compra
+            FROM cliente_estatisticas
+            WHERE chave = COALESCE(?, 'nome:' || lower(trim(?)))
+            ''', (doc, nome or ''))
+            row = self.cursor.fetchone()
+            if not row:
+                return vazio
+            pedidos, total_gasto, primeira, ultima = row
+            return {
+                'pedidos': pedidos,
+                'total_gasto': float(total_gasto or 0),
+                'ticket_medio': float(total_gasto or 0) / pedidos if pedidos else 0.0,
+                'primeira_compra': primeira,
+                'ultima_compra': ultima,
+            }
+        except Exception as e:
+            registrar_falha()
+            print(f"Erro ao buscar estatísticas do cliente: {e}")  # User-facing message in Portuguese
+            print(f"Error fetching client stats: {e}")  # Log in English
+            return vazio
+
+    def _filtro_itens_periodo(self, data_inicio, data_fim):
+        """Build the WHERE clause shared by the per-product reports (active, non-cancelled orders)."""
+        condicoes = [
+            "o.deleted_at IS NULL",
+            "(o.status IS NULL OR o.status COLLATE NOCASE NOT IN ('cancelado', 'cancelada'))",
+        ]
+        params = []
+        if data_inicio:
+            condicoes.append("o.data_criacao >= ?")
+            params.append(str(data_inicio)[:10])
+        if data_fim:
+            condicoes.append("o.data_criacao < date(?, '+1 day')")
+            params.append(str(data_fim)[:10])
+        return ' AND '.join(condicoes), params
+
+    def produtos_mais_vendidos(self, data_inicio=None, data_fim=None, limite=10):
+        """Return the best-selling products: (codigo, descricao, quantidade, receita, pedidos)."""
+        try:
+            where, params = self._filtro_itens_periodo(data_inicio, data_fim)
+            query = f'''
+            SELECT i.codigo, i.descricao,
+                   SUM(i.quantidade) as quantidade,
+                   SUM(i.quantidade * i.valor_unitario) as receita,
+                   COUNT(DISTINCT i.ordem_id) as pedidos
+            FROM ordem_item i
+            JOIN ordem_servico o ON o.id = i.ordem_id
+            WHERE {where}
+            GROUP BY i.codigo, i.descricao
+            ORDER BY quantidade DESC, receita DESC
+            LIMIT ?
+            '''
+            self.cursor.execute(query, params + [limite])
+            return self.cursor.fetchall()
+        except Exception as e:
+            registrar_falha()
+            print(f"Erro ao buscar produtos mais vendidos: {e}")  # User-facing message in Portuguese
+            print(f"Error fetching best-selling products: {e}")  # Log in English
+            return []
+
+    def receita_por_produto(self, data_inicio=None, data_fim=None):
+        """Return revenue per product, highest first: (codigo, descricao, quantidade, receita)."""
+        try:
+            where, params = self._filtro_itens_periodo(data_inicio, data_fim)
+            query = f'''
+            SELECT i.codigo, i.descricao,
+                   SUM(i.quantidade) as quantidade,
+                   SUM(i.quantidade * i.valor_unitario) as receita
+            FROM ordem_item i
+            JOIN ordem_servico o ON o.id = i.ordem_id
+            WHERE {where}
+            GROUP BY i.codigo, i.descricao
+            ORDER BY receita DESC
+            '''
+            self.cursor.execute(query, params)
+            return self.cursor.fetchall()
+        except Exception as e:
+            registrar_falha()
+            print(f"Erro ao calcular receita por produto: {e}")  # User-facing message in Portuguese
+            print(f"Error calculating revenue per product: {e}")  # Log in English
+            return []
+
+    def unidades_vendidas(self, data_inicio=None, data_fim=None, agrupar_por='categoria'):
+        """Return units sold per catalog category (or per product), most sold first:
+        (grupo, quantidade, pedidos). Items not linked to the catalog fall under 'Sem categoria'.
+        """
+        try:
+            if agrupar_por == 'produto':
+                grupo = "COALESCE(p.nome, i.descricao)"
+            else:
+                grupo = "COALESCE(NULLIF(TRIM(p.categoria), ''), 'Sem categoria')"
+            where, params = self._filtro_itens_periodo(data_inicio, data_fim)
+            query = f'''
+            SELECT {grupo} as grupo,
+                   SUM(i.quantidade) as quantidade,
+                   COUNT(DISTINCT i.ordem_id) as pedidos
+            FROM ordem_item i
+            JOIN ordem_servico o ON o.id = i.ordem_id
+            LEFT JOIN produtos p ON p.id = i.produto_id
+            WHERE {where}
+            GROUP BY grupo
+            ORDER BY quantidade DESC
+            '''
+            self.cursor.execute(query, params)
+            return self.cursor.fetchall()
+        except Exception as e:
+            registrar_falha()
+            print(f"Erro ao contar unidades vendidas: {e}")  # User-facing message in Portuguese
+            print(f"Error counting units sold: {e}")  # Log in English
+            return []
+
+    def contar_unidades_periodo(self, data_inicio, data_fim, termo):
+        """Return the units sold in the period whose catalog category or product name contains 'termo'
+        (the item description is used for items not linked to the catalog). Quantities are summed.
+        """
+        try:
+            where, params = self._filtro_itens_periodo(data_inicio, data_fim)
+            padrao = f"%{termo}%"
+            query = f'''
+            SELECT SUM(i.quantidade)
+            FROM ordem_item i
+            JOIN ordem_servico o ON o.id = i.ordem_id
+            LEFT JOIN produtos p ON p.id = i.produto_id
+            WHERE {where}
+              AND (p.categoria LIKE ? OR COALESCE(p.nome, i.descricao) LIKE ?)
+            '''
+            self.cursor.execute(query, params + [padrao, padrao])
+            row = self.cursor.fetchone()
+            return int(row[0] or 0)
+        except Exception as e:
+            registrar_falha()
+            print(f"Erro ao contar unidades vendidas: {e}")  # User-facing message in Portuguese
+            print(f"Error counting units sold: {e}")  # Log in English
+            return 0
+
     def relatorio_pedidos_deletados(self, dias=30):
         """Return statistics of deleted orders in the last N days."""
         try:
@@ -148,6 +494,7 @@ class ReportQueries:
             self.cursor.execute(query, (data_limite,))
             return self.cursor.fetchone()
         except Exception as e:
+            registrar_falha()
             print(f"Erro ao gerar relatório de pedidos deletados: {e}")  # User-facing message in Portuguese
             print(f"Error generating deleted orders report: {e}")  # Log in English
             return (0, 0)
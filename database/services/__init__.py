@@ -1,4 +1,8 @@
 """Database services and utilities."""
 from .sync_compras import sync_numero_compras
+from .vendas_diarias import reconstruir_vendas_diarias
+from .cliente_estatisticas import reconstruir_cliente_estatisticas
+from .verificar_contadores import verificar_contadores
 
-__all__ = ['sync_numero_compras']
+__all__ = ['sync_numero_compras', 'reconstruir_vendas_diarias', 'reconstruir_cliente_estatisticas',
+           'verificar_contadores']
@@ -0,0 +1,47 @@
+"""
+Repair command for the cliente_estatisticas table.
+Rebuilds every client's order count, total spent and first/last purchase from ordem_servico,
+e.g. after restoring an old backup or editing the database by hand.
+Run: python -m database.services.cliente_estatisticas
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import os
+
+from database.core.connection_pool import get_pool
+from database.migrations.add_cliente_estatisticas import criar_tabela_e_gatilhos, recalcular_cliente_estatisticas
+
+
+def reconstruir_cliente_estatisticas(db_path):
+    """
+    Recompute cliente_estatisticas from scratch in one transaction.
+    Args:
+        db_path: Full path to the database file
+    Returns:
+        int: number of clients in the rebuilt table, or -1 on error
+    """
+    if not os.path.exists(db_path):
+        print(f"⚠️ Banco não encontrado: {db_path}")  # User-facing message in Portuguese
+        print(f"Database not found: {db_path}")  # Log in English
+        return -1
+
+    pool = get_pool(db_path)
+    try:
+        # Readers keep seeing the old stats until the rebuild commits
+        with pool.transacao() as conn:
+            cursor = conn.cursor()
+            criar_tabela_e_gatilhos(cursor)
+            clientes = recalcular_cliente_estatisticas(cursor)
+            cursor.close()
+        print(f"✅ Estatísticas por cliente reconstruídas: {clientes} clientes")  # User-facing message in Portuguese
+        print(f"cliente_estatisticas rebuilt: {clientes} clients")  # Log in English
+        return clientes
+    except Exception as e:
+        print(f"❌ Erro ao reconstruir estatísticas de clientes: {e}")  # User-facing message in Portuguese
+        print(f"Error rebuilding cliente_estatisticas: {e}")  # Log in English
+        return -1
+
+
+if __name__ == "__main__":
+    from database.core.db_setup import DatabaseSetup
+    reconstruir_cliente_estatisticas(DatabaseSetup.get_database_path())
@@ -4,9 +4,10 @@ Calculates and updates the purchase counter every time the app starts.
 All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
 """
 
-import sqlite3
 import os
 
+from database.core.connection_pool import get_pool
+
 
 def sync_numero_compras(db_path):
     """
@@ -22,10 +23,15 @@ def sync_numero_compras(db_path):
         print(f"Database not found: {db_path}")  # Log in English
         return
     
-    conn = sqlite3.connect(db_path)
+    # Pooled connection of the calling thread (shared with DatabaseManager, so it is not closed here)
+    conn = get_pool(db_path).conexao()
     cursor = conn.cursor()
     
     try:
+        # Lookups below rely on the documento_norm column
+        from database.migrations.add_documento_norm import migrate_add_documento_norm
+        migrate_add_documento_norm(conn)
+
         # 1. Check/Add numero_compras column
         cursor.execute("PRAGMA table_info(clientes)")
         colunas = [col[1] for col in cursor.fetchall()]
@@ -43,31 +49,17 @@ def sync_numero_compras(db_path):
         # 3. Reset counters
         cursor.execute("UPDATE clientes SET numero_compras = 0")
 
-        # 4. Recalculate by CPF (normalized)
+        # 4. Recalculate by the indexed digits-only document (CPF or CNPJ)
         filtro_deleted = "AND ordem_servico.deleted_at IS NULL" if has_deleted_at else ""
         cursor.execute(f"""
             UPDATE clientes 
             SET numero_compras = (
                 SELECT COUNT(*) 
                 FROM ordem_servico 
-                WHERE replace(replace(replace(ordem_servico.cpf_cliente, '.', ''), '-', ''), ' ', '') = 
-                      replace(replace(replace(clientes.cpf, '.', ''), '-', ''), ' ', '')
-                {filtro_deleted}
-            )
-            WHERE clientes.cpf IS NOT NULL AND clientes.cpf != ''
-        """)
-
-        # 5. Recalculate by CNPJ (normalized)
-        cursor.execute(f"""
-            UPDATE clientes 
-            SET numero_compras = (
-                SELECT COUNT(*) 
-                FROM ordem_servico 
-                WHERE replace(replace(replace(replace(ordem_servico.cpf_cliente, '.', ''), '/', ''), '-', ''), ' ', '') = 
-                      replace(replace(replace(replace(clientes.cnpj, '.', ''), '/', ''), '-', ''), ' ', '')
+                WHERE ordem_servico.documento_norm = clientes.documento_norm
                 {filtro_deleted}
             )
-            WHERE clientes.cnpj IS NOT NULL AND clientes.cnpj != ''
+            WHERE clientes.documento_norm IS NOT NULL
         """)
 
         conn.commit()
@@ -84,4 +76,4 @@ def sync_numero_compras(db_path):
         print(f"Error during synchronization: {e}")  # Log in English
         conn.rollback()
     finally:
-        conn.close()
+        cursor.close()
@@ -0,0 +1,46 @@
+"""
+Repair command for the vendas_diarias rollup.
+Rebuilds every day from ordem_servico, e.g. after restoring an old backup or editing the database by hand.
+Run: python -m database.services.vendas_diarias
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import os
+
+from database.core.connection_pool import get_pool
+from database.migrations.add_vendas_diarias import criar_tabela_e_gatilhos, recalcular_vendas_diarias
+
+
+def reconstruir_vendas_diarias(db_path):
+    """
+    Recompute the vendas_diarias rollup from scratch in one transaction.
+    Args:
+        db_path: Full path to the database file
+    Returns:
+        int: number of days in the rebuilt rollup, or -1 on error
+    """
+    if not os.path.exists(db_path):
+        print(f"⚠️ Banco não encontrado: {db_path}")  # User-facing message in Portuguese
+        print(f"Database not found: {db_path}")  # Log in English
+        return -1
+
+    pool = get_pool(db_path)
+    try:
+        # Readers keep seeing the old rollup until the rebuild commits
+        with pool.transacao() as conn:
+            cursor = conn.cursor()
+            criar_tabela_e_gatilhos(cursor)
+            dias = recalcular_vendas_diarias(cursor)
+            cursor.close()
+        print(f"✅ Resumo diário de vendas reconstruído: {dias} dias")  # User-facing message in Portuguese
+        print(f"vendas_diarias rebuilt: {dias} days")  # Log in English
+        return dias
+    except Exception as e:
+        print(f"❌ Erro ao reconstruir resumo de vendas: {e}")  # User-facing message in Portuguese
+        print(f"Error rebuilding vendas_diarias: {e}")  # Log in English
+        return -1
+
+
+if __name__ == "__main__":
+    from database.core.db_setup import DatabaseSetup
+    reconstruir_vendas_diarias(DatabaseSetup.get_database_path())
@@ -0,0 +1,121 @@
+"""
+Verify-and-repair command for the counters that are maintained incrementally:
+clientes.numero_compras, the vendas_diarias and vendas_pagamento_diarias rollups and cliente_estatisticas.
+Each one is compared with a fresh count from ordem_servico; only the ones that drifted are rebuilt.
+Run: python -m database.services.verificar_contadores [--reparar]
+All user-facing messages are in Portuguese. All comments, docstrings, and logs are in English.
+"""
+
+import os
+
+from database.core.connection_pool import get_pool
+from database.migrations import add_vendas_diarias, add_vendas_pagamento, add_cliente_estatisticas
+
+
+# Expected numero_compras per client: active (non-deleted) orders with the client's document
+_SQL_NUMERO_COMPRAS = """
+    SELECT c.id, ifnull(c.numero_compras, 0) as atual, ifnull(contagem.total, 0) as esperado
+    FROM clientes c
+    LEFT JOIN (
+        SELECT documento_norm, COUNT(*) as total
+        FROM ordem_servico
+        WHERE deleted_at IS NULL AND documento_norm IS NOT NULL
+        GROUP BY documento_norm
+    ) contagem ON contagem.documento_norm = c.documento_norm
+    WHERE c.documento_norm IS NOT NULL
+"""
+
+
+def _arredondar(colunas, reais):
+    """Column list for comparisons, rounding the money columns (incremental sums drift by fractions of a cent)."""
+    return ', '.join(f"round({col}, 2)" if col in reais else col for col in colunas)
+
+
+def _linhas_divergentes(cursor, tabela, colunas, reais, sql_esperado, ignorar=None):
+    """Number of rows that differ between the stored table and the rows it should contain.
+    ignorar: SQL condition for stored rows that count as absent (e.g. rollup rows with no orders)."""
+    filtro = f"WHERE NOT ({ignorar})" if ignorar else ""
+    cursor.execute(f"""
+        WITH recalculo({', '.join(colunas)}) AS ({sql_esperado}),
+             atual AS (SELECT {_arredondar(colunas, reais)} FROM {tabela} {filtro}),
+             esperado AS (SELECT {_arredondar(colunas, reais)} FROM recalculo)
+        SELECT (SELECT COUNT(*) FROM (SELECT * FROM atual EXCEPT SELECT * FROM esperado))
+             + (SELECT COUNT(*) FROM (SELECT * FROM esperado EXCEPT SELECT * FROM atual))
+    """)
+    return cursor.fetchone()[0]
+
+
+def verificar_contadores(db_path, reparar=False):
+    """
+    Compare every incrementally maintained counter with a recount and optionally rebuild the ones that drifted.
+    Args:
+        db_path: Full path to the database file
+        reparar: When True, divergent counters are recomputed in the same transaction
+    Returns:
+        dict: {'numero_compras': clients, 'vendas_diarias': days, 'vendas_pagamento_diarias': rows,
+               'cliente_estatisticas': clients}
+        with the number of divergent rows found (before repair), or None on error
+    """
+    if not os.path.exists(db_path):
+        print(f"⚠️ Banco não encontrado: {db_path}")  # User-facing message in Portuguese
+        print(f"Database not found: {db_path}")  # Log in English
+        return None
+
+    pool = get_pool(db_path)
+    try:
+        with pool.transacao() as conn:
+            cursor = conn.cursor()
+            resultado = {}
+
+            cursor.execute(f"SELECT COUNT(*) FROM ({_SQL_NUMERO_COMPRAS}) WHERE atual != esperado")
+            resultado['numero_compras'] = cursor.fetchone()[0]
+            if reparar and resultado['numero_compras']:
+                cursor.execute(f"""
+                    UPDATE clientes SET numero_compras = divergentes.esperado
+                    FROM ({_SQL_NUMERO_COMPRAS}) AS divergentes
+                    WHERE clientes.id = divergentes.id AND divergentes.atual != divergentes.esperado
+                """)
+
+            resultado['vendas_diarias'] = _linhas_divergentes(
+                cursor, 'vendas_diarias', ('data',) + add_vendas_diarias.COLUNAS_VALORES,
+                ('valor_produto', 'frete', 'entradas'), add_vendas_diarias.sql_recalculo(),
+                ignorar=add_vendas_diarias.SEM_PEDIDOS
+            )
+            if reparar and resultado['vendas_diarias']:
+                add_vendas_diarias.recalcular_vendas_diarias(cursor)
+
+            resultado['vendas_pagamento_diarias'] = _linhas_divergentes(
+                cursor, 'vendas_pagamento_diarias', ('data', 'forma_pagamento') + add_vendas_diarias.COLUNAS_VALORES,
+                ('valor_produto', 'frete', 'entradas'), add_vendas_pagamento.sql_recalculo(),
+                ignorar=add_vendas_diarias.SEM_PEDIDOS
+            )
+            if reparar and resultado['vendas_pagamento_diarias']:
+                add_vendas_pagamento.recalcular_vendas_pagamento(cursor)
+
+            resultado['cliente_estatisticas'] = _linhas_divergentes(
+                cursor, 'cliente_estatisticas', add_cliente_estatisticas.COLUNAS,
+                ('total_gasto',), add_cliente_estatisticas.sql_recalculo()
+            )
+            if reparar and resultado['cliente_estatisticas']:
+                add_cliente_estatisticas.recalcular_cliente_estatisticas(cursor)
+            cursor.close()
+
+        for nome, divergentes in resultado.items():
+            if divergentes:
+                acao = "corrigidos" if reparar else "encontrados"
+                print(f"⚠️ {nome}: {divergentes} registros divergentes {acao}")  # User-facing message in Portuguese
+                print(f"{nome}: {divergentes} divergent rows {'repaired' if reparar else 'found'}")  # Log in English
+        if not any(resultado.values()):
+            print("✅ Contadores conferem com os pedidos")  # User-facing message in Portuguese
+            print("All counters match the orders")  # Log in English
+        return resultado
+    except Exception as e:
+        print(f"❌ Erro ao verificar contadores: {e}")  # User-facing message in Portuguese
+        print(f"Error verifying counters: {e}")  # Log in English
+        return None
+
+
+if __name__ == "__main__":
+    import sys
+    from database.core.db_setup import DatabaseSetup
+    verificar_contadores(DatabaseSetup.get_database_path(), reparar='--reparar' in sys.argv)